@@ -52,7 +52,7 @@ def servers(output):
             console.print(f"\n[bold yellow]📂 {server}[/bold yellow]")
             console.print(f"   카테고리: {info['total_categories']}개")
             console.print(f"   도구: {info['total_tools']}개")
-            console.print(f"   생성: {info['generated_at']}")
+            console.print(f"   생성: {info.get('generated_at', '-')}")
         
     except Exception as e:
         console.print(f"[red]❌ 오류: {e}[/red]")
@@ -100,28 +100,28 @@ def categories(server, output):
 @click.argument('server')
 @click.argument('category')
 @click.option('--output', default='output/servers', help='서버 디렉토리 경로')
-def tools(server, category, output):
+@click.option('--offset', type=int, default=0, help='건너뛸 도구 수')
+@click.option('--limit', type=int, default=None, help='최대 표시 수 (기본: 전체)')
+def tools(server, category, output, offset, limit):
     """카테고리의 도구 목록 표시"""
     try:
         agent = MCPAgent(output)
-        tool_list = agent.list_tools(server, category)
-        
-        if not tool_list:
-            console.print(f"[yellow]⚠️  {server}/{category}에 도구가 없습니다.[/yellow]")
-            return
-        
-        console.print(Panel.fit(
-            f"[bold cyan]{server}/{category}[/bold cyan] 도구 ({len(tool_list)}개)",
-            border_style="cyan"
-        ))
         
         table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
         table.add_column("도구", style="yellow")
         table.add_column("설명", style="white", no_wrap=False)
         
-        for tool in tool_list:
+        for tool in agent.iter_tools(server, category, offset=offset, limit=limit):
             table.add_row(tool.name, tool.description)
         
+        if not table.row_count:
+            console.print(f"[yellow]⚠️  {server}/{category}에 도구가 없습니다.[/yellow]")
+            return
+        
+        console.print(Panel.fit(
+            f"[bold cyan]{server}/{category}[/bold cyan] 도구 ({table.row_count}개)",
+            border_style="cyan"
+        ))
         console.print(table)
         
     except Exception as e:
@@ -168,20 +168,12 @@ def info(server, category, tool, output):
 @cli.command()
 @click.argument('query')
 @click.option('--output', default='output/servers', help='서버 디렉토리 경로')
-def search(query, output):
+@click.option('--offset', type=int, default=0, help='건너뛸 결과 수')
+@click.option('--limit', type=int, default=20, help='최대 결과 수')
+def search(query, output, offset, limit):
     """키워드로 도구 검색"""
     try:
         agent = MCPAgent(output)
-        results = agent.search_tools(query)
-        
-        if not results:
-            console.print(f"[yellow]⚠️  '{query}'에 대한 검색 결과가 없습니다.[/yellow]")
-            return
-        
-        console.print(Panel.fit(
-            f"[bold cyan]'{query}'[/bold cyan] 검색 결과 ({len(results)}개)",
-            border_style="cyan"
-        ))
         
         table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
         table.add_column("서버", style="cyan")
@@ -189,7 +181,7 @@ def search(query, output):
         table.add_column("도구", style="green")
         table.add_column("설명", style="white", no_wrap=False)
         
-        for tool in results:
+        for tool in agent.iter_search(query, offset=offset, limit=limit):
             table.add_row(
                 tool.server,
                 tool.category,
@@ -197,6 +189,14 @@ def search(query, output):
                 tool.description[:50] + "..." if len(tool.description) > 50 else tool.description
             )
         
+        if not table.row_count:
+            console.print(f"[yellow]⚠️  '{query}'에 대한 검색 결과가 없습니다.[/yellow]")
+            return
+        
+        console.print(Panel.fit(
+            f"[bold cyan]'{query}'[/bold cyan] 검색 결과 ({table.row_count}개)",
+            border_style="cyan"
+        ))
         console.print(table)
         
     except Exception as e:
@@ -258,7 +258,8 @@ def tree(server, output):
         ))
         
         console.print()
-        agent.print_tree(server)
+        for line in agent.iter_tree(server):
+            console.print(line)
         
     except Exception as e:
         console.print(f"[red]❌ 오류: {e}[/red]")
@@ -346,7 +347,7 @@ def interactive(output):
                         console.print("[red]먼저 서버와 카테고리를 선택하세요[/red]")
                         continue
                     
-                    for tool in agent.list_tools(current_server, current_category):
+                    for tool in agent.iter_tools(current_server, current_category):
                         console.print(f"📄 {tool.name}")
                 
                 elif command == "run":
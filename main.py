@@ -31,7 +31,12 @@ from rich.tree import Tree
 
 from generator.mcp_client import MCPClient
 from generator.categorizer import ToolCategorizer
+from generator.category_cache import CategoryMemo
 from generator.file_generator import FileGenerator
+from generator.catalog_watcher import CatalogWatcher
+from generator.archive import ARCHIVE_SUFFIX, load_server_metadata
+from generator.catalog_db import CATALOG_DB_FILENAME
+from generator.catalog_binary import CATALOG_BIN_FILENAME
 
 console = Console()
 
@@ -46,12 +51,39 @@ def cli():
 @click.option('--config', default='config/mcp_servers.json', help='MCP 서버 설정 파일')
 @click.option('--output', default='output/servers', help='출력 디렉토리')
 @click.option('--server', help='특정 서버만 생성 (선택사항)')
-def generate(config, output, server):
+@click.option('--concurrency', type=int, help='동시에 조회할 최대 서버 수')
+@click.option('--timeout', type=float, help='서버별 도구 조회 제한 시간(초)')
+@click.option('--refresh', is_flag=True, help='도구 목록 캐시를 무시하고 서버를 다시 조회')
+@click.option('--workers', type=int, default=1, help='분류와 파일 렌더링에 사용할 프로세스 수 (0: CPU 코어 수)')
+@click.option('--deterministic', is_flag=True, help='생성 시각을 기록하지 않음 (같은 입력이면 같은 출력)')
+@click.option('--keep-generations', type=int, default=3, help='롤백용으로 남겨 둘 이전 생성 결과 수')
+@click.option('--format', 'output_format', type=click.Choice(FileGenerator.OUTPUT_FORMATS),
+              default='tree', help='출력 형식 (tree: 도구별 파일, archive: 서버별 zip 파일 하나)')
+@click.option('--catalog-db', is_flag=True, help='MCPAgent sqlite 백엔드용 catalog.db도 생성')
+@click.option('--catalog-bin', is_flag=True, help='MCPAgent mmap 백엔드용 catalog.bin도 생성')
+def generate(config, output, server, concurrency, timeout, refresh, workers, deterministic,
+             keep_generations, output_format, catalog_db, catalog_bin):
     """MCP 서버 기반 디렉토리 구조 생성"""
-    asyncio.run(_generate(config, output, server))
+    asyncio.run(_generate(
+        config, output, server, concurrency, timeout, refresh, workers, deterministic,
+        keep_generations, output_format, catalog_db, catalog_bin
+    ))
 
 
-async def _generate(config_path: str, output_dir: str, specific_server: str = None):
+async def _generate(
+    config_path: str,
+    output_dir: str,
+    specific_server: str = None,
+    concurrency: int = None,
+    timeout: float = None,
+    refresh: bool = False,
+    workers: int = 1,
+    deterministic: bool = False,
+    keep_generations: int = 3,
+    output_format: str = "tree",
+    catalog_db: bool = False,
+    catalog_bin: bool = False
+):
     """실제 생성 로직"""
     
     # 헤더 출력
@@ -62,65 +94,106 @@ async def _generate(config_path: str, output_dir: str, specific_server: str = No
     ))
     
     try:
-        # 1. MCP 도구 가져오기
-        console.print("\n[bold]1️⃣  MCP 서버 연결 및 도구 조회[/bold]")
-        client = MCPClient(config_path)
-        all_tools = await client.get_all_tools()
-
-        if not all_tools:
-            console.print("[red]❌ 도구를 찾을 수 없습니다.[/red]")
-            return
-
-        # 특정 서버만 처리
-        if specific_server:
-            if specific_server not in all_tools:
-                console.print(f"[red]❌ 서버 '{specific_server}'를 찾을 수 없습니다.[/red]")
-                return
-            all_tools = {specific_server: all_tools[specific_server]}
-
-        total_tools = sum(len(tools) for tools in all_tools.values())
-        console.print(f"   ✅ {len(all_tools)}개 서버, 총 {total_tools}개 도구")
-
-        # 2. 도구 분류
-        console.print("\n[bold]2️⃣  도구 분류[/bold]")
-        categorizer = ToolCategorizer()
+        # 1. MCP 도구 조회 → 분류 → 파일 생성 (청크 단위 스트리밍)
+        console.print("\n[bold]1️⃣  MCP 서버 연결 및 도구 조회 · 분류 · 파일 생성[/bold]")
+        client = MCPClient(
+            config_path,
+            max_concurrency=concurrency,
+            timeout=timeout,
+            refresh=refresh
+        )
+        rules_path = 'config/categories.json'
+        categorizer = ToolCategorizer(
+            rules_path,
+            workers=workers,
+            memo=CategoryMemo(rules_path)
+        )
+        generator = FileGenerator(
+            output_dir,
+            deterministic=deterministic,
+            workers=workers,
+            keep_generations=keep_generations,
+            output_format=output_format,
+            catalog_db=catalog_db,
+            catalog_bin=catalog_bin
+        )
         
-        all_categories = {}
-        for server_name, tools in all_tools.items():
-            categories = categorizer.categorize_tools(tools)
-            all_categories[server_name] = categories
-            console.print(f"   {server_name}: {len(categories)}개 카테고리")
+        # 특정 서버만 처리 (선택된 서버만 연결)
+        selected = [specific_server] if specific_server else None
+        
+        # 서버별 결과 요약 {서버: {카테고리: (도구 수, 앞의 도구 이름 2개)}}
+        summary = {}
+        total_tools = 0
         
-        # 3. 파일 생성
-        console.print("\n[bold]3️⃣  파일 구조 생성[/bold]")
-        generator = FileGenerator(output_dir)
+        # 병렬 분류 시에는 프로세스 풀을 쓸 만큼 서버별로 청크를 모아서 분류
+        batch_size = categorizer.parallel_threshold if categorizer.workers > 1 else 0
+        pending = {}
+        
+        def flush(server_name: str):
+            tools = pending.pop(server_name, None)
+            if tools:
+                generator.add_tools(server_name, categorizer.categorize_tools(tools))
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console
         ) as progress:
+            task = progress.add_task("[cyan]도구 조회 중...", total=None)
+            
+            try:
+                # 전체 카탈로그는 마지막 서버까지 게시한 뒤 한 번만 갱신
+                with generator.catalog_batch():
+                    async for chunk in client.stream_tools(selected):
+                        if chunk.failed:
+                            pending.pop(chunk.server_name, None)
+                            generator.discard_server(chunk.server_name)
+                            continue
+                        
+                        if chunk.tools:
+                            pending.setdefault(chunk.server_name, []).extend(chunk.tools)
+                            if len(pending[chunk.server_name]) >= batch_size:
+                                flush(chunk.server_name)
+                            total_tools += len(chunk.tools)
+                            progress.update(task, description=f"[cyan]{total_tools}개 도구 처리 중...")
+                        
+                        if chunk.done:
+                            flush(chunk.server_name)
+                            categories = generator.finish_server(chunk.server_name)
+                            summary[chunk.server_name] = _summarize_categories(categories)
+            finally:
+                categorizer.close()
+                generator.close()
             
-            for server_name, categories in all_categories.items():
-                task = progress.add_task(
-                    f"[cyan]{server_name} 생성 중...",
-                    total=None
-                )
-                
-                generator.generate_server_structure(server_name, categories)
-                progress.remove_task(task)
+            progress.remove_task(task)
         
-        # 4. 결과 트리 출력
-        console.print("\n[bold]4️⃣  생성 결과[/bold]")
-        _print_result_tree(Path(output_dir), all_categories)
+        memo = categorizer.memo
+        if memo.hits or memo.misses:
+            console.print(f"   분류 캐시: {memo.hits}개 재사용, {memo.misses}개 새로 분류")
+
+        if specific_server and specific_server not in summary:
+            console.print(f"[red]❌ 서버 '{specific_server}'를 찾을 수 없습니다.[/red]")
+            return
+
+        if not summary:
+            console.print("[red]❌ 도구를 찾을 수 없습니다.[/red]")
+            return
+
+        console.print(f"   ✅ {len(summary)}개 서버, 총 {total_tools}개 도구")
+        for server_name, categories in summary.items():
+            console.print(f"   {server_name}: {len(categories)}개 카테고리")
+        
+        # 2. 결과 트리 출력
+        console.print("\n[bold]2️⃣  생성 결과[/bold]")
+        _print_result_tree(Path(output_dir), summary)
         
         # 완료 메시지
         console.print(Panel.fit(
             f"[bold green]✅ 생성 완료![/bold green]\n\n"
             f"📂 위치: [cyan]{Path(output_dir).absolute()}[/cyan]\n"
             f"📊 통계:\n"
-            f"   - 서버: {len(all_categories)}개\n"
-            f"   - 총 카테고리: {sum(len(cats) for cats in all_categories.values())}개\n"
+            f"   - 서버: {len(summary)}개\n"
+            f"   - 총 카테고리: {sum(len(cats) for cats in summary.values())}개\n"
             f"   - 총 도구: {total_tools}개",
             border_style="green"
         ))
@@ -130,24 +203,35 @@ async def _generate(config_path: str, output_dir: str, specific_server: str = No
         raise
 
 
-def _print_result_tree(output_dir: Path, all_categories: dict):
+def _summarize_categories(categories: dict) -> dict:
+    """결과 트리 출력용 요약 (도구 목록 전체를 들고 있지 않도록)"""
+    return {
+        category_name: (
+            len(category_info.tools),
+            [tool.get_simple_name() for tool in category_info.tools[:2]]
+        )
+        for category_name, category_info in categories.items()
+    }
+
+
+def _print_result_tree(output_dir: Path, summary: dict):
     """생성된 파일 구조를 트리로 출력"""
     tree = Tree(f"[bold cyan]📁 {output_dir.name}/[/bold cyan]")
     
-    for server_name, categories in all_categories.items():
+    for server_name, categories in summary.items():
         server_branch = tree.add(f"[bold yellow]📂 {server_name}/[/bold yellow]")
         
-        for category_name, category_info in list(categories.items())[:3]:
+        for category_name, (tool_count, first_tools) in list(categories.items())[:3]:
             category_branch = server_branch.add(
                 f"[green]📂 {category_name}/[/green] "
-                f"[dim]({len(category_info.tools)} tools)[/dim]"
+                f"[dim]({tool_count} tools)[/dim]"
             )
             
-            for tool in category_info.tools[:2]:
-                category_branch.add(f"[blue]📄 {tool.get_simple_name()}.ts[/blue]")
+            for tool_name in first_tools:
+                category_branch.add(f"[blue]📄 {tool_name}.ts[/blue]")
             
-            if len(category_info.tools) > 2:
-                category_branch.add(f"[dim]... {len(category_info.tools) - 2}개 더[/dim]")
+            if tool_count > 2:
+                category_branch.add(f"[dim]... {tool_count - 2}개 더[/dim]")
         
         if len(categories) > 3:
             server_branch.add(f"[dim]... {len(categories) - 3}개 카테고리 더[/dim]")
@@ -155,6 +239,69 @@ def _print_result_tree(output_dir: Path, all_categories: dict):
     console.print(tree)
 
 
+@cli.command()
+@click.option('--config', default='config/mcp_servers.json', help='MCP 서버 설정 파일')
+@click.option('--output', default='output/servers', help='출력 디렉토리')
+@click.option('--server', multiple=True, help='감시할 서버 (여러 번 지정 가능, 기본: 전체)')
+@click.option('--deterministic', is_flag=True, help='생성 시각을 기록하지 않음')
+@click.option('--format', 'output_format', type=click.Choice(FileGenerator.OUTPUT_FORMATS),
+              default='tree', help='출력 형식 (tree: 도구별 파일, archive: 서버별 zip 파일 하나)')
+@click.option('--catalog-db', is_flag=True, help='MCPAgent sqlite 백엔드용 catalog.db도 갱신')
+@click.option('--catalog-bin', is_flag=True, help='MCPAgent mmap 백엔드용 catalog.bin도 갱신')
+def watch(config, output, server, deterministic, output_format, catalog_db, catalog_bin):
+    """도구 목록 변경 알림을 받아 변경된 카테고리만 다시 생성"""
+    console.print(Panel.fit(
+        "[bold cyan]CodeEx Agent - Watch[/bold cyan]\n"
+        "tools/list_changed 알림 → 변경된 카테고리만 갱신",
+        border_style="cyan"
+    ))
+    
+    rules_path = 'config/categories.json'
+    categorizer = ToolCategorizer(rules_path, memo=CategoryMemo(rules_path))
+    generator = FileGenerator(
+        output,
+        deterministic=deterministic,
+        output_format=output_format,
+        catalog_db=catalog_db,
+        catalog_bin=catalog_bin
+    )
+    watcher = CatalogWatcher(MCPClient(config), categorizer, generator)
+    try:
+        asyncio.run(watcher.run(list(server) or None))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]감시를 종료합니다.[/yellow]")
+
+
+@cli.command()
+@click.argument('server_name')
+@click.option('--output', default='output/servers', help='출력 디렉토리')
+@click.option('--steps', type=int, default=1, help='되돌릴 세대 수')
+def rollback(server_name, output, steps):
+    """서버 구조를 이전 생성 결과로 되돌림"""
+    # catalog.db, catalog.bin이 있으면 함께 되돌림
+    generator = FileGenerator(
+        output,
+        catalog_db=(Path(output) / CATALOG_DB_FILENAME).exists(),
+        catalog_bin=(Path(output) / CATALOG_BIN_FILENAME).exists()
+    )
+    try:
+        generation = generator.rollback(server_name, steps)
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        return
+    console.print(f"[green]✅ {server_name}: 세대 {generation}(으)로 되돌림[/green]")
+
+
+@cli.command()
+@click.argument('servers', nargs=-1)
+@click.option('--config', default='config/mcp_servers.json', help='MCP 서버 설정 파일')
+def clear_cache(servers, config):
+    """도구 목록 캐시 삭제 (서버 이름을 지정하지 않으면 전체)"""
+    client = MCPClient(config)
+    removed = client.invalidate_cache(list(servers) or None)
+    console.print(f"[green]✅ 캐시 {removed}개 삭제[/green]")
+
+
 @cli.command()
 @click.option('--output', default='output/servers', help='출력 디렉토리')
 def list_servers(output):
@@ -170,22 +317,23 @@ def list_servers(output):
         border_style="cyan"
     ))
     
-    servers = [d for d in output_path.iterdir() if d.is_dir()]
+    servers = sorted({
+        d.name[:-len(ARCHIVE_SUFFIX)] if d.name.endswith(ARCHIVE_SUFFIX) else d.name
+        for d in output_path.iterdir()
+        if not d.name.startswith('.') and (d.is_dir() or d.name.endswith(ARCHIVE_SUFFIX))
+    })
     
     if not servers:
         console.print("[yellow]⚠️  생성된 서버가 없습니다.[/yellow]")
         return
     
-    for server_dir in servers:
-        metadata_file = server_dir / "metadata.json"
-        if metadata_file.exists():
-            import json
-            metadata = json.loads(metadata_file.read_text())
-            
-            console.print(f"\n[bold yellow]{server_dir.name}[/bold yellow]")
+    for server_name in servers:
+        metadata = load_server_metadata(output_path, server_name)
+        if metadata is not None:
+            console.print(f"\n[bold yellow]{server_name}[/bold yellow]")
             console.print(f"  카테고리: {metadata['total_categories']}개")
             console.print(f"  도구: {metadata['total_tools']}개")
-            console.print(f"  생성일: {metadata['generated_at']}")
+            console.print(f"  생성일: {metadata.get('generated_at', '-')}")
 
 
 @cli.command()
@@ -193,16 +341,12 @@ def list_servers(output):
 @click.option('--output', default='output/servers', help='출력 디렉토리')
 def show(server_name, output):
     """특정 서버의 상세 정보 표시"""
-    server_path = Path(output) / server_name
-    metadata_file = server_path / "metadata.json"
+    metadata = load_server_metadata(Path(output), server_name)
     
-    if not metadata_file.exists():
+    if metadata is None:
         console.print(f"[red]❌ 서버를 찾을 수 없습니다: {server_name}[/red]")
         return
     
-    import json
-    metadata = json.loads(metadata_file.read_text())
-    
     console.print(Panel.fit(
         f"[bold cyan]{server_name}[/bold cyan]",
         border_style="cyan"
@@ -2,5 +2,19 @@
 
 from .mcp_agent import MCPAgent
 from .tool_executor import ToolExecutor
+from .catalog_index import CatalogIndex
+from .catalog_reloader import CatalogReloader
+from .catalog_store import SQLiteCatalogStore
+from .catalog_mmap import MappedCatalog
+from .schema_validator import ToolInputError, compile_schema
 
-__all__ = ['MCPAgent', 'ToolExecutor']
+__all__ = [
+    'MCPAgent',
+    'ToolExecutor',
+    'CatalogIndex',
+    'CatalogReloader',
+    'SQLiteCatalogStore',
+    'MappedCatalog',
+    'ToolInputError',
+    'compile_schema',
+]
@@ -0,0 +1,397 @@
+"""생성된 카탈로그의 메모리 색인"""
+import sys
+import json
+import time
+import threading
+import marshal
+import zipfile
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union
+from dataclasses import dataclass, field
+
+
+# FileGenerator가 출력 디렉토리에 만드는 전체 카탈로그 스냅샷
+SNAPSHOT_FILENAME = "catalog.snapshot"
+SNAPSHOT_MAGIC = b"CXCAT\x02"
+
+# 스냅샷을 쓴 인터프리터 버전 태그 (marshal 형식이 달라질 수 있어 다르면 읽지 않음)
+PYTHON_TAG = f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}".encode('ascii')
+SNAPSHOT_HEADER = SNAPSHOT_MAGIC + bytes([len(PYTHON_TAG)]) + PYTHON_TAG
+
+# generate --format archive로 만든 서버 압축 파일 확장자 (<서버>.zip)
+ARCHIVE_SUFFIX = ".zip"
+
+# 파일 식별자 (경로, inode, 수정 시각) - 파일이 교체되면 달라짐
+Stamp = Tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class ToolInfo:
+    """도구 정보 (색인이 공유하는 불변 레코드)"""
+    name: str
+    server: str
+    category: str
+    description: str
+    # 입력 스키마 (JSON 문자열이면 input_schema로 처음 접근할 때 파싱)
+    schema_source: Union[str, Dict[str, Any], None] = field(default=None, repr=False)
+    keywords: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        if not isinstance(self.keywords, tuple):
+            object.__setattr__(self, 'keywords', tuple(self.keywords or ()))
+
+    @property
+    def input_schema(self) -> Optional[Dict[str, Any]]:
+        """입력 스키마 (검색/목록 조회에서는 파싱하지 않음)"""
+        source = self.schema_source
+        if not isinstance(source, str):
+            return source
+        schema = self.__dict__.get('_input_schema')
+        if schema is None:
+            schema = json.loads(source)
+            object.__setattr__(self, '_input_schema', schema)
+        return schema
+
+
+@dataclass(frozen=True)
+class CategoryInfo:
+    """카테고리 정보 (색인이 공유하는 불변 레코드)"""
+    name: str
+    server: str
+    description: str
+    tool_count: int
+    keywords: Tuple[str, ...]
+    tools: Tuple[ToolInfo, ...] = ()
+
+    def __post_init__(self):
+        if not isinstance(self.keywords, tuple):
+            object.__setattr__(self, 'keywords', tuple(self.keywords or ()))
+        if not isinstance(self.tools, tuple):
+            object.__setattr__(self, 'tools', tuple(self.tools or ()))
+
+
+@dataclass(frozen=True)
+class ServerIndex:
+    """서버 하나의 색인"""
+    metadata: Dict[str, Any]
+    categories: Dict[str, CategoryInfo]
+    tools: Dict[str, Dict[str, ToolInfo]]   # {카테고리: {도구 이름: ToolInfo}}
+    sources: Dict[str, Any]                 # {카테고리: 원본 항목} (다시 로드할 때 비교용)
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    """파일 식별자 (없으면 None)"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_ino, stat.st_mtime_ns)
+
+
+class CatalogIndex:
+    """
+    출력 디렉토리의 카탈로그를 서버 단위로 지연 로드하는 메모리 색인
+
+    catalog.snapshot이 있으면 그것을, 없으면 서버별 압축 파일이나 metadata.json을
+    읽습니다. 서버는 처음 조회할 때 한 번만 읽어 ServerIndex로 만들고, 이후 조회는
+    사전 조회만 합니다. 원본 파일이 교체되었는지는 check_interval초에 한 번만
+    확인하므로(stat만 호출) 반복 조회 중에는 디스크를 거의 읽지 않습니다.
+
+    원본이 바뀌면 로드된 서버 중 내용이 바뀐 서버만 다시 만들고, 그 안에서도
+    원본 항목이 같은 카테고리는 이전 레코드를 그대로 재사용합니다. 무언가 바뀔
+    때마다 version이 증가하므로 캐시는 이 값으로 무효화 여부를 판단할 수 있습니다.
+
+    Usage:
+        index = CatalogIndex(Path('output/servers'))
+        server = index.server('github')
+        tool = server.tools['issues']['create']
+    """
+
+    def __init__(self, output_dir: Path, check_interval: float = 1.0):
+        """
+        Args:
+            output_dir: 생성된 서버 디렉토리 경로
+            check_interval: 원본 파일 변경을 확인하는 최소 간격(초)
+        """
+        self.output_dir = output_dir
+        self.check_interval = check_interval
+
+        # 카탈로그 버전 (서버 목록이나 로드된 서버가 바뀔 때마다 증가)
+        self.version = 0
+
+        # 감시 스레드와 조회 스레드가 함께 갱신할 수 있음
+        self._lock = threading.RLock()
+        self._checked_at = float('-inf')
+
+        # 스냅샷 {서버: 스냅샷 항목} (없으면 None)과 그 파일 식별자
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_stamp: Optional[Stamp] = None
+
+        # 서버 이름 목록과 출력 디렉토리 식별자 (스냅샷이 없을 때)
+        self._names: Optional[List[str]] = None
+        self._names_stamp: Optional[Stamp] = None
+
+        # 로드된 서버 {서버: (원본 파일 식별자, 색인)}
+        self._servers: Dict[str, Tuple[Optional[Stamp], ServerIndex]] = {}
+
+    def invalidate(self):
+        """다음 조회 때 원본 파일 변경을 바로 확인"""
+        self._checked_at = float('-inf')
+
+    def _maybe_refresh(self):
+        """check_interval이 지났으면 refresh()"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        원본 파일이 바뀌었는지 확인하고 바뀐 서버만 다시 로드
+
+        Returns:
+            카탈로그가 바뀌어 version이 증가했으면 True
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = self.version
+
+            stamp = _stamp(self.output_dir / SNAPSHOT_FILENAME)
+            if stamp != self._snapshot_stamp:
+                self._snapshot_stamp = stamp
+                self._reload_snapshot()
+
+            if self._snapshot is None:
+                if self._names is not None and _stamp(self.output_dir) != self._names_stamp:
+                    self._names = None
+                    self.version += 1
+
+                for server, (stamp, previous) in list(self._servers.items()):
+                    source_stamp = self._source_stamp(server)
+                    if source_stamp == stamp:
+                        continue
+                    index = self._index_metadata(server, previous) if source_stamp else None
+                    self._replace(server, source_stamp, index)
+
+            return self.version != version
+
+    def _replace(self, server: str, stamp: Optional[Stamp], index: Optional[ServerIndex]):
+        """로드된 서버의 색인 교체 (index가 None이면 제거)"""
+        if index is None:
+            del self._servers[server]
+        else:
+            self._servers[server] = (stamp, index)
+        self.version += 1
+
+    def _reload_snapshot(self):
+        """스냅샷을 다시 읽고 항목이 바뀐 서버만 다시 색인"""
+        previous_snapshot = self._snapshot
+        self._snapshot = self._load_snapshot()
+        self._names = None
+        self.version += 1
+
+        if self._snapshot is None or previous_snapshot is None:
+            # 스냅샷이 생기거나 없어졌으면 원본이 달라지므로 모두 다시 로드
+            self._servers.clear()
+            return
+
+        for server, (_, previous) in list(self._servers.items()):
+            entry = self._snapshot.get(server)
+            if entry is None:
+                self._replace(server, None, None)
+            elif entry != previous_snapshot.get(server):
+                self._replace(server, None, self._index_snapshot_entry(server, entry, previous))
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        catalog.snapshot을 한 번에 읽기
+
+        없거나 형식/Python 버전이 다르면 None이며, 이때는 서버별 metadata.json으로
+        색인합니다 (다음 generate가 현재 버전으로 스냅샷을 다시 만듦).
+        """
+        try:
+            data = (self.output_dir / SNAPSHOT_FILENAME).read_bytes()
+        except OSError:
+            return None
+
+        if not data.startswith(SNAPSHOT_HEADER):
+            return None
+        try:
+            return marshal.loads(data[len(SNAPSHOT_HEADER):])["servers"]
+        except (ValueError, EOFError, TypeError, KeyError):
+            return None
+
+    def _source_stamp(self, server: str) -> Optional[Stamp]:
+        """스냅샷이 없을 때 서버 원본(압축 파일 또는 metadata.json)의 식별자"""
+        return (_stamp(self.output_dir / f"{server}{ARCHIVE_SUFFIX}") or
+                _stamp(self.output_dir / server / "metadata.json"))
+
+    def servers(self) -> List[str]:
+        """서버 이름 목록 (정렬됨)"""
+        self._maybe_refresh()
+        names = self._names
+        if names is not None:
+            return names
+
+        with self._lock:
+            if self._snapshot is not None:
+                names = sorted(self._snapshot)
+            else:
+                self._names_stamp = _stamp(self.output_dir)
+                found = set()
+                for item in self.output_dir.iterdir():
+                    if item.name.startswith('.'):
+                        continue
+                    if item.is_dir():
+                        found.add(item.name)
+                    elif item.name.endswith(ARCHIVE_SUFFIX):
+                        found.add(item.name[:-len(ARCHIVE_SUFFIX)])
+                names = sorted(found)
+            self._names = names
+        return names
+
+    def server(self, server: str) -> Optional[ServerIndex]:
+        """서버 색인 (처음 조회할 때 로드, 서버가 없으면 None)"""
+        self._maybe_refresh()
+        cached = self._servers.get(server)
+        if cached is not None:
+            return cached[1]
+
+        with self._lock:
+            cached = self._servers.get(server)
+            if cached is not None:
+                return cached[1]
+
+            if self._snapshot is not None:
+                entry = self._snapshot.get(server)
+                if entry is None:
+                    return None
+                stamp, index = None, self._index_snapshot_entry(server, entry)
+            else:
+                stamp = self._source_stamp(server)
+                if stamp is None:
+                    return None
+                index = self._index_metadata(server)
+                if index is None:
+                    return None
+
+            self._servers[server] = (stamp, index)
+            return index
+
+    @staticmethod
+    def _index_snapshot_entry(
+        server: str,
+        entry: Dict[str, Any],
+        previous: Optional[ServerIndex] = None
+    ) -> ServerIndex:
+        """스냅샷 항목 → 서버 색인 (previous에서 항목이 같은 카테고리는 재사용)"""
+        categories = {}
+        tools = {}
+        for cat_name, cat_info in entry['categories'].items():
+            if previous is not None and previous.sources.get(cat_name) == cat_info:
+                categories[cat_name] = previous.categories[cat_name]
+                tools[cat_name] = previous.tools[cat_name]
+                continue
+
+            categories[cat_name] = CategoryInfo(
+                name=cat_name,
+                server=server,
+                description=cat_info['description'],
+                tool_count=len(cat_info['tools']),
+                keywords=cat_info['keywords']
+            )
+            # 스냅샷 도구 레코드: (이름, 전체 이름, 설명, 스키마 JSON) - 키워드는 카테고리 키워드
+            keywords = tuple(cat_info['keywords'])
+            tools[cat_name] = {
+                name: ToolInfo(
+                    name=name,
+                    server=server,
+                    category=cat_name,
+                    description=description,
+                    schema_source=schema or None,
+                    keywords=keywords
+                )
+                for name, _, description, schema in cat_info['tools']
+            }
+        return ServerIndex(
+            metadata=entry['metadata'],
+            categories=categories,
+            tools=tools,
+            sources=entry['categories']
+        )
+
+    def _index_metadata(
+        self,
+        server: str,
+        previous: Optional[ServerIndex] = None
+    ) -> Optional[ServerIndex]:
+        """서버/카테고리 metadata.json → 서버 색인 (서버 메타데이터가 없으면 None)"""
+        archive_file = self.output_dir / f"{server}{ARCHIVE_SUFFIX}"
+        if archive_file.exists():
+            try:
+                with zipfile.ZipFile(archive_file) as archive:
+                    return self._index_metadata_files(server, archive.read, previous)
+            except (OSError, zipfile.BadZipFile):
+                return None
+
+        server_dir = self.output_dir / server
+        return self._index_metadata_files(
+            server, lambda name: (server_dir / name).read_bytes(), previous
+        )
+
+    @staticmethod
+    def _index_metadata_files(
+        server: str,
+        read: Callable[[str], bytes],
+        previous: Optional[ServerIndex] = None
+    ) -> Optional[ServerIndex]:
+        """read(상대 경로)로 읽은 metadata.json들 → 서버 색인"""
+        def load(name: str) -> Optional[Dict[str, Any]]:
+            try:
+                return json.loads(read(name))
+            except (OSError, KeyError, ValueError):
+                return None
+
+        metadata = load("metadata.json")
+        if metadata is None:
+            return None
+
+        categories = {}
+        tools = {}
+        sources = {}
+        for cat_name, cat_info in metadata['categories'].items():
+            cat_metadata = load(f"{cat_name}/metadata.json")
+            if cat_metadata is None:
+                categories[cat_name] = CategoryInfo(
+                    name=cat_name,
+                    server=server,
+                    description=cat_info['description'],
+                    tool_count=cat_info['tool_count'],
+                    keywords=cat_info['keywords']
+                )
+                continue
+
+            # 생성 시각은 비교에서 제외
+            source = sources[cat_name] = (cat_info, cat_metadata['tools'])
+            if previous is not None and previous.sources.get(cat_name) == source:
+                categories[cat_name] = previous.categories[cat_name]
+                tools[cat_name] = previous.tools[cat_name]
+                continue
+
+            categories[cat_name] = CategoryInfo(
+                name=cat_name,
+                server=server,
+                description=cat_info['description'],
+                tool_count=cat_info['tool_count'],
+                keywords=cat_info['keywords']
+            )
+            tools[cat_name] = {
+                tool_info['name']: ToolInfo(
+                    name=tool_info['name'],
+                    server=server,
+                    category=cat_name,
+                    description=tool_info['description'],
+                    schema_source=tool_info.get('input_schema'),
+                    keywords=tool_info.get('keywords', cat_info['keywords'])
+                )
+                for tool_info in cat_metadata['tools']
+            }
+        return ServerIndex(metadata=metadata, categories=categories, tools=tools, sources=sources)
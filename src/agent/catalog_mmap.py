@@ -0,0 +1,449 @@
+"""mmap으로 여는 바이너리 카탈로그"""
+import os
+import json
+import mmap
+import struct
+import threading
+import time
+from pathlib import Path
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
+
+from .catalog_index import ToolInfo, CategoryInfo
+from .search_index import query_terms, expands_prefix, iter_ranked
+from .fuzzy_index import FuzzyVocabulary
+
+
+# FileGenerator(catalog_bin=True)가 출력 디렉토리에 만드는 바이너리 카탈로그
+CATALOG_BIN_FILENAME = "catalog.bin"
+
+BINARY_MAGIC = b"CXCATBIN"
+BINARY_VERSION = 3
+
+# 레코드 구조 (generator.catalog_binary와 같음)
+HEADER = struct.Struct("<8sI5I10Q")
+SERVER = struct.Struct("<6I")
+CATEGORY = struct.Struct("<9I")
+TOOL = struct.Struct("<9I")
+ORDER = struct.Struct("<I")
+TOKEN = struct.Struct("<4I")
+POSTING = struct.Struct("<If")
+GRAM = struct.Struct("<5I")
+GRAM_TOKEN = struct.Struct("<I")
+
+
+class _Mapping:
+    """catalog.bin 파일 하나의 매핑 (파일이 교체되면 새로 만듦)"""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.stamp = (stat.st_ino, stat.st_mtime_ns)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        try:
+            (
+                magic, version,
+                self.server_count, self.category_count, self.tool_count, self.token_count,
+                self.gram_count, self._servers, self._categories, self._tools,
+                self._category_order, self._tool_order, self._tokens, self._postings,
+                self._grams, self._gram_tokens, self._strings
+            ) = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 카탈로그 파일입니다: {path}")
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return str(self._view[start:start + length], 'utf-8')
+
+    def _bytes(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self._mm[start:start + length]
+
+    def _bisect(self, key: bytes, lo: int, hi: int, name_at: Callable[[int], bytes]) -> int:
+        """name_at(i)가 key 이상인 첫 위치 (lo~hi 구간은 이름순)"""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if name_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # 레코드
+
+    def server(self, server_id: int) -> Tuple[int, ...]:
+        return SERVER.unpack_from(self._mm, self._servers + server_id * SERVER.size)
+
+    def category(self, category_id: int) -> Tuple[int, ...]:
+        return CATEGORY.unpack_from(self._mm, self._categories + category_id * CATEGORY.size)
+
+    def tool(self, tool_id: int) -> Tuple[int, ...]:
+        return TOOL.unpack_from(self._mm, self._tools + tool_id * TOOL.size)
+
+    def _ordered(self, table: int, position: int) -> int:
+        return ORDER.unpack_from(self._mm, table + position * ORDER.size)[0]
+
+    # 이름으로 찾기
+
+    def find_server(self, name: str) -> Optional[int]:
+        """서버 번호 (없으면 None)"""
+        key = name.encode('utf-8')
+        position = self._bisect(
+            key, 0, self.server_count,
+            lambda server_id: self._bytes(*self.server(server_id)[:2])
+        )
+        if position < self.server_count and self._bytes(*self.server(position)[:2]) == key:
+            return position
+        return None
+
+    def find_category(self, server: str, name: str) -> Optional[int]:
+        """카테고리 번호 (서버나 카테고리가 없으면 None)"""
+        server_id = self.find_server(server)
+        if server_id is None:
+            return None
+        first, count = self.server(server_id)[4:6]
+
+        def name_at(position: int) -> bytes:
+            return self._bytes(*self.category(self._ordered(self._category_order, position))[:2])
+
+        key = name.encode('utf-8')
+        position = self._bisect(key, first, first + count, name_at)
+        if position < first + count and name_at(position) == key:
+            return self._ordered(self._category_order, position)
+        return None
+
+    def find_tool(self, category_id: int, name: str) -> Optional[int]:
+        """카테고리 안의 도구 번호 (없으면 None)"""
+        first, count = self.category(category_id)[7:9]
+
+        def name_at(position: int) -> bytes:
+            return self._bytes(*self.tool(self._ordered(self._tool_order, position))[:2])
+
+        key = name.encode('utf-8')
+        position = self._bisect(key, first, first + count, name_at)
+        if position < first + count and name_at(position) == key:
+            return self._ordered(self._tool_order, position)
+        return None
+
+    # 디코딩
+
+    def server_name(self, server_id: int) -> str:
+        return self._string(*self.server(server_id)[:2])
+
+    def metadata(self, server_id: int) -> Dict[str, Any]:
+        return json.loads(self._string(*self.server(server_id)[2:4]))
+
+    def category_info(self, category_id: int) -> CategoryInfo:
+        record = self.category(category_id)
+        return CategoryInfo(
+            name=self._string(*record[0:2]),
+            server=self.server_name(record[6]),
+            description=self._string(*record[2:4]),
+            tool_count=record[8],
+            keywords=json.loads(self._string(*record[4:6]))
+        )
+
+    def tool_info(self, tool_id: int) -> ToolInfo:
+        record = self.tool(tool_id)
+        category = self.category(record[8])
+        return ToolInfo(
+            name=self._string(*record[0:2]),
+            server=self.server_name(category[6]),
+            category=self._string(*category[0:2]),
+            description=self._string(*record[2:4]),
+            schema_source=self._string(*record[4:6]) if record[5] else None,
+            keywords=json.loads(self._string(*record[6:8]))
+        )
+
+    # 검색
+
+    def _token(self, token_id: int) -> Tuple[bytes, int, int]:
+        """토큰의 (UTF-8 바이트, 첫 포스팅, 포스팅 수)"""
+        offset, length, first, count = TOKEN.unpack_from(
+            self._mm, self._tokens + token_id * TOKEN.size
+        )
+        return self._bytes(offset, length), first, count
+
+    def token_text(self, token_id: int) -> str:
+        return str(self._token(token_id)[0], 'utf-8')
+
+    def find_token(self, token: str) -> Optional[int]:
+        """토큰 번호 (없으면 None)"""
+        key = token.encode('utf-8')
+        token_id = self._bisect(key, 0, self.token_count, lambda token_id: self._token(token_id)[0])
+        if token_id < self.token_count and self._token(token_id)[0] == key:
+            return token_id
+        return None
+
+    def prefixed_tokens(self, prefix: str) -> range:
+        """prefix로 시작하는 토큰 번호 구간 (토큰 표는 UTF-8 순서 = 문자열 순서)"""
+        key = prefix.encode('utf-8')
+        first = self._bisect(key, 0, self.token_count, lambda token_id: self._token(token_id)[0])
+        end = first
+        while end < self.token_count and self._token(end)[0].startswith(key):
+            end += 1
+        return range(first, end)
+
+    def _gram(self, gram_id: int) -> Tuple[bytes, int, int, int]:
+        """트라이그램의 (UTF-8 바이트, 비교용 문자열 길이, 첫 토큰 목록 위치, 토큰 수)"""
+        offset, length, key_length, first, count = GRAM.unpack_from(
+            self._mm, self._grams + gram_id * GRAM.size
+        )
+        return self._bytes(offset, length), key_length, first, count
+
+    def gram_lengths(self, gram: str, min_length: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        트라이그램의 (비교용 문자열 길이, 첫 토큰 목록 위치, 토큰 수) - 길이가
+        min_length 이상인 것만 짧은 순으로
+        """
+        key = gram.encode('utf-8')
+        gram_id = self._bisect(
+            (key, min_length), 0, self.gram_count, lambda gram_id: self._gram(gram_id)[:2]
+        )
+        while gram_id < self.gram_count:
+            found, length, first, count = self._gram(gram_id)
+            if found != key:
+                return
+            yield length, first, count
+            gram_id += 1
+
+    def gram_tokens(self, first: int, count: int) -> List[int]:
+        """트라이그램이 들어 있는 토큰 번호 (오름차순)"""
+        start = self._gram_tokens + first * GRAM_TOKEN.size
+        return [token_id for token_id, in GRAM_TOKEN.iter_unpack(
+            self._view[start:start + count * GRAM_TOKEN.size]
+        )]
+
+    def expand(self, term: str) -> List[Tuple[int, int, float]]:
+        """
+        term과 일치하거나 term으로 시작하는 토큰의 (첫 포스팅, 포스팅 수, 점수 비율)
+
+        활용형/중간 일치/오타로 찾은 토큰도 SearchIndex와 같은 순서로 포함합니다
+        (FuzzyVocabulary.matching()). 짧은 단어는 접두어로 검색하지 않습니다(expands_prefix()).
+        """
+        tokens = []
+        for token, ratio in _MappedVocabulary(self).matching(term, expands_prefix(term)):
+            _, first, count = self._token(self.find_token(token))
+            tokens.append((first, count, ratio))
+        return tokens
+
+    def postings(self, first: int, count: int):
+        """포스팅 (도구 번호, BM25 점수) - 매핑을 복사하지 않고 읽음"""
+        start = self._postings + first * POSTING.size
+        return POSTING.iter_unpack(self._view[start:start + count * POSTING.size])
+
+
+class _MappedVocabulary(FuzzyVocabulary):
+    """
+    catalog.bin의 토큰 표와 어휘 트라이그램 표를 그대로 조회하는 어휘
+
+    생성기가 만든 (트라이그램, 길이) → 토큰 번호 목록 표를 이분 탐색하므로 메모리에
+    트라이그램 색인을 만들지 않고, 후보로 고른 토큰만 문자열로 디코딩합니다.
+    """
+
+    def __init__(self, mapping: _Mapping):
+        self._mapping = mapping
+
+    def __contains__(self, token: str) -> bool:
+        return self._mapping.find_token(token) is not None
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        mapping = self._mapping
+        return [mapping.token_text(token_id) for token_id in mapping.prefixed_tokens(prefix)]
+
+    def _sharing(self, grams: List[str], lengths: range, required: int) -> List[str]:
+        mapping = self._mapping
+        shared: Counter = Counter()
+        for gram in grams:
+            for length, first, count in mapping.gram_lengths(gram, lengths.start):
+                if length >= lengths.stop:
+                    break
+                shared.update(mapping.gram_tokens(first, count))
+
+        # 토큰 번호는 토큰 순서이므로 (많이 공유하는 순, 토큰 순)
+        candidates = sorted(
+            (-count, token_id) for token_id, count in shared.items() if count >= required
+        )[:self.MAX_CANDIDATES]
+        return [mapping.token_text(token_id) for _, token_id in candidates]
+
+    def _containing_all(self, grams: List[str], min_length: int) -> List[str]:
+        mapping = self._mapping
+        # 트라이그램마다 {길이: (첫 토큰 목록 위치, 토큰 수)} - 모든 트라이그램에 있는 길이만 확인
+        groups = [
+            {
+                length: (first, count)
+                for length, first, count in mapping.gram_lengths(gram, min_length + 1)
+            }
+            for gram in grams
+        ]
+        tokens = []
+        for length in set(groups[0]).intersection(*groups[1:]):
+            # 작은 목록부터 교집합
+            ranges = sorted((group[length] for group in groups), key=lambda item: item[1])
+            token_ids = set(mapping.gram_tokens(*ranges[0]))
+            for first, count in ranges[1:]:
+                if not token_ids:
+                    break
+                token_ids.intersection_update(mapping.gram_tokens(first, count))
+            tokens.extend(mapping.token_text(token_id) for token_id in token_ids)
+        return tokens
+
+
+class MappedCatalog:
+    """
+    catalog.bin을 mmap으로 열어 필요한 레코드만 디코딩하는 카탈로그 저장소
+
+    여는 데는 헤더만 읽으므로 카탈로그 크기와 관계없이 바로 시작하며, 목록/조회는
+    이름순 표의 이분 탐색으로, 검색은 생성기가 포스팅마다 미리 계산해 둔 BM25
+    점수(SearchIndex와 같은 계산)를 더하기만 합니다. 돌려줄 레코드만 ToolInfo/CategoryInfo로 만들고 나머지는
+    매핑을 그대로 읽으므로, 같은 호스트의 여러 프로세스가 페이지 캐시에 있는 파일
+    한 벌을 공유합니다.
+
+    생성기는 파일을 통째로 교체하므로 check_interval초에 한 번 파일 식별자를 확인해
+    바뀌었으면 새로 매핑하고 version을 올립니다.
+
+    Usage:
+        catalog = MappedCatalog(Path('output/servers/catalog.bin'))
+        tools = catalog.search("create issue", limit=10)
+    """
+
+    def __init__(self, path: Path, check_interval: float = 1.0):
+        """
+        Args:
+            path: catalog.bin 경로
+            check_interval: 파일이 교체되었는지 확인하는 최소 간격(초)
+        """
+        if not path.exists():
+            raise ValueError(
+                f"바이너리 카탈로그를 찾을 수 없습니다: {path} "
+                f"('python main.py generate --catalog-bin'으로 생성하세요)"
+            )
+        self.path = path
+        self.check_interval = check_interval
+
+        # 파일이 교체되어 다시 매핑할 때마다 증가
+        self._version = 0
+
+        self._lock = threading.Lock()
+        self._mapping = _Mapping(path)
+        self._checked_at = time.monotonic()
+
+    @property
+    def version(self) -> int:
+        """카탈로그 버전 (파일이 교체되면 바뀜)"""
+        self._current()
+        return self._version
+
+    def _current(self) -> _Mapping:
+        """현재 매핑 (check_interval이 지났으면 교체 여부 확인)"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+        return self._mapping
+
+    def refresh(self) -> bool:
+        """파일이 교체되었으면 다시 매핑하고 True"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return False
+            if (stat.st_ino, stat.st_mtime_ns) == self._mapping.stamp:
+                return False
+
+            # 이전 매핑은 조회 중인 스레드가 놓을 때 가비지 컬렉션으로 해제됨
+            self._mapping = _Mapping(self.path)
+            self._version += 1
+            return True
+
+    def close(self):
+        with self._lock:
+            self._mapping.close()
+
+    def servers(self) -> List[str]:
+        """서버 이름 목록 (정렬됨)"""
+        mapping = self._current()
+        return [mapping.server_name(server_id) for server_id in range(mapping.server_count)]
+
+    def metadata(self, server: str) -> Optional[Dict[str, Any]]:
+        """서버 metadata.json 내용 (서버가 없으면 None)"""
+        mapping = self._current()
+        server_id = mapping.find_server(server)
+        return mapping.metadata(server_id) if server_id is not None else None
+
+    def categories(self, server: str) -> List[CategoryInfo]:
+        """서버의 카테고리 목록"""
+        mapping = self._current()
+        server_id = mapping.find_server(server)
+        if server_id is None:
+            return []
+        first, count = mapping.server(server_id)[4:6]
+        return [mapping.category_info(category_id) for category_id in range(first, first + count)]
+
+    def has_category(self, server: str, category: str) -> bool:
+        return self._current().find_category(server, category) is not None
+
+    def tools(self, server: str, category: str) -> List[ToolInfo]:
+        """카테고리의 도구 목록"""
+        mapping = self._current()
+        category_id = mapping.find_category(server, category)
+        if category_id is None:
+            return []
+        first, count = mapping.category(category_id)[7:9]
+        return [mapping.tool_info(tool_id) for tool_id in range(first, first + count)]
+
+    def iter_tools(self, server: str, category: str, offset: int = 0,
+                   limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """카테고리의 도구를 offset번째부터 하나씩 반환"""
+        mapping = self._current()
+        category_id = mapping.find_category(server, category)
+        if category_id is None:
+            return iter(())
+        first, count = mapping.category(category_id)[7:9]
+        end = first + count if limit is None else min(first + count, first + offset + limit)
+        return (mapping.tool_info(tool_id) for tool_id in range(first + offset, end))
+
+    def tool(self, server: str, category: str, name: str) -> Optional[ToolInfo]:
+        """도구 하나 (없으면 None)"""
+        mapping = self._current()
+        category_id = mapping.find_category(server, category)
+        if category_id is None:
+            return None
+        tool_id = mapping.find_tool(category_id, name)
+        return mapping.tool_info(tool_id) if tool_id is not None else None
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[ToolInfo]:
+        """검색어와 일치하는 도구 (BM25 점수 순, 같으면 카탈로그 순서)"""
+        return list(self.iter_search(query, limit=limit))
+
+    def iter_search(self, query: str, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """
+        검색어와 일치하는 도구를 offset번째부터 순위대로 하나씩 반환
+
+        검색어의 각 단어를 접두어로도 취급하고 활용형/중간 일치/오타로 찾은 토큰도 더합니다
+        (SearchIndex.search()와 같은 규칙, 후보는 파일의 어휘 트라이그램 표에서 찾음).
+        점수는 포스팅만 읽어 계산하고, 도구 레코드는 꺼낼 때 디코딩합니다.
+        """
+        mapping = self._current()
+        terms = query_terms(query)
+        if not terms or not mapping.tool_count:
+            return iter(())
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            for first, count, ratio in mapping.expand(term):
+                get = scores.get
+                for tool_id, score in mapping.postings(first, count):
+                    scores[tool_id] = get(tool_id, 0.0) + ratio * score
+
+        return (mapping.tool_info(tool_id) for tool_id in iter_ranked(scores, offset, limit))
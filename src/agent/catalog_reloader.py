@@ -0,0 +1,123 @@
+"""출력 디렉토리 변경을 감지해 카탈로그 색인을 다시 로드하는 감시자"""
+import threading
+from typing import Callable, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # 선택 의존성 (pip install -e .[watch])
+    Observer = None
+    FileSystemEventHandler = object
+
+from .catalog_index import CatalogIndex
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """파일 시스템 이벤트가 오면 감시 스레드를 깨움"""
+
+    def __init__(self, changed: threading.Event):
+        super().__init__()
+        self._changed = changed
+
+    def on_any_event(self, event):
+        self._changed.set()
+
+
+class CatalogReloader:
+    """
+    출력 디렉토리를 감시하다가 생성 결과가 바뀌면 CatalogIndex.refresh() 호출
+
+    watchdog이 설치되어 있으면 운영체제 알림(Linux inotify, macOS FSEvents,
+    Windows ReadDirectoryChangesW)으로 변경을 받고, 없으면 poll_interval초마다
+    파일 식별자를 확인합니다. FileGenerator는 서버 경로, 압축 파일,
+    catalog.snapshot을 모두 출력 디렉토리 바로 아래에서 교체하므로 하위 디렉토리는
+    감시하지 않습니다. 알림이 몰려 와도 debounce초 동안 모아서 한 번만 갱신합니다.
+
+    Usage:
+        reloader = CatalogReloader(index, on_reload=lambda version: ...)
+        reloader.start()
+        ...
+        reloader.stop()
+    """
+
+    def __init__(
+        self,
+        index: CatalogIndex,
+        poll_interval: float = 2.0,
+        debounce: float = 0.2,
+        on_reload: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Args:
+            index: 갱신할 카탈로그 색인
+            poll_interval: watchdog이 없을 때 확인 간격(초)
+            debounce: 변경 알림을 모으는 시간(초)
+            on_reload: 카탈로그가 바뀌었을 때 새 버전으로 호출할 함수
+        """
+        self.index = index
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.on_reload = on_reload
+
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    @property
+    def backend(self) -> str:
+        """변경 감지 방식 ("watchdog" 또는 "polling")"""
+        return "watchdog" if Observer is not None else "polling"
+
+    def start(self):
+        """감시 시작 (이미 시작했으면 무시)"""
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(
+                _ChangeHandler(self._changed),
+                str(self.index.output_dir),
+                recursive=False
+            )
+            self._observer.daemon = True
+            self._observer.start()
+
+        self._thread = threading.Thread(target=self._run, name="catalog-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """감시 종료"""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """감시 스레드"""
+        # 알림을 받을 수 있어도 놓친 이벤트에 대비해 가끔은 직접 확인
+        timeout = self.poll_interval if self._observer is None else self.poll_interval * 30
+
+        while not self._stopped.is_set():
+            if self._changed.wait(timeout) and not self._stopped.is_set():
+                # 생성기가 파일 여러 개를 연달아 교체하므로 잠시 모았다가 한 번에 처리
+                self._stopped.wait(self.debounce)
+            self._changed.clear()
+            if self._stopped.is_set():
+                return
+
+            try:
+                changed = self.index.refresh()
+            except OSError:
+                continue
+            if changed and self.on_reload is not None:
+                self.on_reload(self.index.version)
@@ -0,0 +1,323 @@
+"""SQLite(FTS5) 카탈로그 저장소"""
+import json
+import sqlite3
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Callable, Tuple
+
+from .catalog_index import ToolInfo, CategoryInfo
+from .search_index import query_terms, expands_prefix, iter_ranked
+from .fuzzy_index import FuzzyVocabulary
+from .search_rules import K1, field_scales, field_coefficients, token_weight
+
+
+# FileGenerator(catalog_db=True)가 출력 디렉토리에 만드는 카탈로그 데이터베이스
+CATALOG_DB_FILENAME = "catalog.db"
+
+# 읽을 수 있는 스키마 버전 (generator.catalog_db와 같음)
+SCHEMA_VERSION = 2
+
+_TOOL_COLUMNS = "name, server, category, description, input_schema, keywords"
+
+# 토큰이 나오는 도구별 (도구 번호, 이름/설명/키워드 출현 횟수, 필드별 토큰 수, 카탈로그 순서)
+_POSTINGS_SQL = (
+    "SELECT tools.id, SUM(col = 'name'), SUM(col = 'description'), SUM(col = 'keywords'), "
+    "tools.name_length, tools.description_length, tools.keyword_length, "
+    "tools.server, tools.category_position, tools.position "
+    "FROM tools_vocab_instance JOIN tools ON tools.id = tools_vocab_instance.doc "
+    "WHERE tools_vocab_instance.term = ? GROUP BY tools.id"
+)
+
+
+class _DatabaseVocabulary(FuzzyVocabulary):
+    """
+    catalog.db의 어휘 조회 (어휘 전체를 메모리에 올리지 않음)
+
+    접두어/존재 확인은 FTS5 어휘 테이블(tools_vocab)의 term 범위 조회로, 오타와
+    중간 일치 후보는 생성기가 만든 트라이그램 테이블(tools_vocab_grams)의 색인
+    조회로 찾으므로 조회마다 검색어의 트라이그램에 해당하는 행만 읽습니다.
+    """
+
+    def __init__(self, query: Callable[[str, tuple], List[tuple]]):
+        self._query = query
+
+    def __contains__(self, token: str) -> bool:
+        return bool(self._query("SELECT 1 FROM tools_vocab WHERE term = ?", (token,)))
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        rows = self._query(
+            "SELECT term FROM tools_vocab WHERE term >= ? AND term < ? ORDER BY term",
+            (prefix, prefix + "\U0010ffff")
+        )
+        return [term for term, in rows]
+
+    def _sharing(self, grams: List[str], lengths: range, required: int) -> List[str]:
+        rows = self._query(
+            f"SELECT term FROM tools_vocab_grams "
+            f"WHERE gram IN ({', '.join('?' * len(grams))}) AND length BETWEEN ? AND ? "
+            f"GROUP BY term HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC, term LIMIT ?",
+            (*grams, lengths.start, lengths.stop - 1, required, self.MAX_CANDIDATES)
+        )
+        return [term for term, in rows]
+
+    def _containing_all(self, grams: List[str], min_length: int) -> List[str]:
+        rows = self._query(
+            f"SELECT term FROM tools_vocab_grams "
+            f"WHERE gram IN ({', '.join('?' * len(grams))}) AND length > ? "
+            f"GROUP BY term HAVING COUNT(*) = ?",
+            (*grams, min_length, len(grams))
+        )
+        return [term for term, in rows]
+
+
+def _tool(row: tuple) -> ToolInfo:
+    name, server, category, description, schema, keywords = row
+    return ToolInfo(
+        name=name,
+        server=server,
+        category=category,
+        description=description,
+        schema_source=schema or None,
+        keywords=json.loads(keywords) if keywords else ()
+    )
+
+
+class SQLiteCatalogStore:
+    """
+    catalog.db에서 필요한 행만 조회하는 카탈로그 저장소
+
+    카탈로그 전체를 메모리에 올리지 않고 목록/조회는 기본 키와 색인으로 처리하므로
+    도구가 백만 개여도 메모리 사용량은 결과 크기만큼만 늘어납니다. 검색은 FTS5
+    어휘 테이블에서 검색어 토큰이 나오는 도구만 읽어 SearchIndex와 같은 BM25F
+    점수(토큰별 점수 비율, 카탈로그 순서 동점 처리)를 계산하므로 메모리 백엔드와
+    순위가 같습니다. 생성기는 한 트랜잭션으로 갱신하므로 조회할 때마다 최신
+    카탈로그를 보며, version은 다른 연결이 커밋할 때마다 바뀌는 PRAGMA
+    data_version입니다.
+
+    Usage:
+        store = SQLiteCatalogStore(Path('output/servers/catalog.db'))
+        tools = store.search("create issue", limit=10)
+    """
+
+    # iter_*()가 처음 조회하는 행 수 (다음 조회부터 두 배씩 늘림)
+    PAGE_SIZE = 100
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: catalog.db 경로
+        """
+        if not path.exists():
+            raise ValueError(
+                f"카탈로그 데이터베이스를 찾을 수 없습니다: {path} "
+                f"('python main.py generate --catalog-db'로 생성하세요)"
+            )
+        self.path = path
+        self._conn = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False
+        )
+        # 검색은 한 읽기 트랜잭션에서 여러 번 조회하므로 재진입 가능한 잠금
+        self._lock = threading.RLock()
+        self._seen_version = self.version
+
+        if self._query("PRAGMA user_version")[0][0] != SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError(
+                f"카탈로그 데이터베이스 형식이 다릅니다: {path} "
+                f"('python main.py generate --catalog-db'로 다시 생성하세요)"
+            )
+
+        # 검색 통계 (카탈로그 버전, 도구 수, 필드별 (가중치, b / 평균 길이))
+        self._statistics: Optional[Tuple[int, int, List[Tuple[float, float]]]] = None
+
+        # 활용형/중간 일치/오타 검색용 어휘 조회
+        self._vocabulary = _DatabaseVocabulary(self._query)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _paged(self, sql: str, params: tuple, offset: int,
+               limit: Optional[int]) -> Iterator[ToolInfo]:
+        """
+        sql 결과를 LIMIT/OFFSET으로 나눠 조회하며 하나씩 반환
+
+        반복하는 동안 연결을 잡고 있지 않으므로 다른 조회와 번갈아 사용할 수 있습니다.
+        조회 크기는 PAGE_SIZE부터 두 배씩 늘려 끝까지 읽어도 조회 횟수가 로그에 그칩니다.
+        """
+        page = self.PAGE_SIZE
+        while limit is None or limit > 0:
+            size = page if limit is None else min(page, limit)
+            rows = self._query(f"{sql} LIMIT ? OFFSET ?", params + (size, offset))
+            for row in rows:
+                yield _tool(row)
+            if len(rows) < size:
+                return
+            offset += size
+            page *= 2
+            if limit is not None:
+                limit -= size
+
+    @property
+    def version(self) -> int:
+        """카탈로그 버전 (생성기가 커밋하면 바뀜)"""
+        return self._query("PRAGMA data_version")[0][0]
+
+    def refresh(self) -> bool:
+        """마지막 확인 이후 카탈로그가 바뀌었으면 True"""
+        version = self.version
+        changed, self._seen_version = version != self._seen_version, version
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def servers(self) -> List[str]:
+        """서버 이름 목록 (정렬됨)"""
+        return [name for name, in self._query("SELECT name FROM servers ORDER BY name")]
+
+    def metadata(self, server: str) -> Optional[Dict[str, Any]]:
+        """서버 metadata.json 내용 (서버가 없으면 None)"""
+        rows = self._query("SELECT metadata FROM servers WHERE name = ?", (server,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def categories(self, server: str) -> List[CategoryInfo]:
+        """서버의 카테고리 목록"""
+        return [
+            CategoryInfo(
+                name=name,
+                server=server,
+                description=description,
+                tool_count=tool_count,
+                keywords=json.loads(keywords)
+            )
+            for name, description, keywords, tool_count in self._query(
+                "SELECT name, description, keywords, tool_count FROM categories "
+                "WHERE server = ? ORDER BY position",
+                (server,)
+            )
+        ]
+
+    def has_category(self, server: str, category: str) -> bool:
+        return bool(self._query(
+            "SELECT 1 FROM categories WHERE server = ? AND name = ?", (server, category)
+        ))
+
+    def tools(self, server: str, category: str) -> List[ToolInfo]:
+        """카테고리의 도구 목록"""
+        return [
+            _tool(row) for row in self._query(
+                f"SELECT {_TOOL_COLUMNS} FROM tools "
+                f"WHERE server = ? AND category = ? ORDER BY position",
+                (server, category)
+            )
+        ]
+
+    def iter_tools(self, server: str, category: str, offset: int = 0,
+                   limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """카테고리의 도구를 offset번째부터 하나씩 반환"""
+        return self._paged(
+            f"SELECT {_TOOL_COLUMNS} FROM tools "
+            f"WHERE server = ? AND category = ? ORDER BY position",
+            (server, category),
+            offset,
+            limit
+        )
+
+    def tool(self, server: str, category: str, name: str) -> Optional[ToolInfo]:
+        """도구 하나 (없으면 None)"""
+        rows = self._query(
+            f"SELECT {_TOOL_COLUMNS} FROM tools WHERE server = ? AND category = ? AND name = ?",
+            (server, category, name)
+        )
+        return _tool(rows[0]) if rows else None
+
+    def _field_scales(self) -> Tuple[int, List[Tuple[float, float]]]:
+        """도구 수와 필드별 (가중치, b / 평균 길이) - 카탈로그 버전마다 한 번 계산"""
+        version = self.version
+        if self._statistics is None or self._statistics[0] != version:
+            count, *totals = self._query(
+                "SELECT COUNT(*), COALESCE(SUM(name_length), 0), "
+                "COALESCE(SUM(description_length), 0), COALESCE(SUM(keyword_length), 0) "
+                "FROM tools"
+            )[0]
+            self._statistics = (version, count, field_scales(count or 1, totals))
+        return self._statistics[1], self._statistics[2]
+
+    def _scores(self, terms: List[str]) -> Tuple[Dict[int, float], Dict[int, tuple]]:
+        """
+        도구 번호별 BM25F 점수와 카탈로그 순서 (서버, 카테고리 순서, 도구 순서)
+
+        SearchIndex.scores()와 같은 토큰을 같은 순서로 더합니다 - 검색어의 단어마다
+        FuzzyVocabulary.matching()이 고른 토큰의 포스팅을 FTS5 instance 어휘
+        테이블에서 읽습니다.
+        """
+        count, scales = self._field_scales()
+        scores: Dict[int, float] = {}
+        order: Dict[int, tuple] = {}
+        coefficients: Dict[int, Tuple[float, ...]] = {}
+        for term in terms:
+            for token, ratio in self._vocabulary.matching(term, expands_prefix(term)):
+                rows = self._query(_POSTINGS_SQL, (token,))
+                weight = ratio * token_weight(count, len(rows))
+                for row in rows:
+                    tool_id, name_tf, description_tf, keyword_tf = row[:4]
+                    coefficient = coefficients.get(tool_id)
+                    if coefficient is None:
+                        coefficient = coefficients[tool_id] = field_coefficients(scales, row[4:7])
+                        order[tool_id] = row[7:]
+                    name_c, description_c, keyword_c = coefficient
+                    tf = name_c * name_tf + description_c * description_tf + keyword_c * keyword_tf
+                    scores[tool_id] = scores.get(tool_id, 0.0) + weight * tf / (tf + K1)
+        return scores, order
+
+    def _tools_by_id(self, tool_ids: Iterator[int]) -> Iterator[ToolInfo]:
+        """
+        도구 번호 순서대로 ToolInfo (PAGE_SIZE개씩 조회)
+
+        점수를 계산한 뒤 서버가 다시 게시되어 없어진 도구는 건너뜁니다.
+        """
+        while True:
+            chunk = list(islice(tool_ids, self.PAGE_SIZE))
+            if not chunk:
+                return
+            rows = {
+                row[0]: row[1:] for row in self._query(
+                    f"SELECT id, {_TOOL_COLUMNS} FROM tools "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk)
+                )
+            }
+            for tool_id in chunk:
+                row = rows.get(tool_id)
+                if row is not None:
+                    yield _tool(row)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[ToolInfo]:
+        """검색어와 일치하는 도구 (BM25F 점수 순, 같으면 카탈로그 순서)"""
+        return list(self.iter_search(query, limit=limit))
+
+    def iter_search(self, query: str, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """
+        검색어와 일치하는 도구를 offset번째부터 순위대로 하나씩 반환
+
+        검색어의 각 단어를(MIN_PREFIX 이상이면 접두어로도) 찾고 활용형/중간 일치/오타로
+        찾은 토큰도 더합니다(SearchIndex.search()와 같은 규칙과 점수). 점수는 한 읽기
+        트랜잭션에서 계산하므로 생성기가 도중에 커밋해도 한 버전의 카탈로그만 봅니다.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return iter(())
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                scores, order = self._scores(terms)
+            finally:
+                self._conn.execute("COMMIT")
+        return self._tools_by_id(iter_ranked(scores, offset, limit, order.__getitem__))
@@ -1,9 +1,27 @@
 """안전한 코드 실행 환경"""
 import sys
 import io
+import ast
+import asyncio
 import traceback
 from typing import Dict, Any, Optional
-from contextlib import redirect_stdout, redirect_stderr
+
+
+def _capturing_print(stdout: io.StringIO, stderr: io.StringIO):
+    """
+    실행마다 자기 버퍼에 쓰는 print
+
+    전역 sys.stdout을 바꾸지 않으므로 await하는 동안 다른 요청의 출력과 섞이지
+    않습니다. file=sys.stderr로 쓴 출력은 stderr 버퍼로 갑니다.
+    """
+    def capture(*args, file=None, **kwargs):
+        if file is None or file is sys.stdout:
+            file = stdout
+        elif file is sys.stderr:
+            file = stderr
+        print(*args, file=file, **kwargs)
+
+    return capture
 
 
 class CodeExecutor:
@@ -49,19 +67,21 @@ class CodeExecutor:
             exec_globals = {
                 "__builtins__": __builtins__,
                 "agent": self.mcp_agent,
-                "print": print,  # print는 capture됨
+                "print": _capturing_print(stdout_capture, stderr_capture),
             }
 
             exec_locals = {}
 
-            # stdout/stderr 캡처
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                # 코드 실행
-                exec(code, exec_globals, exec_locals)
+            compiled = compile(code, "<generated>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
 
-                # return_value 추출 (있으면)
-                if 'result' in exec_locals:
-                    result['return_value'] = exec_locals['result']
+            # 코드 실행 (최상위 await가 있으면 코루틴이 반환됨, print는 실행별 버퍼로 캡처)
+            coroutine = eval(compiled, exec_globals, exec_locals)
+            if coroutine is not None:
+                self._run_top_level(coroutine, timeout)
+
+            # return_value 추출 (있으면)
+            if 'result' in exec_locals:
+                result['return_value'] = exec_locals['result']
 
             result['success'] = True
             result['output'] = stdout_capture.getvalue()
@@ -79,6 +99,89 @@ class CodeExecutor:
 
         return result
 
+    def _run_top_level(self, coroutine, timeout: int):
+        """
+        최상위 await 코드를 호출한 스레드의 새 이벤트 루프에서 실행
+
+        Agent의 백그라운드 루프에서 실행하면 코드 안의 동기 agent.execute()가 같은
+        루프를 기다리며 멈추므로 따로 루프를 만들고, 끝나면 그 루프에서 시작한 서버
+        연결을 정리합니다.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coroutine.close()
+            raise RuntimeError("이벤트 루프 안에서는 aexecute()로 코드를 실행하세요")
+
+        async def main():
+            try:
+                await asyncio.wait_for(coroutine, timeout)
+            finally:
+                await self.mcp_agent.aclose_connections()
+
+        asyncio.run(main())
+
+    async def aexecute(self, code: str, timeout: int = 30) -> Dict[str, Any]:
+        """
+        코드 실행 (코루틴)
+
+        코드의 최상위에서 await를 쓸 수 있으므로 생성된 코드가 agent.aexecute()와
+        agent.agather()로 도구 호출을 현재 이벤트 루프에서 겹쳐서 실행할 수 있습니다.
+
+        Args:
+            code: 실행할 Python 코드
+            timeout: 타임아웃 (초, await하는 동안에만 적용)
+
+        Returns:
+            실행 결과 딕셔너리
+        """
+        stdout_capture = io.StringIO()
+        stderr_capture = io.StringIO()
+
+        result = {
+            "success": False,
+            "output": "",
+            "error": None,
+            "return_value": None
+        }
+
+        try:
+            exec_globals = {
+                "__builtins__": __builtins__,
+                "agent": self.mcp_agent,
+                "print": _capturing_print(stdout_capture, stderr_capture),
+            }
+
+            exec_locals = {}
+
+            compiled = compile(code, "<generated>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+
+            # 최상위 await가 있으면 코루틴이 반환됨 (동시에 실행되는 요청끼리 출력이 섞이지 않도록
+            # 전역 stdout을 바꾸지 않고 실행별 print로 캡처)
+            coroutine = eval(compiled, exec_globals, exec_locals)
+            if coroutine is not None:
+                await asyncio.wait_for(coroutine, timeout)
+
+            if 'result' in exec_locals:
+                result['return_value'] = exec_locals['result']
+
+            result['success'] = True
+            result['output'] = stdout_capture.getvalue()
+
+            stderr_output = stderr_capture.getvalue()
+            if stderr_output:
+                result['warnings'] = stderr_output
+
+        except Exception as e:
+            result['success'] = False
+            result['error'] = str(e) or type(e).__name__
+            result['traceback'] = traceback.format_exc()
+            result['output'] = stdout_capture.getvalue()
+
+        return result
+
     def execute_safe(self, code: str) -> Dict[str, Any]:
         """
         더 안전한 실행 (제한된 builtins)
@@ -89,9 +192,12 @@ class CodeExecutor:
         Returns:
             실행 결과
         """
+        stdout_capture = io.StringIO()
+        stderr_capture = io.StringIO()
+
         # 안전한 builtins만 허용
         safe_builtins = {
-            'print': print,
+            'print': _capturing_print(stdout_capture, stderr_capture),
             'len': len,
             'range': range,
             'enumerate': enumerate,
@@ -111,9 +217,6 @@ class CodeExecutor:
             'None': None,
         }
 
-        stdout_capture = io.StringIO()
-        stderr_capture = io.StringIO()
-
         result = {
             "success": False,
             "output": "",
@@ -129,11 +232,10 @@ class CodeExecutor:
 
             exec_locals = {}
 
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(code, exec_globals, exec_locals)
+            exec(code, exec_globals, exec_locals)
 
-                if 'result' in exec_locals:
-                    result['return_value'] = exec_locals['result']
+            if 'result' in exec_locals:
+                result['return_value'] = exec_locals['result']
 
             result['success'] = True
             result['output'] = stdout_capture.getvalue()
@@ -76,23 +76,17 @@ class CodeGenerator:
 
     def _search_relevant_tools(self, query: str) -> List[Dict[str, Any]]:
         """질문과 관련된 도구 검색"""
-        keywords = query.lower().split()
-
-        relevant = []
-        for keyword in keywords:
-            tools = self.mcp_agent.search_tools(keyword)
-            for tool in tools[:3]:
-                tool_info = {
-                    "server": tool.server,
-                    "category": tool.category,
-                    "tool": tool.name,
-                    "description": tool.description,
-                    "keywords": tool.keywords
-                }
-                if tool_info not in relevant:
-                    relevant.append(tool_info)
-
-        return relevant[:10]
+        # 질문 전체를 한 번에 검색 (기능어는 빼고, 질문의 단어와 많이 일치하는 도구가 앞에 옴)
+        return [
+            {
+                "server": tool.server,
+                "category": tool.category,
+                "tool": tool.name,
+                "description": tool.description,
+                "keywords": tool.keywords
+            }
+            for tool in self.mcp_agent.iter_search(query, limit=10)
+        ]
 
     def _build_prompt(self, user_query: str, relevant_tools: List[Dict], context: Optional[str]) -> str:
         """Claude용 프롬프트 생성"""
@@ -111,7 +105,11 @@ Available Servers Structure:
 Task: Generate Python code that accomplishes the user's request using the appropriate MCP tools.
 
 Requirements:
-1. Use the MCPAgent API to execute tools: agent.execute(server, category, tool, params)
+1. Use the async MCPAgent API with top-level await to execute tools:
+     result = await agent.aexecute(server, category, tool, params)
+   - For several independent calls, run them concurrently:
+     results = await agent.agather([(server, category, tool, params), ...])
+   - Do not call the blocking agent.execute(); it stalls the event loop the code runs on
 2. Include proper error handling
 3. Return results in a structured format
 4. Add helpful comments
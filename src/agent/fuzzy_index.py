@@ -0,0 +1,326 @@
+"""검색어 오타/활용형 보정용 어휘 트라이그램 색인"""
+import heapq
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter
+from typing import List, Dict, Set, Tuple, Optional, Iterable
+
+from .search_rules import PREFIX_WEIGHT, fuzzy_key, trigrams
+
+
+def bounded_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    a와 b의 편집 거리 (삽입, 삭제, 치환, 인접 문자 교환), limit보다 크면 None
+
+    대각선에서 limit 이내인 칸만 계산하고 한 행이 모두 limit을 넘으면 바로 멈추므로
+    거리가 먼 후보는 몇 글자만 비교하고 끝납니다.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+
+    over = limit + 1
+    width = len(b)
+    before: List[int] = []
+    previous = list(range(width + 1))
+    for i in range(1, len(a) + 1):
+        char = a[i - 1]
+        start = max(1, i - limit)
+        end = min(width, i + limit)
+        current = [over] * (width + 1)
+        if start == 1:
+            current[0] = i
+        best = current[0]
+        for j in range(start, end + 1):
+            value = previous[j - 1] if char == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (before and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1]
+                    and before[j - 2] + 1 < value):
+                value = before[j - 2] + 1
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return None
+        before, previous = previous, current
+
+    return previous[width] if previous[width] <= limit else None
+
+
+def _is_hangul(text: str) -> bool:
+    return any('가' <= char <= '힣' for char in text)
+
+
+class FuzzyVocabulary(ABC):
+    """
+    검색어의 단어 대신(또는 함께) 찾을 토큰 고르기
+
+    - 활용형: 끝의 한두 글자를 뗀 어간 토큰 ("계정을" → "계정", "issues" → "issue").
+      조사가 붙은 한글 검색어와 복수형 영어 검색어용입니다.
+    - 오타: 편집 거리가 max_distance() 이하인 토큰 ("isue" → "issue",
+      "게정" → "계정"). 트라이그램 색인에서 검색어의 트라이그램을 충분히 공유하는
+      토큰만 골라 거리를 확인하므로 어휘 전체를 훑지 않습니다.
+    - 중간 일치: 검색어를 중간에 포함하는 토큰 ("sheet" → "spreadsheet",
+      "count" → "account"). 검색어의 트라이그램을 모두 가진 더 긴 토큰만 확인합니다.
+
+    어휘 조회(__contains__, _prefixed, _sharing, _containing_all)는 하위 클래스가
+    구현합니다 - FuzzyIndex는 메모리의 트라이그램 색인으로, SQLite 저장소는
+    catalog.db의 어휘/트라이그램 테이블로 조회합니다.
+    """
+
+    # 활용형/중간 일치/오타로 찾은 토큰의 점수 비율 (접두어 일치 0.5보다 낮음)
+    STEM_WEIGHT = 0.4
+    INFIX_WEIGHT = 0.4
+    TYPO_WEIGHT = 0.3
+
+    # 떼어 볼 끝 글자 수와 남아야 하는 어간 길이 (한글, 그 외)
+    MAX_SUFFIX = 2
+    MIN_STEM = (2, 4)
+
+    # 편집 거리를 확인할 최대 후보 수 (공유하는 트라이그램이 많은 순)
+    MAX_CANDIDATES = 32
+
+    # 중간 일치를 찾는 최소 길이 (비교용 문자열 기준 - 한글은 자모 수)
+    MIN_INFIX = 4
+
+    @abstractmethod
+    def __contains__(self, token: str) -> bool:
+        """어휘에 있는 토큰인지"""
+
+    @abstractmethod
+    def _prefixed(self, prefix: str) -> List[str]:
+        """prefix로 시작하는 토큰 (정렬됨)"""
+
+    @abstractmethod
+    def _sharing(self, grams: List[str], lengths: range, required: int) -> List[str]:
+        """
+        비교용 문자열 길이가 lengths 안이고 grams를 required개 이상 공유하는 토큰
+        (많이 공유하는 순, 같으면 토큰 순으로 최대 MAX_CANDIDATES개)
+        """
+
+    @abstractmethod
+    def _containing_all(self, grams: List[str], min_length: int) -> List[str]:
+        """비교용 문자열이 min_length보다 길고 grams를 모두 가진 토큰"""
+
+    @staticmethod
+    def max_distance(key: str) -> int:
+        """허용 편집 거리 (짧은 단어는 오타 보정 안 함)"""
+        if len(key) < 4:
+            return 0
+        return 1 if len(key) < 8 else 2
+
+    def stems(self, term: str) -> List[str]:
+        """
+        term의 끝 글자를 뗀 어간 토큰
+
+        한글은 어간으로 시작하는 토큰까지("계정에서" → "계정을"), 그 외 문자는
+        어간과 같은 토큰만("issues" → "issue") 찾습니다.
+        """
+        hangul = _is_hangul(term)
+        min_stem = self.MIN_STEM[0] if hangul else self.MIN_STEM[1]
+        tokens: List[str] = []
+        for cut in range(1, self.MAX_SUFFIX + 1):
+            stem = term[:-cut]
+            if len(stem) < min_stem:
+                break
+            if hangul:
+                tokens.extend(self._prefixed(stem))
+            elif stem in self:
+                tokens.append(stem)
+        return list(dict.fromkeys(tokens))
+
+    def similar(self, term: str) -> List[Tuple[str, int]]:
+        """편집 거리가 max_distance() 이하인 토큰과 그 거리 (term 자신 제외)"""
+        key = fuzzy_key(term)
+        limit = self.max_distance(key)
+        if not limit:
+            return []
+
+        # 삽입/삭제/치환 한 번은 트라이그램을 최대 3개, 인접 문자 교환은 4개 바꾸므로
+        # 길이 차이가 limit 이내이고 트라이그램을 (개수 - 3 * limit - 1)개 이상 공유하는
+        # 토큰만 후보 (교환은 한 번까지 보장)
+        grams = trigrams(key)
+        required = max(len(grams) - 3 * limit - 1, 1)
+        candidates = self._sharing(grams, range(len(key) - limit, len(key) + limit + 1), required)
+
+        matches = []
+        for token in sorted(candidates):
+            candidate = fuzzy_key(token)
+            if candidate == key:
+                continue
+            distance = bounded_distance(key, candidate, limit)
+            if distance is not None:
+                matches.append((token, distance))
+        return matches
+
+    def containing(self, term: str) -> List[str]:
+        """term을 중간에 포함하는 토큰 (term으로 시작하는 토큰 제외, 정렬됨)"""
+        key = fuzzy_key(term)
+        if len(key) < self.MIN_INFIX:
+            return []
+
+        # 경계 문자 없는 트라이그램은 포함하는 토큰에도 모두 있음
+        grams = list(dict.fromkeys(key[i:i + 3] for i in range(len(key) - 2)))
+        return sorted(
+            token for token in self._containing_all(grams, len(key))
+            if term in token and not token.startswith(term)
+        )
+
+    def matching(self, term: str, prefix: bool) -> List[Tuple[str, float]]:
+        """
+        term과 일치하거나 (prefix면) term으로 시작하는 토큰과 그 점수 비율
+
+        접두어로만 일치한 토큰은 PREFIX_WEIGHT이고, 활용형/중간 일치/오타로 찾은
+        토큰(expand())도 포함합니다. 모든 검색 백엔드가 이 순서대로 점수를 더하므로
+        같은 검색어는 같은 점수가 됩니다.
+        """
+        tokens: Dict[str, float] = {}
+        if not prefix:
+            if term in self:
+                tokens[term] = 1.0
+        else:
+            for token in self._prefixed(term):
+                tokens[token] = 1.0 if token == term else PREFIX_WEIGHT
+
+        for token, ratio in self.expand(term):
+            tokens.setdefault(token, ratio)
+        return list(tokens.items())
+
+    def expand(self, term: str) -> List[Tuple[str, float]]:
+        """
+        term 대신(또는 함께) 찾을 토큰과 그 점수 비율 (term으로 시작하는 토큰 제외)
+
+        활용형과 중간 일치는 term이 어휘에 있어도 찾습니다 - 조사가 붙은 "계정을"이나
+        복수형 "issues"가 어휘에 있어도 "계정", "issue"가 들어간 도구를 함께 찾기
+        위해서입니다. 오타 보정은 어휘에 없는 단어만 합니다.
+        """
+        weights: Dict[str, float] = {}
+        for token in self.stems(term):
+            if not token.startswith(term):
+                weights[token] = self.STEM_WEIGHT
+        for token in self.containing(term):
+            weights.setdefault(token, self.INFIX_WEIGHT)
+        if term not in self:
+            for token, _ in self.similar(term):
+                if not token.startswith(term):
+                    weights.setdefault(token, self.TYPO_WEIGHT)
+        return list(weights.items())
+
+
+class FuzzyIndex(FuzzyVocabulary):
+    """
+    검색 어휘의 메모리 트라이그램 색인
+
+    토큰 단위로 추가/삭제할 수 있어 어휘가 바뀌어도 전체를 다시 만들지 않습니다.
+
+    Usage:
+        fuzzy = FuzzyIndex(vocabulary)
+        for token, weight in fuzzy.expand("isue"):
+            ...
+    """
+
+    def __init__(self, vocabulary: Iterable[str] = ()):
+        # {토큰: 토큰 번호}, 번호별 토큰 - 삭제된 번호는 다시 사용
+        self._tokens: Dict[str, int] = {}
+        self._entries: List[Optional[str]] = []
+        self._free: List[int] = []
+
+        # {(트라이그램, 비교용 문자열 길이): 토큰 번호 집합} - 길이 차이가 허용 거리
+        # 이내인 토큰만 세도록 길이별로 나눠 둠
+        self._grams: Dict[Tuple[str, int], Set[int]] = {}
+
+        # {비교용 문자열 길이: 토큰 수} - 중간 일치는 검색어보다 긴 길이만 확인
+        self._lengths: Counter = Counter()
+
+        # 정렬된 어휘 (어휘가 바뀌면 다음 조회에서 다시 정렬)
+        self._sorted: Optional[List[str]] = None
+
+        for token in vocabulary:
+            self.add(token)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._tokens
+
+    def add(self, token: str):
+        """어휘에 토큰 추가"""
+        if token in self._tokens:
+            return
+        key = fuzzy_key(token)
+        if self._free:
+            token_id = self._free.pop()
+            self._entries[token_id] = token
+        else:
+            token_id = len(self._entries)
+            self._entries.append(token)
+        self._tokens[token] = token_id
+        for gram in trigrams(key):
+            self._grams.setdefault((gram, len(key)), set()).add(token_id)
+        self._lengths[len(key)] += 1
+        self._sorted = None
+
+    def discard(self, token: str):
+        """어휘에서 토큰 제거 (없으면 무시)"""
+        token_id = self._tokens.pop(token, None)
+        if token_id is None:
+            return
+        key = fuzzy_key(token)
+        for gram in trigrams(key):
+            token_ids = self._grams[gram, len(key)]
+            token_ids.discard(token_id)
+            if not token_ids:
+                del self._grams[gram, len(key)]
+        self._lengths[len(key)] -= 1
+        if not self._lengths[len(key)]:
+            del self._lengths[len(key)]
+        self._entries[token_id] = None
+        self._free.append(token_id)
+        self._sorted = None
+
+    def vocabulary(self) -> List[str]:
+        """정렬된 어휘"""
+        if self._sorted is None:
+            self._sorted = sorted(self._tokens)
+        return self._sorted
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        vocabulary = self.vocabulary()
+        tokens = []
+        index = bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            tokens.append(vocabulary[index])
+            index += 1
+        return tokens
+
+    def _sharing(self, grams: List[str], lengths: range, required: int) -> List[str]:
+        shared: Counter = Counter()
+        for length in lengths:
+            for gram in grams:
+                shared.update(self._grams.get((gram, length), ()))
+        candidates = [
+            (-count, self._entries[token_id]) for token_id, count in shared.items()
+            if count >= required
+        ]
+        if len(candidates) > self.MAX_CANDIDATES:
+            candidates = heapq.nsmallest(self.MAX_CANDIDATES, candidates)
+        return [token for _, token in candidates]
+
+    def _containing_all(self, grams: List[str], min_length: int) -> List[str]:
+        # 길이별로 트라이그램의 토큰 집합 교집합 (작은 집합부터)
+        tokens = []
+        for length in self._lengths:
+            if length <= min_length:
+                continue
+            token_sets = [self._grams.get((gram, length)) for gram in grams]
+            if not all(token_sets):
+                continue
+            token_sets.sort(key=len)
+            tokens.extend(
+                self._entries[token_id]
+                for token_id in token_sets[0].intersection(*token_sets[1:])
+            )
+        return tokens
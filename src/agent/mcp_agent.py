@@ -1,44 +1,26 @@
 """MCP Agent - 생성된 구조를 탐색하고 실행하는 Agent"""
-import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import asyncio
+from itertools import islice
+from typing import List, Dict, Any, Optional, Union, Iterator, Iterable, Tuple, Coroutine
 
-
-@dataclass
-class ToolInfo:
-    """도구 정보"""
-    name: str
-    server: str
-    category: str
-    description: str
-    input_schema: Optional[Dict[str, Any]] = None
-    keywords: List[str] = None
-    
-    def __post_init__(self):
-        if self.keywords is None:
-            self.keywords = []
-
-
-@dataclass
-class CategoryInfo:
-    """카테고리 정보"""
-    name: str
-    server: str
-    description: str
-    tool_count: int
-    keywords: List[str]
-    tools: List[ToolInfo] = None
-    
-    def __post_init__(self):
-        if self.tools is None:
-            self.tools = []
+from .catalog_index import CatalogIndex, ServerIndex, ToolInfo, CategoryInfo
+from .search_index import SearchIndex
+from .catalog_reloader import CatalogReloader
+from .catalog_store import SQLiteCatalogStore, CATALOG_DB_FILENAME
+from .catalog_mmap import MappedCatalog, CATALOG_BIN_FILENAME
 
 
 class MCPAgent:
     """
     생성된 MCP 디렉토리 구조를 탐색하고 실행하는 Agent
     
+    카탈로그는 CatalogIndex가 서버 단위로 처음 조회할 때 한 번 읽어 메모리에 두고,
+    이후 조회는 같은 ToolInfo/CategoryInfo 레코드를 돌려줍니다(수정 불가).
+    backend="sqlite"면 메모리에 올리지 않고 catalog.db(generate --catalog-db)에서
+    필요한 행만 조회하고, backend="mmap"이면 catalog.bin(generate --catalog-bin)을
+    mmap으로 열어 필요한 레코드만 디코딩합니다(프로세스들이 페이지 캐시를 공유).
+    
     Usage:
         agent = MCPAgent('output/servers')
         
@@ -51,109 +33,240 @@ class MCPAgent:
         result = agent.execute('salesforce', 'accounts', 'create', {
             'name': 'New Corp'
         })
+        
+        # 비동기 실행 (같은 이벤트 루프에서 겹쳐서 진행)
+        result = await agent.aexecute('salesforce', 'accounts', 'create', {'name': 'New Corp'})
     """
     
-    def __init__(self, output_dir: str = "output/servers"):
+    BACKENDS = ("memory", "sqlite", "mmap")
+    
+    def __init__(
+        self,
+        output_dir: str = "output/servers",
+        check_interval: float = 1.0,
+        backend: str = "memory"
+    ):
         """
         Args:
             output_dir: 생성된 서버 디렉토리 경로
+            check_interval: 생성 결과가 바뀌었는지 확인하는 최소 간격(초)
+            backend: 카탈로그 백엔드 ("memory", "sqlite", "mmap")
         """
         self.output_dir = Path(output_dir)
         if not self.output_dir.exists():
             raise ValueError(f"출력 디렉토리를 찾을 수 없습니다: {output_dir}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"지원하지 않는 백엔드입니다: {backend}")
+        
+        # sqlite/mmap 백엔드의 카탈로그 저장소 (memory 백엔드면 None)
+        self._store: Optional[Union[SQLiteCatalogStore, MappedCatalog]] = None
+        if backend == "sqlite":
+            self._store = SQLiteCatalogStore(self.output_dir / CATALOG_DB_FILENAME)
+        elif backend == "mmap":
+            self._store = MappedCatalog(self.output_dir / CATALOG_BIN_FILENAME, check_interval)
+        
+        # 서버 단위로 지연 로드되는 카탈로그 색인
+        self._index = CatalogIndex(self.output_dir, check_interval)
+        
+        # search_tools()용 역색인 (바뀐 서버만 다시 색인)
+        self._search = SearchIndex()
+        
+        # execute()에서 사용하는 도구 실행기
+        self._executor = None
+        
+        # watch()로 시작한 변경 감시자
+        self._reloader: Optional[CatalogReloader] = None
+    
+    @property
+    def catalog_version(self) -> int:
+        """카탈로그 버전 (생성 결과가 바뀌어 다시 로드할 때마다 바뀜)"""
+        if self._store is not None:
+            return self._store.version
+        return self._index.version
+    
+    def reload(self) -> bool:
+        """생성 결과가 바뀌었는지 바로 확인하고 바뀐 서버만 다시 로드 (바뀌었으면 True)"""
+        if self._store is not None:
+            return self._store.refresh()
+        return self._index.refresh()
+    
+    def watch(self, poll_interval: float = 2.0):
+        """
+        출력 디렉토리 감시를 시작해 다시 생성된 결과를 자동으로 반영
+        
+        watchdog이 설치되어 있으면 파일 시스템 알림을, 없으면 poll_interval초 간격
+        확인을 사용합니다. 오래 실행되는 서비스에서 호출하세요. sqlite/mmap 백엔드는
+        조회할 때 최신 파일을 확인하므로 감시가 필요 없습니다.
+        """
+        if self._store is None and self._reloader is None:
+            self._reloader = CatalogReloader(self._index, poll_interval=poll_interval)
+            self._reloader.start()
+    
+    def close(self):
+        """watch()로 시작한 감시, 카탈로그 저장소, 실행 중인 서버 프로세스 종료"""
+        if self._reloader is not None:
+            self._reloader.stop()
+            self._reloader = None
+        if self._store is not None:
+            self._store.close()
+        if self._executor is not None:
+            self._executor.close_all()
+    
+    async def aclose_connections(self):
+        """현재 이벤트 루프에서 aexecute()로 시작한 서버 프로세스만 기다려 종료 (Agent는 계속 사용)"""
+        if self._executor is not None:
+            await self._executor.aclose()
+    
+    async def aclose(self):
+        """현재 이벤트 루프에서 aexecute()로 시작한 서버 프로세스를 기다려 종료한 뒤 close()"""
+        await self.aclose_connections()
+        self.close()
+    
+    def _server(self, server: str) -> ServerIndex:
+        """서버 색인 (없으면 ValueError)"""
+        index = self._index.server(server)
+        if index is None:
+            raise ValueError(f"서버를 찾을 수 없습니다: {server}")
+        return index
+    
+    def _category_tools(self, server: str, category: str) -> Dict[str, ToolInfo]:
+        """카테고리의 {도구 이름: ToolInfo} (없으면 ValueError)"""
+        index = self._index.server(server)
+        tools = index.tools.get(category) if index is not None else None
+        if tools is None:
+            raise ValueError(f"카테고리를 찾을 수 없습니다: {server}/{category}")
+        return tools
     
     def list_servers(self) -> List[str]:
         """사용 가능한 서버 목록 반환"""
-        servers = []
-        for item in self.output_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                servers.append(item.name)
-        return sorted(servers)
+        if self._store is not None:
+            return self._store.servers()
+        return list(self._index.servers())
     
     def list_categories(self, server: str) -> List[CategoryInfo]:
         """서버의 카테고리 목록 반환"""
-        server_path = self.output_dir / server
-        if not server_path.exists():
-            raise ValueError(f"서버를 찾을 수 없습니다: {server}")
-        
-        # 메타데이터 읽기
-        metadata_file = server_path / "metadata.json"
-        if not metadata_file.exists():
-            raise ValueError(f"메타데이터를 찾을 수 없습니다: {server}")
-        
-        metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
-        
-        categories = []
-        for cat_name, cat_info in metadata['categories'].items():
-            category = CategoryInfo(
-                name=cat_name,
-                server=server,
-                description=cat_info['description'],
-                tool_count=cat_info['tool_count'],
-                keywords=cat_info['keywords']
-            )
-            categories.append(category)
-        
-        return categories
+        if self._store is not None:
+            categories = self._store.categories(server)
+            if not categories and self._store.metadata(server) is None:
+                raise ValueError(f"서버를 찾을 수 없습니다: {server}")
+            return categories
+        return list(self._server(server).categories.values())
     
     def list_tools(self, server: str, category: str) -> List[ToolInfo]:
         """카테고리의 도구 목록 반환"""
-        category_path = self.output_dir / server / category
-        if not category_path.exists():
-            raise ValueError(f"카테고리를 찾을 수 없습니다: {server}/{category}")
+        if self._store is not None:
+            tools = self._store.tools(server, category)
+            if not tools and not self._store.has_category(server, category):
+                raise ValueError(f"카테고리를 찾을 수 없습니다: {server}/{category}")
+            return tools
+        return list(self._category_tools(server, category).values())
+    
+    def iter_tools(
+        self,
+        server: str,
+        category: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[ToolInfo]:
+        """
+        도구를 offset번째부터 하나씩 반환 (카테고리 순서, 그 안에서는 생성 순서)
         
-        # 카테고리 메타데이터 읽기
-        metadata_file = category_path / "metadata.json"
-        if not metadata_file.exists():
-            raise ValueError(f"메타데이터를 찾을 수 없습니다: {server}/{category}")
-        
-        metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
-        
-        tools = []
-        for tool_info in metadata['tools']:
-            tool = ToolInfo(
-                name=tool_info['name'],
-                server=server,
-                category=category,
-                description=tool_info['description'],
-                input_schema=tool_info.get('input_schema'),
-                keywords=tool_info.get('keywords', [])
-            )
-            tools.append(tool)
+        category가 없으면 서버의 카테고리를 차례로 이어서 돌려주며, offset보다 도구가
+        적은 앞쪽 카테고리는 tool_count만 보고 건너뜁니다. 호출한 쪽이 멈추면 나머지
+        도구는 읽지 않습니다. 서버나 카테고리가 없으면 바로 ValueError가 납니다.
         
-        return tools
+        Args:
+            server: 서버 이름
+            category: 카테고리 이름 (None이면 서버 전체)
+            offset: 건너뛸 도구 수
+            limit: 최대 도구 수 (None이면 끝까지)
+        """
+        if category is not None:
+            return self._iter_category_tools(server, category, offset, limit)
+        return self._iter_server_tools(server, self.list_categories(server), offset, limit)
+    
+    def _iter_category_tools(self, server: str, category: str, offset: int,
+                             limit: Optional[int]) -> Iterator[ToolInfo]:
+        """카테고리의 도구 반복자 (없으면 ValueError)"""
+        if self._store is not None:
+            if not self._store.has_category(server, category):
+                raise ValueError(f"카테고리를 찾을 수 없습니다: {server}/{category}")
+            return self._store.iter_tools(server, category, offset, limit)
+        tools = self._category_tools(server, category).values()
+        return islice(tools, offset, None if limit is None else offset + limit)
+    
+    def _iter_server_tools(self, server: str, categories: List[CategoryInfo], offset: int,
+                           limit: Optional[int]) -> Iterator[ToolInfo]:
+        """서버의 카테고리들을 이어서 도구 반환"""
+        for category in categories:
+            if limit is not None and limit <= 0:
+                return
+            if offset >= category.tool_count:
+                offset -= category.tool_count
+                continue
+            
+            for tool in self._iter_category_tools(server, category.name, offset, limit):
+                yield tool
+                if limit is not None:
+                    limit -= 1
+            offset = 0
     
     def get_tool_info(self, server: str, category: str, tool_name: str) -> Optional[ToolInfo]:
         """특정 도구의 상세 정보 반환"""
-        tools = self.list_tools(server, category)
-        for tool in tools:
-            if tool.name == tool_name:
-                return tool
-        return None
+        if self._store is not None:
+            tool = self._store.tool(server, category, tool_name)
+            if tool is None and not self._store.has_category(server, category):
+                raise ValueError(f"카테고리를 찾을 수 없습니다: {server}/{category}")
+            return tool
+        return self._category_tools(server, category).get(tool_name)
     
     def get_server_info(self, server: str) -> Dict[str, Any]:
         """서버의 전체 정보 반환"""
-        metadata_file = self.output_dir / server / "metadata.json"
-        if not metadata_file.exists():
+        if self._store is not None:
+            metadata = self._store.metadata(server)
+        else:
+            index = self._index.server(server)
+            metadata = dict(index.metadata) if index is not None else None
+        if metadata is None:
             raise ValueError(f"서버 메타데이터를 찾을 수 없습니다: {server}")
+        return metadata
+    
+    def search_tools(self, query: str, limit: Optional[int] = None) -> List[ToolInfo]:
+        """
+        키워드로 도구 검색
         
-        return json.loads(metadata_file.read_text(encoding='utf-8'))
+        이름, 설명, 키워드의 단어가 검색어의 단어로 시작하는 도구를 찾아 BM25 점수
+        순으로 반환합니다(이름 > 키워드 > 설명 순으로 가중치). 여러 단어를 한 번에
+        넘길 수 있습니다.
+        
+        Args:
+            query: 검색어
+            limit: 최대 결과 수 (None이면 일치한 도구 전체)
+        """
+        if self._store is not None:
+            return self._store.search(query, limit)
+        
+        self._search.sync(self._index)
+        return self._search.search(query, limit)
     
-    def search_tools(self, query: str) -> List[ToolInfo]:
-        """키워드로 도구 검색"""
-        query_lower = query.lower()
-        results = []
+    def iter_search(self, query: str, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """
+        검색 결과를 offset번째부터 순위대로 하나씩 반환 (search_tools()와 같은 순위)
         
-        for server in self.list_servers():
-            for category in self.list_categories(server):
-                for tool in self.list_tools(server, category.name):
-                    # 이름, 설명, 키워드에서 검색
-                    if (query_lower in tool.name.lower() or
-                        query_lower in tool.description.lower() or
-                        any(query_lower in kw.lower() for kw in tool.keywords)):
-                        results.append(tool)
+        순위는 꺼낼 때마다 힙에서 하나씩 정하므로 앞의 몇 개만 쓰면 나머지는 정렬하지
+        않습니다. 다음 페이지는 offset을 늘려 다시 호출하세요.
         
-        return results
+        Args:
+            query: 검색어
+            offset: 건너뛸 결과 수
+            limit: 최대 결과 수 (None이면 일치한 도구 전체)
+        """
+        if self._store is not None:
+            return self._store.iter_search(query, offset, limit)
+        
+        self._search.sync(self._index)
+        return self._search.iter_search(query, offset, limit)
     
     def execute(self, server: str, category: str, tool_name: str, 
                 params: Dict[str, Any]) -> Dict[str, Any]:
@@ -168,44 +281,142 @@ class MCPAgent:
             
         Returns:
             실행 결과
+            
+        Raises:
+            ToolInputError: 파라미터가 도구의 input_schema에 맞지 않는 경우
         """
+        tool = self.get_tool_info(server, category, tool_name)
+        # 스키마 원본을 넘겨 검증기 캐시가 원본으로 비교 (JSON 문자열을 매번 파싱하지 않음)
+        input_schema = tool.schema_source if tool is not None else None
+        return self._get_executor().execute(server, category, tool_name, params, input_schema)
+    
+    def _get_executor(self):
+        """도구 실행기 (검증기 캐시와 서버 연결을 재사용하도록 한 번만 생성)"""
         from .tool_executor import ToolExecutor
         
-        executor = ToolExecutor()
-        return executor.execute(server, category, tool_name, params)
+        if self._executor is None:
+            self._executor = ToolExecutor()
+        return self._executor
     
-    def get_tree(self, server: Optional[str] = None) -> str:
-        """디렉토리 트리 구조를 문자열로 반환"""
-        lines = []
+    async def aexecute(self, server: str, category: str, tool_name: str,
+                       params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        도구 실행 (코루틴)
         
-        if server:
-            servers = [server]
-        else:
-            servers = self.list_servers()
+        호출한 이벤트 루프에서 서버와 직접 주고받으므로 같은 루프에서 동시에 실행한
+        도구 호출들은 서로 겹쳐서 진행됩니다. 서버 연결은 루프마다 한 번 만들어
+        재사용합니다.
+        
+        Raises:
+            ToolInputError: 파라미터가 도구의 input_schema에 맞지 않는 경우
+        """
+        tool = self.get_tool_info(server, category, tool_name)
+        # 스키마 원본을 넘겨 검증기 캐시가 원본으로 비교 (JSON 문자열을 매번 파싱하지 않음)
+        input_schema = tool.schema_source if tool is not None else None
+        return await self._get_executor().aexecute(
+            server, category, tool_name, params, input_schema
+        )
+    
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """
+        동기 코드에서 aexecute()/agather()를 쓰는 코루틴 실행
+        
+        동기 execute()와 같은 백그라운드 이벤트 루프에서 실행하므로 서버 연결을
+        함께 재사용하며, 호출할 때마다 이벤트 루프를 만들지 않습니다.
+        """
+        return self._get_executor().run(coroutine)
+    
+    async def agather(
+        self,
+        calls: Iterable[Tuple[str, str, str, Dict[str, Any]]],
+        return_exceptions: bool = False,
+        concurrency: Optional[int] = None
+    ) -> List[Any]:
+        """
+        여러 도구를 동시에 실행하고 호출 순서대로 결과 반환
+        
+        Usage:
+            results = await agent.agather([
+                ('github', 'issues', 'create', {'title': 'A'}),
+                ('slack', 'messages', 'send', {'text': 'B'}),
+            ])
+        
+        Args:
+            calls: (서버, 카테고리, 도구 이름, 파라미터) 목록
+            return_exceptions: True면 실패한 호출의 예외를 결과 자리에 넣음
+            concurrency: 동시에 실행할 최대 호출 수 (None이면 제한 없음)
+        """
+        if concurrency is None:
+            return await asyncio.gather(
+                *(self.aexecute(*call) for call in calls),
+                return_exceptions=return_exceptions
+            )
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def limited(call: Tuple[str, str, str, Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aexecute(*call)
+        
+        return await asyncio.gather(
+            *(limited(call) for call in calls),
+            return_exceptions=return_exceptions
+        )
+    
+    async def asearch_tools(self, query: str, limit: Optional[int] = None) -> List[ToolInfo]:
+        """
+        search_tools()의 코루틴 버전
         
+        색인 갱신과 검색은 스레드에서 실행하므로(검색 색인은 잠금으로 보호) 큰
+        카탈로그를 다시 색인하는 동안에도 이벤트 루프를 막지 않습니다.
+        """
+        return await asyncio.to_thread(self.search_tools, query, limit)
+    
+    async def alist_tools(self, server: str, category: str) -> List[ToolInfo]:
+        """list_tools()의 코루틴 버전 (서버를 처음 로드할 때 디스크를 읽으므로 스레드에서 실행)"""
+        return await asyncio.to_thread(self.list_tools, server, category)
+    
+    def _tree_lines(self, servers: List[str]) -> Iterator[str]:
+        """트리 구조의 줄 (카테고리마다 도구는 처음 3개만 읽음)"""
         for srv in servers:
-            lines.append(f"📂 {srv}/")
+            yield f"📂 {srv}/"
             categories = self.list_categories(srv)
             
             for i, cat in enumerate(categories):
                 is_last_cat = (i == len(categories) - 1)
                 prefix = "└── " if is_last_cat else "├── "
-                lines.append(f"  {prefix}📂 {cat.name}/ ({cat.tool_count} tools)")
+                yield f"  {prefix}📂 {cat.name}/ ({cat.tool_count} tools)"
                 
-                tools = self.list_tools(srv, cat.name)
-                for j, tool in enumerate(tools[:3]):  # 처음 3개만
-                    is_last_tool = (j == len(tools) - 1) or (j == 2)
+                shown = min(cat.tool_count, 3)  # 처음 3개만
+                for j, tool in enumerate(self.iter_tools(srv, cat.name, limit=3)):
+                    is_last_tool = (j == shown - 1)
                     tool_prefix = "    └── " if is_last_cat else "    │   "
                     if is_last_tool:
                         tool_prefix = tool_prefix.replace("│", " ")
-                    lines.append(f"{tool_prefix}📄 {tool.name}.ts")
+                    yield f"{tool_prefix}📄 {tool.name}.ts"
                 
-                if len(tools) > 3:
+                if cat.tool_count > 3:
                     tool_prefix = "    └── " if is_last_cat else "    │   "
-                    lines.append(f"{tool_prefix}... {len(tools) - 3}개 더")
+                    yield f"{tool_prefix}... {cat.tool_count - 3}개 더"
+    
+    def iter_tree(self, server: Optional[str] = None, offset: int = 0,
+                  limit: Optional[int] = None) -> Iterator[str]:
+        """
+        디렉토리 트리 구조를 한 줄씩 반환
         
-        return "\n".join(lines)
+        Args:
+            server: 특정 서버만 (None이면 전체)
+            offset: 건너뛸 줄 수
+            limit: 최대 줄 수 (None이면 끝까지)
+        """
+        servers = [server] if server else self.list_servers()
+        return islice(self._tree_lines(servers), offset, None if limit is None else offset + limit)
+    
+    def get_tree(self, server: Optional[str] = None) -> str:
+        """디렉토리 트리 구조를 문자열로 반환"""
+        return "\n".join(self.iter_tree(server))
     
     def print_tree(self, server: Optional[str] = None):
         """디렉토리 트리 구조 출력"""
-        print(self.get_tree(server))
+        for line in self.iter_tree(server):
+            print(line)
@@ -0,0 +1,247 @@
+"""도구 input_schema(JSON Schema) 검증기 컴파일"""
+import re
+from typing import Any, Dict, List, Callable
+
+
+# (값, 경로, 오류 목록) → None
+Check = Callable[[Any, str, List[str]], None]
+
+
+class ToolInputError(ValueError):
+    """도구 파라미터가 input_schema에 맞지 않음"""
+
+    def __init__(self, tool_name: str, errors: List[str]):
+        self.tool_name = tool_name
+        self.errors = errors
+        super().__init__(f"잘못된 파라미터 ({tool_name}): " + "; ".join(errors))
+
+
+def _is_type(value: Any, type_name: str) -> bool:
+    """JSON Schema 타입 판별 (bool은 integer/number가 아님)"""
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, (list, tuple))
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "integer":
+        return (isinstance(value, int) and not isinstance(value, bool)) or (
+            isinstance(value, float) and value.is_integer()
+        )
+    if type_name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if type_name == "null":
+        return value is None
+    return True
+
+
+def _compile(schema: Any) -> Check:
+    """스키마 노드를 검사 함수 하나로 컴파일"""
+    if schema is False:
+        return lambda value, path, errors: errors.append(f"{path}: 허용되지 않는 값")
+    if not isinstance(schema, dict):
+        return lambda value, path, errors: None
+
+    checks: List[Check] = []
+
+    types = schema.get("type")
+    if types is not None:
+        type_names = [types] if isinstance(types, str) else list(types)
+
+        def check_type(value, path, errors, type_names=type_names):
+            if not any(_is_type(value, name) for name in type_names):
+                errors.append(f"{path}: {'/'.join(type_names)} 타입이어야 합니다")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {allowed} 중 하나여야 합니다")
+        checks.append(check_enum)
+
+    if "const" in schema:
+        expected = schema["const"]
+
+        def check_const(value, path, errors):
+            if value != expected:
+                errors.append(f"{path}: {expected!r}이어야 합니다")
+        checks.append(check_const)
+
+    checks.extend(_compile_object(schema))
+    checks.extend(_compile_array(schema))
+    checks.extend(_compile_string(schema))
+    checks.extend(_compile_number(schema))
+    checks.extend(_compile_combinators(schema))
+
+    if not checks:
+        return lambda value, path, errors: None
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value, path, errors):
+        for check in checks:
+            check(value, path, errors)
+    return check_all
+
+
+def _compile_object(schema: Dict[str, Any]) -> List[Check]:
+    """object 관련 키워드 (required, properties, additionalProperties)"""
+    checks: List[Check] = []
+    required = schema.get("required") or []
+    properties = {
+        name: _compile(sub_schema)
+        for name, sub_schema in (schema.get("properties") or {}).items()
+    }
+    additional = schema.get("additionalProperties", True)
+    additional_check = None if additional is True else _compile(additional)
+
+    if not (required or properties or additional_check):
+        return checks
+
+    def check_object(value, path, errors):
+        if not isinstance(value, dict):
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"{path}.{name}: 필수 파라미터가 없습니다")
+        for name, item in value.items():
+            check = properties.get(name)
+            if check is not None:
+                check(item, f"{path}.{name}", errors)
+            elif additional is False:
+                errors.append(f"{path}.{name}: 알 수 없는 파라미터입니다")
+            elif additional_check is not None:
+                additional_check(item, f"{path}.{name}", errors)
+    checks.append(check_object)
+    return checks
+
+
+def _compile_array(schema: Dict[str, Any]) -> List[Check]:
+    """array 관련 키워드 (items, minItems, maxItems)"""
+    checks: List[Check] = []
+    items = schema.get("items")
+    item_check = _compile(items) if isinstance(items, dict) else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    if item_check is None and min_items is None and max_items is None:
+        return checks
+
+    def check_array(value, path, errors):
+        if not isinstance(value, (list, tuple)):
+            return
+        if min_items is not None and len(value) < min_items:
+            errors.append(f"{path}: 항목이 {min_items}개 이상이어야 합니다")
+        if max_items is not None and len(value) > max_items:
+            errors.append(f"{path}: 항목이 {max_items}개 이하여야 합니다")
+        if item_check is not None:
+            for index, item in enumerate(value):
+                item_check(item, f"{path}[{index}]", errors)
+    checks.append(check_array)
+    return checks
+
+
+def _compile_string(schema: Dict[str, Any]) -> List[Check]:
+    """string 관련 키워드 (minLength, maxLength, pattern)"""
+    checks: List[Check] = []
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    try:
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    except re.error:
+        pattern = None  # Python 정규식으로 해석할 수 없는 패턴은 서버에 맡김
+
+    if min_length is None and max_length is None and pattern is None:
+        return checks
+
+    def check_string(value, path, errors):
+        if not isinstance(value, str):
+            return
+        if min_length is not None and len(value) < min_length:
+            errors.append(f"{path}: {min_length}자 이상이어야 합니다")
+        if max_length is not None and len(value) > max_length:
+            errors.append(f"{path}: {max_length}자 이하여야 합니다")
+        if pattern is not None and not pattern.search(value):
+            errors.append(f"{path}: 형식이 맞지 않습니다 ({pattern.pattern})")
+    checks.append(check_string)
+    return checks
+
+
+def _compile_number(schema: Dict[str, Any]) -> List[Check]:
+    """number 관련 키워드 (minimum, maximum, exclusiveMinimum, exclusiveMaximum)"""
+    bounds = [
+        (schema.get("minimum"), lambda value, bound: value >= bound, "이상"),
+        (schema.get("maximum"), lambda value, bound: value <= bound, "이하"),
+        (schema.get("exclusiveMinimum"), lambda value, bound: value > bound, "초과"),
+        (schema.get("exclusiveMaximum"), lambda value, bound: value < bound, "미만"),
+    ]
+    # draft-04의 불리언 exclusiveMinimum/Maximum은 무시
+    bounds = [
+        (bound, compare, label) for bound, compare, label in bounds
+        if isinstance(bound, (int, float)) and not isinstance(bound, bool)
+    ]
+    if not bounds:
+        return []
+
+    def check_number(value, path, errors):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        for bound, compare, label in bounds:
+            if not compare(value, bound):
+                errors.append(f"{path}: {bound} {label}이어야 합니다")
+    return [check_number]
+
+
+def _compile_combinators(schema: Dict[str, Any]) -> List[Check]:
+    """allOf, anyOf, oneOf"""
+    checks: List[Check] = []
+
+    for sub_schema in schema.get("allOf") or []:
+        checks.append(_compile(sub_schema))
+
+    for keyword, exactly_one in (("anyOf", False), ("oneOf", True)):
+        options = [_compile(sub_schema) for sub_schema in schema.get(keyword) or []]
+        if not options:
+            continue
+
+        def check_options(value, path, errors, options=options, exactly_one=exactly_one):
+            matched = 0
+            for option in options:
+                option_errors: List[str] = []
+                option(value, path, option_errors)
+                if not option_errors:
+                    matched += 1
+                    if not exactly_one:
+                        return
+            if matched == 0:
+                errors.append(f"{path}: 허용되는 형식 중 어느 것에도 맞지 않습니다")
+            elif exactly_one and matched > 1:
+                errors.append(f"{path}: 허용되는 형식 중 하나에만 맞아야 합니다")
+        checks.append(check_options)
+
+    return checks
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """
+    JSON Schema를 검증 함수로 컴파일
+
+    스키마를 한 번 해석해서 키워드별 검사 함수를 묶어 두므로, 검증할 때는
+    스키마 사전을 다시 훑지 않습니다. 지원하지 않는 키워드($ref, format 등)는
+    무시하고 최종 판단은 서버에 맡깁니다.
+
+    Returns:
+        params → 오류 메시지 목록 (비어 있으면 유효)
+    """
+    check = _compile(schema)
+
+    def validate(params: Any) -> List[str]:
+        errors: List[str] = []
+        check(params, "params", errors)
+        return errors
+
+    return validate
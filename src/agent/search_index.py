@@ -0,0 +1,269 @@
+"""도구 검색용 역색인"""
+import heapq
+import threading
+from typing import List, Dict, Tuple, Optional, Iterator, Callable, Any
+
+from .catalog_index import CatalogIndex, ServerIndex, ToolInfo
+from .fuzzy_index import FuzzyIndex
+from .search_rules import (
+    K1,
+    tokenize,
+    fuzzy_key,
+    field_scales,
+    field_coefficients,
+    token_weight,
+)
+
+# 검색어에서 빼는 기능어 - 자연어 질문 전체로 검색해도 도구와 상관없는 단어가
+# 순위를 흐리지 않도록 함
+STOPWORDS = frozenset((
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "by", "for",
+    "from", "with", "into", "as", "is", "are", "be", "it", "its", "this", "that",
+    "i", "me", "my", "we", "our", "you", "your", "please", "can", "could",
+    "would", "should", "will", "then", "all", "some",
+    "그리고", "및", "또는", "좀", "해줘", "해주세요", "주세요",
+))
+
+# 접두어로도 검색하는 최소 길이 (비교용 문자열 기준 - 한글은 자모 수라 두 글자
+# 단어부터 접두어 검색)
+MIN_PREFIX = 3
+
+
+def query_terms(query: str) -> List[str]:
+    """검색어의 검색할 단어 (중복과 STOPWORDS 제외, 모두 기능어면 그대로)"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    return [term for term in terms if term not in STOPWORDS] or terms
+
+
+def expands_prefix(term: str) -> bool:
+    """term을 접두어로도 검색하는지 (짧은 단어는 정확히 일치하는 토큰만)"""
+    return len(fuzzy_key(term)) >= MIN_PREFIX
+
+
+def _tool_fields(tool: ToolInfo) -> Tuple[List[str], List[str], List[str]]:
+    """도구의 (이름, 설명, 키워드) 필드별 토큰"""
+    keyword_tokens: List[str] = []
+    for keyword in tool.keywords:
+        keyword_tokens.extend(tokenize(keyword))
+    return tokenize(tool.name), tokenize(tool.description), keyword_tokens
+
+
+def iter_ranked(scores: Dict[int, float], offset: int = 0,
+                limit: Optional[int] = None,
+                order: Optional[Callable[[int], Any]] = None) -> Iterator[int]:
+    """
+    점수 순(같으면 order(번호), order가 없으면 번호 순)으로 문서 번호를 하나씩 반환
+
+    limit이 있으면 크기가 offset + limit인 힙으로 고르고, 없으면 전체를 힙으로
+    만든 뒤 꺼낼 때마다 하나씩 정렬하므로 호출한 쪽이 멈춘 뒤의 순위는 계산하지
+    않습니다.
+    """
+    if order is None:
+        def order(doc_id: int) -> int:
+            return doc_id
+
+    if limit is not None:
+        yield from heapq.nsmallest(
+            offset + limit, scores, key=lambda doc_id: (-scores[doc_id], order(doc_id))
+        )[offset:]
+        return
+
+    heap = [(-score, order(doc_id), doc_id) for doc_id, score in scores.items()]
+    heapq.heapify(heap)
+    for _ in range(min(offset, len(heap))):
+        heapq.heappop(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+class SearchIndex:
+    """
+    도구 이름, 설명, 키워드 필드의 BM25F 역색인
+
+    토큰마다 {문서 번호: 필드별 출현 횟수}를 저장하고, 검색할 때 필드 가중치와
+    필드 길이 정규화를 적용한 BM25 점수로 순위를 매깁니다. 상위 limit개는 크기가
+    limit인 힙으로 고르므로 일치한 도구 전체를 정렬하거나 ToolInfo 목록으로 만들지
+    않습니다.
+
+    서버 단위로 추가/삭제하므로 sync()는 카탈로그 색인에서 바뀐 서버만 다시
+    색인합니다. 색인 갱신과 점수 계산은 잠금 안에서 하므로 여러 스레드가 동시에
+    검색해도(웹 UI의 동시 요청, asyncio.to_thread) 됩니다. 검색어의 기능어(STOPWORDS)는 빼고, MIN_PREFIX 이상인 토큰은
+    접두어로도 취급해 정렬된 어휘 목록에서 이분 탐색으로 찾으며("issue" →
+    "issues"), 접두어로만 일치한 토큰은 PREFIX_WEIGHT를 곱해 점수를 낮춥니다.
+    FuzzyIndex로 찾은 활용형("계정을" → "계정"), 중간 일치("sheet" →
+    "spreadsheet")와 어휘에 없는 토큰의 오타("isue" → "issue")는 더 낮은 점수로
+    함께 검색합니다.
+
+    Usage:
+        search = SearchIndex()
+        search.sync(catalog_index)
+        tools = search.search("create issue", limit=10)
+    """
+
+    def __init__(self):
+        # 색인 갱신(sync/add_server/remove_server)과 점수 계산을 직렬화
+        self._lock = threading.Lock()
+
+        self._docs: Dict[int, ToolInfo] = {}
+        # 문서별 카탈로그 순서 (서버, 서버 안의 순서) - 점수가 같을 때 정렬 기준이며
+        # 서버를 다시 색인해 문서 번호가 바뀌어도 그대로
+        self._order: Dict[int, Tuple[str, int]] = {}
+        self._lengths: Dict[int, Tuple[int, int, int]] = {}
+        self._total_lengths = [0, 0, 0]
+        self._postings: Dict[str, Dict[int, Tuple[int, int, int]]] = {}
+        self._next_id = 0
+
+        # 색인된 서버 {서버: (서버 색인, 문서 번호 목록)}
+        self._servers: Dict[str, Tuple[ServerIndex, List[int]]] = {}
+
+        # 어휘 트라이그램 색인 (접두어 검색용 정렬된 어휘와 활용형/오타 검색)
+        self._fuzzy = FuzzyIndex()
+
+        # 문서별 필드 계수 (가중치 / 길이 정규화, 문서가 바뀌면 다시 계산)
+        self._coefficients: Optional[Dict[int, Tuple[float, float, float]]] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add_server(self, server: str, index: ServerIndex):
+        """서버의 도구 색인 (이미 있으면 교체)"""
+        with self._lock:
+            self._add_server(server, index)
+
+    def _add_server(self, server: str, index: ServerIndex):
+        self._remove_server(server)
+
+        doc_ids = []
+        for tools in index.tools.values():
+            for tool in tools.values():
+                doc_id = self._next_id
+                self._next_id += 1
+                self._docs[doc_id] = tool
+                self._order[doc_id] = (server, len(doc_ids))
+                doc_ids.append(doc_id)
+
+                fields = _tool_fields(tool)
+                counts: Dict[str, List[int]] = {}
+                for field, tokens in enumerate(fields):
+                    self._total_lengths[field] += len(tokens)
+                    for token in tokens:
+                        counts.setdefault(token, [0, 0, 0])[field] += 1
+                self._lengths[doc_id] = tuple(len(tokens) for tokens in fields)
+
+                for token, count in counts.items():
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = {}
+                        self._fuzzy.add(token)
+                    postings[doc_id] = tuple(count)
+
+        self._servers[server] = (index, doc_ids)
+        self._coefficients = None
+
+    def remove_server(self, server: str):
+        """서버의 도구를 색인에서 제거"""
+        with self._lock:
+            self._remove_server(server)
+
+    def _remove_server(self, server: str):
+        entry = self._servers.pop(server, None)
+        if entry is None:
+            return
+
+        for doc_id in entry[1]:
+            tool = self._docs.pop(doc_id)
+            del self._order[doc_id]
+            for field, length in enumerate(self._lengths.pop(doc_id)):
+                self._total_lengths[field] -= length
+
+            for token in set().union(*_tool_fields(tool)):
+                postings = self._postings[token]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[token]
+                    self._fuzzy.discard(token)
+        self._coefficients = None
+
+    def sync(self, catalog: CatalogIndex):
+        """카탈로그 색인에서 추가/변경/삭제된 서버만 다시 색인"""
+        servers = catalog.servers()
+        with self._lock:
+            for server in set(self._servers) - set(servers):
+                self._remove_server(server)
+
+            for server in servers:
+                index = catalog.server(server)
+                if index is None:
+                    self._remove_server(server)
+                    continue
+                entry = self._servers.get(server)
+                if entry is None or entry[0] is not index:
+                    self._add_server(server, index)
+
+    def _field_coefficients(self) -> Dict[int, Tuple[float, float, float]]:
+        """문서별 필드 계수 weight / (1 - b + b * 길이 / 평균 길이)"""
+        if self._coefficients is None:
+            scales = field_scales(len(self._docs) or 1, self._total_lengths)
+            self._coefficients = {
+                doc_id: field_coefficients(scales, lengths)
+                for doc_id, lengths in self._lengths.items()
+            }
+        return self._coefficients
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """검색어와 일치하는 문서 번호별 BM25F 점수"""
+        with self._lock:
+            return self._scores(query)
+
+    def _scores(self, query: str) -> Dict[int, float]:
+        terms = query_terms(query)
+        if not terms or not self._docs:
+            return {}
+
+        coefficients = self._field_coefficients()
+        count = len(self._docs)
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            for token, ratio in self._fuzzy.matching(term, expands_prefix(term)):
+                postings = self._postings[token]
+                weight = ratio * token_weight(count, len(postings))
+
+                for doc_id, (name_tf, description_tf, keyword_tf) in postings.items():
+                    name_c, description_c, keyword_c = coefficients[doc_id]
+                    tf = name_c * name_tf + description_c * description_tf + keyword_c * keyword_tf
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + K1)
+        return scores
+
+    def iter_search(self, query: str, offset: int = 0,
+                    limit: Optional[int] = None) -> Iterator[ToolInfo]:
+        """
+        검색어와 일치하는 도구를 순위대로 하나씩 반환 (BM25F 점수 순, 같으면 카탈로그 순서)
+
+        Args:
+            query: 검색어 (여러 단어 가능)
+            offset: 건너뛸 결과 수
+            limit: 최대 결과 수 (None이면 일치한 도구 전체)
+        """
+        with self._lock:
+            scores = self._scores(query)
+
+            # 반복 중에 서버가 다시 색인되어도 이미 고른 도구를 돌려주도록 레코드를 잡아 둠
+            # (limit이 있으면 상위 offset + limit개만 골라서)
+            if limit is not None:
+                ranked = iter_ranked(scores, offset, limit, self._order.__getitem__)
+                return iter([self._docs[doc_id] for doc_id in ranked])
+
+            docs = {doc_id: (self._order[doc_id], self._docs[doc_id]) for doc_id in scores}
+        ranked = iter_ranked(scores, offset, limit, lambda doc_id: docs[doc_id][0])
+        return (docs[doc_id][1] for doc_id in ranked)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[ToolInfo]:
+        """
+        검색어와 일치하는 도구 (BM25F 점수 순, 같으면 카탈로그 순서)
+
+        Args:
+            query: 검색어 (여러 단어 가능)
+            limit: 최대 결과 수 (None이면 일치한 도구 전체)
+        """
+        return list(self.iter_search(query, limit=limit))
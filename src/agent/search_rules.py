@@ -0,0 +1,73 @@
+"""
+검색 토큰, 비교용 문자열/트라이그램 규칙과 BM25F 상수
+
+생성기(catalog.db, catalog.bin)와 Agent(SearchIndex, sqlite/mmap 저장소)가 같은
+규칙으로 색인하고 검색하도록 한 곳에 둡니다. 표준 라이브러리만 사용하므로
+생성기도 `from agent.search_rules import ...`로 가져다 씁니다.
+"""
+import re
+import math
+import unicodedata
+from typing import List, Tuple
+
+
+# BM25F 필드 가중치 (이름, 설명, 키워드)
+FIELD_WEIGHTS = (3.0, 1.0, 2.0)
+
+# BM25 매개변수
+K1 = 1.2
+B = 0.75
+
+# 접두어로만 일치한 토큰의 점수 비율
+PREFIX_WEIGHT = 0.5
+
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색 토큰으로 분리 (소문자)
+
+    camelCase, snake_case, 공백/구두점 경계에서 나누며 한글 등 유니코드 문자도
+    토큰에 포함합니다. 예: "getUserInfo_v2" → ["get", "user", "info", "v2"]
+    """
+    return _TOKEN.findall(_CAMEL_BOUNDARY.sub(' ', text).lower())
+
+
+def fuzzy_key(token: str) -> str:
+    """
+    비교용 문자열 (NFD)
+
+    한글 음절을 자모로 분해하므로 "게정"과 "계정"처럼 모음 하나가 다른 음절도
+    편집 거리 1이 되고, 한글 단어도 트라이그램을 충분히 갖게 됩니다.
+    """
+    return unicodedata.normalize('NFD', token)
+
+
+def trigrams(key: str) -> List[str]:
+    """앞뒤 경계 문자를 붙인 문자 트라이그램 (중복 제거)"""
+    padded = f"\x02{key}\x03"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def field_scales(count: int, totals: Tuple[int, int, int]) -> List[Tuple[float, float]]:
+    """필드별 (가중치, b / 평균 길이) - 문서 수와 필드별 전체 토큰 수로 계산"""
+    return [
+        (weight, B / (total / count) if total else 0.0)
+        for weight, total in zip(FIELD_WEIGHTS, totals)
+    ]
+
+
+def field_coefficients(scales: List[Tuple[float, float]],
+                       lengths: Tuple[int, int, int]) -> Tuple[float, ...]:
+    """문서의 필드 계수 weight / (1 - b + b * 길이 / 평균 길이)"""
+    return tuple(
+        weight / (1 - B + scale * length)
+        for (weight, scale), length in zip(scales, lengths)
+    )
+
+
+def token_weight(count: int, df: int) -> float:
+    """토큰의 IDF * (k1 + 1) (문서 수 count 중 df개에 나오는 토큰)"""
+    return math.log(1 + (count - df + 0.5) / (df + 0.5)) * (K1 + 1)
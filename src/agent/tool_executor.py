@@ -1,17 +1,116 @@
 """Tool Executor - 실제 MCP 서버를 호출하여 도구 실행"""
 import json
 import asyncio
-import subprocess
+import threading
+import weakref
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable, Coroutine, TypeVar, Union
 import os
+from .schema_validator import compile_schema, ToolInputError
+
+
+T = TypeVar("T")
+
+# 도구 입력 스키마 (ToolInfo.schema_source처럼 JSON 문자열이면 검증기를 만들 때만 파싱)
+SchemaSource = Union[str, Dict[str, Any], None]
+
+
+class _ServerConnection:
+    """
+    이벤트 루프 하나에서 MCP 서버 프로세스 하나와 주고받는 JSON-RPC 연결
+
+    요청마다 id를 붙이고 응답 읽기 작업이 id로 대기 중인 요청을 찾아 결과를 넘기므로,
+    같은 서버에 보낸 여러 요청이 응답을 기다리는 동안 겹쳐서 진행됩니다.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @property
+    def closed(self) -> bool:
+        return self._reader.done()
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """요청을 보내고 같은 id의 응답을 기다림"""
+        if self.closed:
+            raise ConnectionError("MCP 서버 연결이 끊어졌습니다")
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params
+        }
+        try:
+            self.process.stdin.write((json.dumps(request) + "\n").encode())
+            await self.process.stdin.drain()
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_responses(self):
+        """응답을 읽어 대기 중인 요청에 전달 (연결이 끊어지면 남은 요청을 실패 처리)"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    continue  # 서버 로그 등 JSON-RPC가 아닌 줄
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("MCP 서버 연결이 끊어졌습니다"))
+
+    def terminate(self):
+        """프로세스 종료 신호만 보냄 (다른 스레드에서도 호출 가능)"""
+        if self.process.returncode is None:
+            try:
+                self.process.terminate()
+            except (ProcessLookupError, RuntimeError):
+                pass
+
+    async def close(self):
+        """프로세스를 종료하고 응답 읽기 작업 정리"""
+        self.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
 
 
 class ToolExecutor:
     """
     생성된 도구를 실제 MCP 서버에 연결하여 실행
+    
+    aexecute()는 호출한 이벤트 루프에서 바로 실행되고, 서버 연결은 루프마다 한 번
+    만들어 재사용하므로 같은 루프의 도구 호출들은 서로 겹쳐서 진행됩니다. 동기
+    execute()는 처음 호출할 때 시작하는 백그라운드 이벤트 루프 하나에서 실행되므로
+    호출할 때마다 루프를 만들지 않고, 이벤트 루프 안에서 호출해도 동작합니다.
     """
     
+    # 서버 응답 한 줄의 최대 크기 (asyncio 기본값 64KiB보다 큰 결과도 읽도록)
+    RESPONSE_LIMIT = 16 * 1024 * 1024
+    
     def __init__(self, config_path: str = "config/mcp_servers.json"):
         """
         Args:
@@ -19,7 +118,17 @@ class ToolExecutor:
         """
         self.config_path = Path(config_path)
         self.config = self._load_config()
-        self._processes = {}  # 실행 중인 서버 프로세스
+        
+        # 이벤트 루프별 서버 연결 작업 {루프: {서버: 연결을 만드는 Task}}
+        self._connections = weakref.WeakKeyDictionary()
+        
+        # 동기 execute()용 백그라운드 이벤트 루프와 스레드
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        
+        # 도구별 컴파일된 input_schema 검증기 {도구 전체 이름: (스키마 원본, 검증기)}
+        self._validators: Dict[str, tuple] = {}
     
     def _load_config(self) -> Dict[str, Any]:
         """설정 파일 로드"""
@@ -40,11 +149,8 @@ class ToolExecutor:
         
         return None
     
-    async def _start_server(self, server_name: str) -> subprocess.Popen:
+    async def _start_server(self, server_name: str) -> _ServerConnection:
         """MCP 서버 프로세스 시작"""
-        if server_name in self._processes:
-            return self._processes[server_name]
-        
         server_config = self._get_server_config(server_name)
         if not server_config:
             raise ValueError(f"서버 설정을 찾을 수 없습니다: {server_name}")
@@ -62,20 +168,36 @@ class ToolExecutor:
         # 프로세스 시작
         cmd = [server_config["command"]] + server_config.get("args", [])
         
-        process = subprocess.Popen(
-            cmd,
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
             env=env,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=self.RESPONSE_LIMIT
         )
-        
-        self._processes[server_name] = process
+        connection = _ServerConnection(process)
         
         # 서버 시작 대기 (간단히)
         await asyncio.sleep(1)
         
-        return process
+        return connection
+    
+    async def _connection(self, server_name: str) -> _ServerConnection:
+        """현재 이벤트 루프의 서버 연결 (없거나 끊어졌으면 새로 시작)"""
+        loop = asyncio.get_running_loop()
+        connections = self._connections.setdefault(loop, {})
+        
+        task = connections.get(server_name)
+        if task is not None and task.done() and (
+            task.cancelled() or task.exception() is not None or task.result().closed
+        ):
+            task = None
+        if task is None:
+            # 동시에 처음 호출한 요청들이 서버를 한 번만 시작하도록 작업을 공유
+            task = connections[server_name] = loop.create_task(self._start_server(server_name))
+        
+        return await asyncio.shield(task)
     
     async def _call_mcp_tool(self, server_name: str, tool_name: str, 
                             params: Dict[str, Any]) -> Dict[str, Any]:
@@ -90,74 +212,149 @@ class ToolExecutor:
         Returns:
             실행 결과
         """
-        # 서버 시작
-        process = await self._start_server(server_name)
+        # 서버 시작 (루프마다 한 번)
+        connection = await self._connection(server_name)
         
-        # MCP 프로토콜에 따라 요청 구성
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": params
-            }
-        }
-        
-        # 요청 전송
-        request_json = json.dumps(request) + "\n"
-        process.stdin.write(request_json.encode())
-        process.stdin.flush()
-        
-        # 응답 읽기
-        response_line = process.stdout.readline().decode()
-        response = json.loads(response_line)
+        # MCP 프로토콜에 따라 요청
+        response = await connection.call("tools/call", {
+            "name": tool_name,
+            "arguments": params
+        })
         
         if "error" in response:
             raise Exception(f"MCP 오류: {response['error']}")
         
         return response.get("result", {})
     
+    def _get_validator(self, full_tool_name: str,
+                       input_schema: Union[str, Dict[str, Any]]) -> Callable[[Any], List[str]]:
+        """
+        도구의 검증기 (스키마 원본이 같으면 한 번만 컴파일)
+        
+        JSON 문자열은 문자열끼리, 딕셔너리는 같은 객체인지로 비교하므로 스키마를
+        구조적으로 비교하거나 실행할 때마다 다시 파싱하지 않습니다.
+        """
+        cached = self._validators.get(full_tool_name)
+        if cached is not None and (
+            cached[0] is input_schema
+            or isinstance(input_schema, str) and cached[0] == input_schema
+        ):
+            return cached[1]
+        
+        schema = json.loads(input_schema) if isinstance(input_schema, str) else input_schema
+        validator = compile_schema(schema)
+        self._validators[full_tool_name] = (input_schema, validator)
+        return validator
+    
+    def validate(self, full_tool_name: str, params: Dict[str, Any],
+                 input_schema: SchemaSource):
+        """
+        파라미터를 input_schema로 검증
+        
+        Raises:
+            ToolInputError: 스키마에 맞지 않는 경우
+        """
+        if not input_schema:
+            return
+        
+        errors = self._get_validator(full_tool_name, input_schema)(params)
+        if errors:
+            raise ToolInputError(full_tool_name, errors)
+    
+    def _prepare(self, server: str, category: str, tool_name: str, params: Dict[str, Any],
+                 input_schema: SchemaSource) -> str:
+        """전체 도구 이름을 만들고 서버를 시작하거나 호출하기 전에 로컬에서 검증"""
+        full_tool_name = f"{server}__{category}__{tool_name}"
+        self.validate(full_tool_name, params, input_schema)
+        return full_tool_name
+    
+    async def aexecute(self, server: str, category: str, tool_name: str,
+                       params: Dict[str, Any],
+                       input_schema: SchemaSource = None) -> Dict[str, Any]:
+        """
+        도구 실행 (비동기 인터페이스, 호출한 이벤트 루프에서 실행)
+        
+        Args:
+            server: 서버 이름
+            category: 카테고리 이름
+            tool_name: 도구 이름 (간단한 이름)
+            params: 도구 파라미터
+            input_schema: 도구 입력 스키마 또는 JSON 문자열 (있으면 서버에 요청하기 전에 검증)
+            
+        Returns:
+            실행 결과
+            
+        Raises:
+            ToolInputError: 파라미터가 input_schema에 맞지 않는 경우
+        """
+        full_tool_name = self._prepare(server, category, tool_name, params, input_schema)
+        
+        # Mock 모드 확인
+        if self.config.get("mock_mode", False):
+            return self._mock_execute(server, category, tool_name, params)
+        
+        return await self._call_mcp_tool(server, full_tool_name, params)
+    
     def execute(self, server: str, category: str, tool_name: str, 
-                params: Dict[str, Any]) -> Dict[str, Any]:
+                params: Dict[str, Any],
+                input_schema: SchemaSource = None) -> Dict[str, Any]:
         """
-        도구 실행 (동기 인터페이스)
+        도구 실행 (동기 인터페이스, 백그라운드 이벤트 루프에서 실행)
         
         Args:
             server: 서버 이름
             category: 카테고리 이름
             tool_name: 도구 이름 (간단한 이름)
             params: 도구 파라미터
+            input_schema: 도구 입력 스키마 또는 JSON 문자열 (있으면 서버에 요청하기 전에 검증)
             
         Returns:
             실행 결과
+            
+        Raises:
+            ToolInputError: 파라미터가 input_schema에 맞지 않는 경우
         """
+        full_tool_name = self._prepare(server, category, tool_name, params, input_schema)
+        
         # Mock 모드 확인
         if self.config.get("mock_mode", False):
             return self._mock_execute(server, category, tool_name, params)
         
-        # 전체 도구 이름 구성
-        full_tool_name = f"{server}__{category}__{tool_name}"
+        return self.run(self._call_mcp_tool(server, full_tool_name, params))
+    
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        동기 코드에서 코루틴 실행 (동기 execute()와 같은 백그라운드 이벤트 루프 사용)
         
-        # 비동기 실행
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # 이미 실행 중인 이벤트 루프가 있으면 새로운 루프 사용
-            new_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(new_loop)
-            try:
-                result = new_loop.run_until_complete(
-                    self._call_mcp_tool(server, full_tool_name, params)
-                )
-            finally:
-                new_loop.close()
-                asyncio.set_event_loop(loop)
-        else:
-            result = loop.run_until_complete(
-                self._call_mcp_tool(server, full_tool_name, params)
+        Raises:
+            RuntimeError: 백그라운드 루프에서 실행 중인 코루틴 안에서 호출한 경우
+                (자기 자신을 기다리며 멈추므로 await aexecute()를 사용해야 함)
+        """
+        loop = self._background_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coroutine.close()
+            raise RuntimeError(
+                "백그라운드 이벤트 루프 안에서는 동기 execute()/run()을 호출할 수 없습니다. "
+                "await aexecute()를 사용하세요"
             )
-        
-        return result
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+    
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        """동기 execute()용 이벤트 루프 (처음 호출할 때 스레드 하나에서 시작)"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="tool-executor",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
     
     def _mock_execute(self, server: str, category: str, tool_name: str,
                      params: Dict[str, Any]) -> Dict[str, Any]:
@@ -172,17 +369,40 @@ class ToolExecutor:
             }
         }
     
+    async def aclose(self):
+        """현재 이벤트 루프에서 시작한 서버 프로세스 종료"""
+        connections = self._connections.pop(asyncio.get_running_loop(), {})
+        for task in connections.values():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                await task.result().close()
+            else:
+                task.cancel()
+    
     def close_all(self):
-        """모든 서버 프로세스 종료"""
-        for name, process in self._processes.items():
+        """모든 서버 프로세스와 백그라운드 이벤트 루프 종료"""
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is not None:
+            # 백그라운드 루프의 연결은 그 루프에서 정리
             try:
-                process.terminate()
-                process.wait(timeout=5)
-            except:
-                process.kill()
+                asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout=10)
+            except Exception:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
         
-        self._processes.clear()
+        # 다른 루프(aexecute 호출자)의 연결은 종료 신호만 보냄
+        for connections in list(self._connections.values()):
+            for task in connections.values():
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    task.result().terminate()
+        self._connections.clear()
     
     def __del__(self):
         """소멸자 - 프로세스 정리"""
-        self.close_all()
+        if hasattr(self, "_connections"):
+            self.close_all()
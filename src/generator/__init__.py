@@ -3,6 +3,12 @@
 from generator.mcp_client import MCPClient, MCPTool
 from generator.categorizer import ToolCategorizer, CategoryInfo
 from generator.file_generator import FileGenerator
+from generator.tool_cache import ToolCatalogCache
+from generator.manifest import OutputManifest
+from generator.batch_writer import BatchWriter
+from generator.publisher import GenerationStore
+from generator.archive import ServerArchiveWriter
+from generator.catalog_watcher import CatalogWatcher, ToolDiff
 
 __all__ = [
     'MCPClient',
@@ -10,4 +16,11 @@ __all__ = [
     'ToolCategorizer',
     'CategoryInfo',
     'FileGenerator',
+    'ToolCatalogCache',
+    'OutputManifest',
+    'BatchWriter',
+    'GenerationStore',
+    'ServerArchiveWriter',
+    'CatalogWatcher',
+    'ToolDiff',
 ]
@@ -0,0 +1,83 @@
+"""서버 트리를 파일 하나로 묶는 압축 파일 출력"""
+import os
+import json
+import zipfile
+from typing import Dict, Any, Optional
+from pathlib import Path
+
+
+# 서버 압축 파일 확장자 (<출력 디렉토리>/<서버>.zip)
+ARCHIVE_SUFFIX = ".zip"
+
+# 같은 내용이면 같은 바이트가 나오도록 모든 항목에 고정 시각 기록
+_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def archive_path(output_dir: Path, server_name: str) -> Path:
+    """서버 압축 파일 경로"""
+    return output_dir / f"{server_name}{ARCHIVE_SUFFIX}"
+
+
+def load_server_metadata(output_dir: Path, server_name: str) -> Optional[Dict[str, Any]]:
+    """
+    게시된 서버의 metadata.json (압축 파일이 있으면 그 안의 항목)
+
+    생성된 서버가 없거나 읽을 수 없으면 None을 반환합니다.
+    """
+    try:
+        archive_file = archive_path(output_dir, server_name)
+        if archive_file.exists():
+            with zipfile.ZipFile(archive_file) as archive:
+                return json.loads(archive.read("metadata.json"))
+
+        return json.loads((output_dir / server_name / "metadata.json").read_bytes())
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+class ServerArchiveWriter:
+    """
+    서버 하나의 생성 결과를 zip 파일 하나로 기록
+
+    zip의 중앙 디렉토리가 항목 색인 역할을 하므로 읽는 쪽은 파일 전체를 풀지
+    않고 metadata.json 같은 항목만 바로 읽을 수 있습니다. 임시 파일에 쓴 뒤
+    commit()에서 교체하므로 읽는 쪽은 완성된 압축 파일만 봅니다.
+
+    Usage:
+        archive = ServerArchiveWriter(Path('output/servers'), 'github')
+        archive.write('issues/metadata.json', content)
+        archive.commit()
+    """
+
+    def __init__(self, output_dir: Path, server_name: str):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            server_name: 서버 이름
+        """
+        self.path = archive_path(output_dir, server_name)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._names = set()
+
+    def write(self, name: str, content: bytes):
+        """항목 기록 (같은 이름을 다시 쓰면 무시)"""
+        if name in self._names:
+            return
+        self._names.add(name)
+
+        info = zipfile.ZipInfo(name, date_time=_FIXED_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, content)
+
+    def commit(self) -> Path:
+        """압축 파일을 완성하고 게시"""
+        self._zip.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def discard(self):
+        """쓰던 압축 파일 삭제"""
+        self._zip.close()
+        self._tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,90 @@
+"""백그라운드 스레드에서 묶어서 처리하는 파일 쓰기"""
+import queue
+import threading
+from typing import List, Tuple, Optional
+from pathlib import Path
+
+
+class BatchWriter:
+    """
+    파일 쓰기를 batch_size개씩 묶어 백그라운드 스레드에서 처리
+
+    큐 크기가 max_batches로 제한되어 있어 디스크가 느리면 write()가 기다리므로
+    렌더링된 내용이 메모리에 무한정 쌓이지 않습니다. 쓰기 중 발생한 오류는
+    다음 write() 또는 flush()에서 다시 발생합니다.
+
+    Usage:
+        writer = BatchWriter()
+        writer.write(path, content)
+        writer.flush()  # 지금까지 요청한 파일을 모두 쓸 때까지 대기
+        writer.close()
+    """
+
+    def __init__(self, batch_size: int = 256, max_batches: int = 16):
+        """
+        Args:
+            batch_size: 한 번에 스레드로 넘길 파일 수
+            max_batches: 대기할 수 있는 최대 묶음 수
+        """
+        self.batch_size = batch_size
+        self._queue: 'queue.Queue[Optional[List[Tuple[Path, bytes]]]]' = queue.Queue(max_batches)
+        self._batch: List[Tuple[Path, bytes]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _run(self):
+        """쓰기 스레드"""
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                if self._error is None:
+                    for path, content in batch:
+                        # 이전 세대와 하드 링크로 공유하는 파일일 수 있으므로
+                        # 덮어쓰지 않고 새 파일로 만듦
+                        path.unlink(missing_ok=True)
+                        path.write_bytes(content)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _submit(self):
+        """모은 묶음을 쓰기 스레드로 전달"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="batch-writer", daemon=True)
+            self._thread.start()
+
+        batch, self._batch = self._batch, []
+        self._queue.put(batch)
+
+    def write(self, path: Path, content: bytes):
+        """파일 쓰기 요청"""
+        self._raise_error()
+        self._batch.append((path, content))
+        if len(self._batch) >= self.batch_size:
+            self._submit()
+
+    def flush(self):
+        """요청한 파일을 모두 쓸 때까지 대기"""
+        if self._batch:
+            self._submit()
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """남은 파일을 쓰고 스레드 종료"""
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
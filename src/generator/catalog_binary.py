@@ -0,0 +1,288 @@
+"""MCPAgent mmap 백엔드용 바이너리 카탈로그"""
+import os
+import json
+import struct
+from itertools import chain
+from typing import Dict, Any, List, Tuple
+from pathlib import Path
+from agent.search_rules import (
+    K1,
+    tokenize,
+    fuzzy_key,
+    trigrams,
+    field_scales,
+    field_coefficients,
+    token_weight,
+)
+
+
+# 출력 디렉토리의 바이너리 카탈로그 (MCPAgent(backend="mmap")가 읽음)
+CATALOG_BIN_FILENAME = "catalog.bin"
+
+BINARY_MAGIC = b"CXCATBIN"
+BINARY_VERSION = 3
+
+# 모든 정수는 리틀 엔디언, 문자열은 문자열 풀 안의 (오프셋, 바이트 길이)
+#
+# 헤더: 매직, 버전, 서버/카테고리/도구/토큰/트라이그램 수, 각 표와 문자열 풀의 시작 오프셋
+HEADER = struct.Struct("<8sI5I10Q")
+# 서버 (이름순): 이름, metadata.json, 첫 카테고리 번호, 카테고리 수
+SERVER = struct.Struct("<6I")
+# 카테고리 (서버, 게시 순서): 이름, 설명, 키워드 JSON, 서버 번호, 첫 도구 번호, 도구 수
+CATEGORY = struct.Struct("<9I")
+# 도구 (카테고리, 게시 순서): 이름, 설명, 스키마 JSON, 키워드 JSON, 카테고리 번호
+TOOL = struct.Struct("<9I")
+# 이름순 보조 표 (카테고리/도구 번호 배열, 서버/카테고리 안에서 이름순)
+ORDER = struct.Struct("<I")
+# 검색 토큰 (토큰순): 토큰, 첫 포스팅 번호, 포스팅 수
+TOKEN = struct.Struct("<4I")
+# 포스팅 (도구 번호순): 도구 번호, 토큰의 BM25 점수
+POSTING = struct.Struct("<If")
+# 어휘 트라이그램 ((트라이그램 UTF-8, 비교용 문자열 길이)순): 트라이그램, 길이,
+# 첫 토큰 목록 위치, 토큰 수 - 오타/중간 일치 후보를 찾는 색인 (agent.fuzzy_index)
+GRAM = struct.Struct("<5I")
+# 트라이그램별 토큰 목록 (토큰 번호순)
+GRAM_TOKEN = struct.Struct("<I")
+
+def _posting_scores(lengths: List[Tuple[int, int, int]]):
+    """
+    포스팅 목록을 (도구 번호, BM25 점수)로 바꾸는 함수
+
+    점수는 SearchIndex.scores()에서 토큰 하나가 도구에 더하는 값과 같습니다.
+    """
+    count = len(lengths)
+    scales = field_scales(
+        count, tuple(sum(tool_lengths[field] for tool_lengths in lengths) for field in range(3))
+    )
+    coefficients = [field_coefficients(scales, tool_lengths) for tool_lengths in lengths]
+
+    def scores(postings: List[Tuple[int, int, int, int]]) -> List[Tuple[int, float]]:
+        idf = token_weight(count, len(postings))
+        result = []
+        for tool_id, name_tf, description_tf, keyword_tf in postings:
+            name_c, description_c, keyword_c = coefficients[tool_id]
+            tf = name_c * name_tf + description_c * description_tf + keyword_c * keyword_tf
+            result.append((tool_id, idf * tf / (tf + K1)))
+        return result
+
+    return scores
+
+
+# 도구 하나의 [(토큰, 이름/설명/키워드 출현 횟수)]와 (이름, 설명, 키워드) 토큰 수
+_ToolTerms = Tuple[List[Tuple[str, int, int, int]], Tuple[int, int, int]]
+
+
+def _pack(record: struct.Struct, rows: List[Tuple]) -> bytes:
+    """레코드 여러 개를 한 번에 직렬화"""
+    return struct.pack(
+        record.format[0] + record.format[1:] * len(rows),
+        *chain.from_iterable(rows)
+    )
+
+
+class _StringPool:
+    """UTF-8 문자열 풀 (같은 문자열은 한 번만 저장)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self.size = 0
+
+    def add(self, text: str) -> Tuple[int, int]:
+        ref = self._offsets.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = self._offsets[text] = (self.size, len(data))
+            self._chunks.append(data)
+            self.size += len(data)
+        return ref
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class CatalogBinaryWriter:
+    """
+    게시된 서버들의 스냅샷 항목을 출력 디렉토리의 catalog.bin으로 기록
+
+    고정 폭 레코드 표와 문자열 풀로 이루어진 읽기 전용 형식이라 MCPAgent는 파일을
+    mmap으로 열고 필요한 레코드만 오프셋으로 찾아 디코딩합니다. 서버, 카테고리,
+    도구 이름은 이름순 표로 이분 탐색하고, 파일은 바뀌지 않으므로 포스팅에는
+    토큰별 BM25 점수(IDF와 필드 길이 정규화까지 적용)를 미리 계산해 둡니다.
+    오타/중간 일치 검색용 어휘 트라이그램 색인도 표로 넣어 두므로 읽는 쪽은
+    메모리에 색인을 만들지 않습니다.
+    같은 호스트의 프로세스들은 페이지 캐시의 한 사본을 공유합니다.
+
+    임시 파일에 쓴 뒤 교체하므로 이미 파일을 매핑한 프로세스는 이전 내용을 계속
+    보다가 다시 열 때 새 카탈로그로 넘어갑니다. 문자열 풀은 4GiB까지입니다.
+
+    Usage:
+        writer = CatalogBinaryWriter(Path('output/servers'))
+        writer.write(snapshot_writer.published)
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / CATALOG_BIN_FILENAME
+
+        # 서버별 (조각 파일 식별자, 카테고리별 도구 [(토큰별 필드 출현 횟수, 필드 길이)])
+        self._analyses: Dict[str, Tuple[Tuple[int, int], List[List[_ToolTerms]]]] = {}
+
+    def _analyse(self, server: str, file_id: Tuple[int, int], entry: Dict[str, Any]):
+        """서버 도구들의 검색 토큰 (바뀌지 않은 서버는 이전 결과 재사용)"""
+        cached = self._analyses.get(server)
+        if cached is not None and cached[0] == file_id:
+            return cached[1]
+
+        analysis = []
+        for cat_info in entry["categories"].values():
+            # 도구 키워드는 카테고리 키워드
+            keyword_tokens = tokenize(" ".join(cat_info["keywords"]))
+            tools = []
+            for name, _, description, _ in cat_info["tools"]:
+                fields = (tokenize(name), tokenize(description), keyword_tokens)
+                counts: Dict[str, List[int]] = {}
+                for field, tokens in enumerate(fields):
+                    for token in tokens:
+                        counts.setdefault(token, [0, 0, 0])[field] += 1
+                tools.append((
+                    [(token, *field_counts) for token, field_counts in counts.items()],
+                    tuple(len(tokens) for tokens in fields)
+                ))
+            analysis.append(tools)
+
+        self._analyses[server] = (file_id, analysis)
+        return analysis
+
+    def write(self, servers: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]) -> Path:
+        """
+        Args:
+            servers: {서버: (조각 파일 식별자, 스냅샷 항목)}
+        """
+        pool = _StringPool()
+        server_records = []
+        category_records = []
+        tool_records = []
+        category_order: List[int] = []
+        tool_order: List[int] = []
+        # {토큰: [(도구 번호, 이름/설명/키워드 출현 횟수)]}, 도구별 (이름, 설명, 키워드) 토큰 수
+        postings: Dict[str, List[Tuple[int, int, int, int]]] = {}
+        lengths: List[Tuple[int, int, int]] = []
+
+        for name in self._analyses.keys() - servers.keys():
+            del self._analyses[name]
+
+        for server_id, (server, (file_id, entry)) in enumerate(sorted(servers.items())):
+            analysis = self._analyse(server, file_id, entry)
+            first_category = len(category_records)
+            category_names = []
+
+            for (cat_name, cat_info), tools in zip(entry["categories"].items(), analysis):
+                category_id = len(category_records)
+                first_tool = len(tool_records)
+                tool_names = []
+
+                # 도구 키워드는 카테고리 키워드 (메모리 색인의 ToolInfo.keywords와 같음)
+                keywords = pool.add(json.dumps(list(cat_info["keywords"]), ensure_ascii=False))
+
+                # 스냅샷 도구 레코드: (이름, 전체 이름, 설명, 스키마 JSON)
+                for (name, _, description, schema), (terms, tool_lengths) in zip(
+                    cat_info["tools"], tools
+                ):
+                    tool_id = len(tool_records)
+                    tool_names.append(name.encode('utf-8'))
+                    for token, *field_counts in terms:
+                        postings.setdefault(token, []).append((tool_id, *field_counts))
+                    lengths.append(tool_lengths)
+
+                    tool_records.append((
+                        *pool.add(name),
+                        *pool.add(description),
+                        *(pool.add(schema) if schema else (0, 0)),
+                        *keywords,
+                        category_id
+                    ))
+
+                tool_order.extend(
+                    first_tool + position
+                    for position in sorted(range(len(tool_names)), key=tool_names.__getitem__)
+                )
+                category_names.append(cat_name.encode('utf-8'))
+                category_records.append((
+                    *pool.add(cat_name),
+                    *pool.add(cat_info["description"]),
+                    *keywords,
+                    server_id,
+                    first_tool,
+                    len(tool_records) - first_tool
+                ))
+
+            category_order.extend(
+                first_category + position
+                for position in sorted(range(len(category_names)), key=category_names.__getitem__)
+            )
+            server_records.append((
+                *pool.add(server),
+                *pool.add(json.dumps(entry["metadata"], ensure_ascii=False)),
+                first_category,
+                len(category_records) - first_category
+            ))
+
+        token_records = []
+        posting_records = []
+        # {(트라이그램, 비교용 문자열 길이): 토큰 번호 목록}
+        grams: Dict[Tuple[str, int], List[int]] = {}
+        scores = _posting_scores(lengths)
+        for token_id, token in enumerate(sorted(postings, key=lambda token: token.encode('utf-8'))):
+            token_postings = postings[token]
+            token_records.append((*pool.add(token), len(posting_records), len(token_postings)))
+            posting_records.extend(scores(token_postings))
+
+            key = fuzzy_key(token)
+            for gram in trigrams(key):
+                grams.setdefault((gram, len(key)), []).append(token_id)
+
+        gram_records = []
+        gram_tokens: List[Tuple[int]] = []
+        for gram, length in sorted(grams, key=lambda item: (item[0].encode('utf-8'), item[1])):
+            token_ids = grams[gram, length]
+            gram_records.append((*pool.add(gram), length, len(gram_tokens), len(token_ids)))
+            gram_tokens.extend((token_id,) for token_id in token_ids)
+
+        tables = [
+            (SERVER, server_records),
+            (CATEGORY, category_records),
+            (TOOL, tool_records),
+            (ORDER, [(category_id,) for category_id in category_order]),
+            (ORDER, [(tool_id,) for tool_id in tool_order]),
+            (TOKEN, token_records),
+            (POSTING, posting_records),
+            (GRAM, gram_records),
+            (GRAM_TOKEN, gram_tokens),
+        ]
+        offsets = []
+        offset = HEADER.size
+        for record, rows in tables:
+            offsets.append(offset)
+            offset += record.size * len(rows)
+        offsets.append(offset)      # 문자열 풀
+
+        header = HEADER.pack(
+            BINARY_MAGIC,
+            BINARY_VERSION,
+            len(server_records),
+            len(category_records),
+            len(tool_records),
+            len(token_records),
+            len(gram_records),
+            *offsets
+        )
+
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            for record, rows in tables:
+                f.write(_pack(record, rows))
+            f.write(pool.getvalue())
+        os.replace(tmp_path, self.path)
+        return self.path
+
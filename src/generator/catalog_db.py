@@ -0,0 +1,248 @@
+"""MCPAgent sqlite 백엔드용 카탈로그 데이터베이스"""
+import json
+import sqlite3
+from typing import Dict, Any, Tuple, List
+from pathlib import Path
+from agent.search_rules import tokenize, fuzzy_key, trigrams
+
+
+# 출력 디렉토리의 카탈로그 데이터베이스 (MCPAgent(backend="sqlite")가 읽음)
+CATALOG_DB_FILENAME = "catalog.db"
+
+# 스키마 버전 (PRAGMA user_version) - 다르면 테이블을 지우고 다시 만듦
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    name TEXT PRIMARY KEY,
+    metadata TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    server TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    tool_count INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (server, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tools (
+    id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    input_schema TEXT,
+    keywords TEXT NOT NULL,
+    category_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name_length INTEGER NOT NULL,
+    description_length INTEGER NOT NULL,
+    keyword_length INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS tools_by_name ON tools (server, category, name);
+CREATE INDEX IF NOT EXISTS tools_by_position ON tools (server, category, position);
+CREATE VIRTUAL TABLE IF NOT EXISTS tools_fts USING fts5 (
+    name, description, keywords, tokenize = 'unicode61 remove_diacritics 0'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tools_vocab USING fts5vocab (tools_fts, 'row');
+CREATE VIRTUAL TABLE IF NOT EXISTS tools_vocab_instance USING fts5vocab (tools_fts, 'instance');
+CREATE TABLE IF NOT EXISTS tools_vocab_terms (
+    term TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tools_vocab_grams (
+    gram TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    PRIMARY KEY (gram, length, term)
+) WITHOUT ROWID;
+"""
+
+# 스키마 버전이 다를 때 지우는 테이블 (가상 테이블을 먼저)
+_TABLES = (
+    "tools_vocab_instance", "tools_vocab", "tools_fts", "tools_vocab_grams",
+    "tools_vocab_terms", "tools", "categories", "servers",
+)
+
+
+def _term_grams(term: str) -> Tuple[int, List[str]]:
+    """
+    어휘 토큰의 (비교용 문자열 길이, 트라이그램)
+
+    Agent의 FuzzyIndex와 같은 규칙(agent.search_rules)입니다.
+    """
+    key = fuzzy_key(term)
+    return len(key), trigrams(key)
+
+
+def _search_text(tokens: List[str]) -> str:
+    """
+    FTS5에 넣을 텍스트 (agent.search_rules.tokenize()로 나눈 토큰을 공백으로 연결)
+
+    unicode61 토크나이저(발음 기호 유지)는 이 텍스트를 같은 토큰으로 나누므로
+    FTS5 어휘와 출현 위치가 SearchIndex의 토큰과 같습니다.
+    """
+    return " ".join(tokens)
+
+
+class CatalogDatabaseWriter:
+    """
+    게시된 서버들의 스냅샷 항목을 출력 디렉토리의 catalog.db에 반영
+
+    서버, 카테고리, 도구 테이블과 도구 이름/설명/키워드의 FTS5 색인, 오타/중간
+    일치 검색용 FTS5 어휘 테이블과 어휘 토큰의 트라이그램 테이블을 만듭니다.
+    도구 행에는 SearchIndex와 같은 BM25F 점수를 계산하도록 필드별 토큰 수를 둡니다.
+    트라이그램 테이블은 어휘에서 추가/삭제된 토큰만 갱신합니다.
+    servers.source에 스냅샷 조각 파일 식별자를 기록해 두고 바뀐 서버만 지웠다가
+    다시 넣으며, 한 번의 write()는 하나의 트랜잭션이므로 읽는 쪽은 항상 완성된
+    카탈로그를 봅니다(WAL 모드라 쓰는 동안에도 읽기는 막히지 않음).
+
+    Usage:
+        writer = CatalogDatabaseWriter(Path('output/servers'))
+        writer.write(snapshot_writer.published)
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / CATALOG_DB_FILENAME
+
+    def write(self, servers: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]) -> Path:
+        """
+        Args:
+            servers: {서버: (조각 파일 식별자, 스냅샷 항목)}
+        """
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # 이전 형식 - 모든 서버를 새 형식으로 다시 넣음
+                conn.executescript(
+                    "BEGIN;"
+                    + "".join(f"DROP TABLE IF EXISTS {table};" for table in _TABLES)
+                    + SCHEMA
+                    + f"PRAGMA user_version = {SCHEMA_VERSION};"
+                    + "COMMIT;"
+                )
+            else:
+                conn.executescript(SCHEMA)
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = dict(conn.execute("SELECT name, source FROM servers"))
+                for name in existing.keys() - servers.keys():
+                    self._delete(conn, name)
+
+                for name, (file_id, entry) in sorted(servers.items()):
+                    source = f"{file_id[0]}:{file_id[1]}"
+                    if existing.get(name) == source:
+                        continue
+                    if name in existing:
+                        self._delete(conn, name)
+                    self._insert(conn, name, source, entry)
+                self._sync_vocabulary(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return self.path
+
+    @staticmethod
+    def _sync_vocabulary(conn: sqlite3.Connection):
+        """FTS5 어휘에서 추가/삭제된 토큰의 트라이그램 갱신"""
+        current = {term for term, in conn.execute("SELECT term FROM tools_vocab")}
+        indexed = {term for term, in conn.execute("SELECT term FROM tools_vocab_terms")}
+
+        removed = sorted(indexed - current)
+        added = sorted(current - indexed)
+        if removed:
+            conn.executemany(
+                "DELETE FROM tools_vocab_grams WHERE gram = ? AND length = ? AND term = ?",
+                (
+                    (gram, length, term)
+                    for term in removed
+                    for length, grams in [_term_grams(term)]
+                    for gram in grams
+                )
+            )
+            conn.executemany("DELETE FROM tools_vocab_terms WHERE term = ?", ((term,) for term in removed))
+        if added:
+            # 기본 키 순서로 넣어야 B-트리 끝에 이어 붙여 처음 만들 때도 빠름
+            conn.executemany(
+                "INSERT INTO tools_vocab_grams (gram, length, term) VALUES (?, ?, ?)",
+                sorted(
+                    (gram, length, term)
+                    for term in added
+                    for length, grams in [_term_grams(term)]
+                    for gram in grams
+                )
+            )
+            conn.executemany("INSERT INTO tools_vocab_terms (term) VALUES (?)", ((term,) for term in added))
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, server: str):
+        """서버의 행 삭제"""
+        conn.execute(
+            "DELETE FROM tools_fts WHERE rowid IN (SELECT id FROM tools WHERE server = ?)",
+            (server,)
+        )
+        conn.execute("DELETE FROM tools WHERE server = ?", (server,))
+        conn.execute("DELETE FROM categories WHERE server = ?", (server,))
+        conn.execute("DELETE FROM servers WHERE name = ?", (server,))
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, server: str, source: str, entry: Dict[str, Any]):
+        """서버의 스냅샷 항목 삽입"""
+        conn.execute(
+            "INSERT INTO servers (name, metadata, source) VALUES (?, ?, ?)",
+            (server, json.dumps(entry["metadata"], ensure_ascii=False), source)
+        )
+
+        next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tools").fetchone()[0]
+        categories = []
+        tools = []
+        # 카테고리별 키워드 토큰
+        keyword_tokens = {}
+        for position, (cat_name, cat_info) in enumerate(entry["categories"].items()):
+            keywords = json.dumps(list(cat_info["keywords"]), ensure_ascii=False)
+            keyword_tokens[cat_name] = tokenize(" ".join(cat_info["keywords"]))
+            categories.append((
+                server,
+                cat_name,
+                cat_info["description"],
+                keywords,
+                len(cat_info["tools"]),
+                position
+            ))
+            # 스냅샷 도구 레코드: (이름, 전체 이름, 설명, 스키마 JSON) - 키워드는 카테고리 키워드
+            for tool_position, (name, full_name, description, schema) in enumerate(cat_info["tools"]):
+                tools.append((
+                    next_id, server, cat_name, name, full_name, description, schema, keywords,
+                    position, tool_position,
+                    tokenize(name), tokenize(description), keyword_tokens[cat_name]
+                ))
+                next_id += 1
+
+        conn.executemany(
+            "INSERT INTO categories (server, name, description, keywords, tool_count, position) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            categories
+        )
+        conn.executemany(
+            "INSERT INTO tools (id, server, category, name, full_name, description, "
+            "input_schema, keywords, category_position, position, name_length, "
+            "description_length, keyword_length) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (*row[:10], *map(len, row[10:]))
+                for row in tools
+            )
+        )
+        conn.executemany(
+            "INSERT INTO tools_fts (rowid, name, description, keywords) VALUES (?, ?, ?, ?)",
+            (
+                (row[0], *map(_search_text, row[10:]))
+                for row in tools
+            )
+        )
@@ -0,0 +1,200 @@
+"""tools/list_changed 알림 기반 증분 카탈로그 갱신"""
+import asyncio
+from typing import List, Dict, Set, Tuple, Optional
+from dataclasses import dataclass, field
+from generator.mcp_client import MCPClient, MCPTool
+from generator.categorizer import ToolCategorizer
+from generator.file_generator import FileGenerator
+from generator.archive import load_server_metadata
+
+
+@dataclass
+class ToolDiff:
+    """두 도구 목록의 차이"""
+    added: List[MCPTool] = field(default_factory=list)
+    removed: List[MCPTool] = field(default_factory=list)
+    changed: List[Tuple[MCPTool, MCPTool]] = field(default_factory=list)
+
+    @classmethod
+    def compute(cls, old_tools: List[MCPTool], new_tools: List[MCPTool]) -> 'ToolDiff':
+        """이름 기준으로 추가/삭제/변경(설명 또는 스키마) 도구 계산"""
+        old_by_name = {tool.name: tool for tool in old_tools}
+        new_names = {tool.name for tool in new_tools}
+
+        diff = cls()
+        for tool in new_tools:
+            old = old_by_name.get(tool.name)
+            if old is None:
+                diff.added.append(tool)
+            elif old != tool:
+                diff.changed.append((old, tool))
+
+        diff.removed = [tool for tool in old_tools if tool.name not in new_names]
+        return diff
+
+    def is_empty(self) -> bool:
+        """변경 사항이 없는지 여부"""
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        """한 줄 요약"""
+        return f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+
+class CatalogWatcher:
+    """
+    MCP 서버 연결을 유지하면서 도구 목록 변경을 생성된 구조에 반영
+
+    notifications/tools/list_changed 알림을 받으면 이전 도구 목록과 비교하여
+    추가/삭제/변경된 도구만 다시 분류하고, 영향받은 카테고리 디렉토리만 다시 생성합니다.
+    전체 카탈로그는 알림을 받고 CATALOG_DELAY초 뒤에 그동안 반영한 변경을 묶어 한 번만
+    갱신합니다.
+
+    Usage:
+        watcher = CatalogWatcher(MCPClient(), ToolCategorizer(), FileGenerator())
+        await watcher.run(['github'])
+    """
+
+    RETRY_MIN_DELAY = 1.0
+    RETRY_MAX_DELAY = 60.0
+
+    # 변경을 반영한 뒤 카탈로그를 갱신하기까지 기다리는 시간(초)
+    CATALOG_DELAY = 1.0
+
+    def __init__(
+        self,
+        client: MCPClient,
+        categorizer: ToolCategorizer,
+        generator: FileGenerator
+    ):
+        self.client = client
+        self.categorizer = categorizer
+        self.generator = generator
+
+        # 서버별 마지막 도구 목록과 도구 이름 → 카테고리 매핑
+        self._tools: Dict[str, List[MCPTool]] = {}
+        self._assignments: Dict[str, Dict[str, str]] = {}
+
+        # 예약된 카탈로그 갱신
+        self._catalog_task: Optional[asyncio.Task] = None
+
+    async def run(self, server_names: Optional[List[str]] = None):
+        """선택된 서버들을 감시 (종료될 때까지 실행)"""
+        if self.client.config.get("mock_mode", False):
+            print("Mock 모드에서는 변경 알림을 받을 수 없어 감시를 지원하지 않습니다.")
+            return
+
+        servers = self.client.server_configs(server_names)
+        if not servers:
+            print("감시할 서버가 없습니다.")
+            return
+
+        for server_config in servers:
+            self._load_baseline(server_config)
+
+        print(f"👀 {len(servers)}개 서버 감시 중... (Ctrl+C로 종료)")
+        # 종료할 때 아직 반영하지 않은 변경은 블록을 나가면서 카탈로그에 반영
+        with self.generator.catalog_batch():
+            await asyncio.gather(*(self._watch_forever(server) for server in servers))
+
+    def _load_baseline(self, server_config: Dict):
+        """이미 생성된 구조가 있으면 캐시된 도구 목록을 기준으로 사용"""
+        name = server_config["name"]
+        # list-servers/show와 같은 로더로 확인 (압축 파일로 게시된 서버 포함)
+        if load_server_metadata(self.generator.output_dir, name) is None:
+            return
+
+        tools = self.client.cache.load(server_config, check_ttl=False)
+        if tools is None:
+            return
+
+        self._tools[name] = tools
+        self._assignments[name] = dict(zip(
+            (tool.name for tool in tools),
+            self.categorizer.assign_categories(tools)
+        ))
+
+    async def _watch_forever(self, server_config: Dict):
+        """연결이 끊기면 지수 백오프로 재연결"""
+        name = server_config["name"]
+        delay = self.RETRY_MIN_DELAY
+
+        async def on_tools(tools: List[MCPTool]):
+            nonlocal delay
+            delay = self.RETRY_MIN_DELAY
+            self.apply(name, tools)
+            self._schedule_catalog()
+
+        while True:
+            try:
+                await self.client.watch_server(server_config, on_tools)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"  X {name}: 연결 끊김 - {e} ({delay:g}초 후 재연결)")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RETRY_MAX_DELAY)
+
+    def _schedule_catalog(self):
+        """CATALOG_DELAY초 뒤 카탈로그 갱신 예약 (이미 예약되어 있으면 그때 함께 반영)"""
+        if self._catalog_task is None or self._catalog_task.done():
+            self._catalog_task = asyncio.create_task(self._flush_catalog_later())
+
+    async def _flush_catalog_later(self):
+        await asyncio.sleep(self.CATALOG_DELAY)
+        self.generator.flush_catalog()
+
+    def apply(self, server_name: str, tools: List[MCPTool]) -> Set[str]:
+        """새 도구 목록을 반영하고 다시 생성한 카테고리 이름 반환"""
+        old_tools = self._tools.get(server_name)
+
+        # 기준 목록이 없으면 전체 생성
+        if old_tools is None:
+            names = self.categorizer.assign_categories(tools)
+            categories = self.categorizer.build_categories(tools, names)
+            self.generator.generate_server_structure(server_name, categories)
+
+            self._tools[server_name] = tools
+            self._assignments[server_name] = dict(zip((tool.name for tool in tools), names))
+            self._save_memo()
+            return set(categories)
+
+        diff = ToolDiff.compute(old_tools, tools)
+        if diff.is_empty():
+            self._tools[server_name] = tools
+            return set()
+
+        print(f"\n🔄 {server_name}: 도구 목록 변경 ({diff.summary()})")
+
+        assignments = dict(self._assignments[server_name])
+        affected: Set[str] = set()
+
+        # 삭제/변경된 도구가 있던 카테고리
+        for tool in diff.removed:
+            affected.add(assignments.pop(tool.name))
+        for old_tool, _ in diff.changed:
+            affected.add(assignments[old_tool.name])
+
+        # 추가/변경된 도구만 다시 분류
+        reclassify = diff.added + [new_tool for _, new_tool in diff.changed]
+        for tool, category_name in zip(reclassify, self.categorizer.assign_categories(reclassify)):
+            assignments[tool.name] = category_name
+            affected.add(category_name)
+
+        # 전체 생성과 같은 순서가 되도록 새 목록 순서대로 구성
+        categories = self.categorizer.build_categories(
+            tools,
+            [assignments[tool.name] for tool in tools]
+        )
+        self.generator.update_categories(server_name, categories, affected)
+
+        self._tools[server_name] = tools
+        self._assignments[server_name] = assignments
+        self._save_memo()
+        return affected
+
+    def _save_memo(self):
+        """분류 캐시가 있으면 저장"""
+        if self.categorizer.memo is not None:
+            self.categorizer.memo.save()
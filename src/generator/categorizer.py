@@ -1,10 +1,15 @@
 """MCP 도구를 카테고리별로 분류"""
+import os
 import json
-import re
-from typing import List, Dict, Any
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from generator.mcp_client import MCPTool
+from generator.rule_engine import CompiledRules
+from generator.category_cache import CategoryMemo
+from generator.similarity import SimilarityFallback
 
 
 @dataclass
@@ -16,14 +21,73 @@ class CategoryInfo:
     tools: List[MCPTool] = field(default_factory=list)
 
 
+# 프로세스 풀 워커에서 사용하는 분류기 (워커마다 한 번 생성)
+_worker_categorizer: Optional['ToolCategorizer'] = None
+
+
+def _init_worker(config_path: str):
+    """워커 프로세스 초기화"""
+    global _worker_categorizer
+    _worker_categorizer = ToolCategorizer(config_path)
+
+
+def _assign_shard(shard: List[Tuple[str, str]]) -> List[str]:
+    """워커에서 (이름, 설명) 목록의 카테고리 결정"""
+    return [
+        _worker_categorizer._determine_category(MCPTool(name, description, ""))
+        for name, description in shard
+    ]
+
+
 class ToolCategorizer:
     """도구 분류기"""
     
-    def __init__(self, config_path: str = "config/categories.json"):
+    # 이보다 적은 도구는 프로세스 간 전송 비용이 더 커서 직렬로 분류
+    PARALLEL_THRESHOLD = 20000
+    
+    def __init__(
+        self,
+        config_path: str = "config/categories.json",
+        workers: int = 1,
+        parallel_threshold: Optional[int] = None,
+        memo: Optional[CategoryMemo] = None
+    ):
+        """
+        Args:
+            config_path: 카테고리 규칙 파일 경로
+            workers: 분류에 사용할 프로세스 수 (0이면 CPU 코어 수, 1이면 직렬)
+            parallel_threshold: 병렬 분류를 시작할 최소 도구 수
+            memo: 분류 결과 캐시 (None이면 매번 분류)
+        """
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self.patterns = self.config["category_rules"]["patterns"]
         self.default_category = self.config["category_rules"]["default_category"]
+        
+        # 규칙을 한 번만 컴파일
+        self.rules = CompiledRules(self.patterns)
+        
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold or self.PARALLEL_THRESHOLD
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.memo = memo
+        
+        # 규칙에 매칭되지 않은 도구용 유사도 분류 (numpy 필요)
+        fallback_config = self.config["category_rules"].get("similarity_fallback", {})
+        self._fallback_enabled = fallback_config.get("enabled", False)
+        self._fallback_threshold = fallback_config.get(
+            "threshold", SimilarityFallback.DEFAULT_THRESHOLD
+        )
+        self._fallback: Optional[SimilarityFallback] = None
+        
+        if memo is not None:
+            memo.bind(self._memo_variant())
+    
+    def _memo_variant(self) -> str:
+        """분류 결과에 영향을 주는 규칙 밖의 설정 (유사도 분류 사용 여부, 임계값, 버전)"""
+        if not (self._fallback_enabled and SimilarityFallback.available()):
+            return "similarity:off"
+        return f"similarity:{SimilarityFallback.VERSION}:{self._fallback_threshold!r}"
     
     def _load_config(self) -> Dict[str, Any]:
         """설정 파일 로드"""
@@ -32,11 +96,95 @@ class ToolCategorizer:
     
     def categorize_tools(self, tools: List[MCPTool]) -> Dict[str, CategoryInfo]:
         """도구들을 카테고리별로 분류"""
+        return self.build_categories(tools, self.assign_categories(tools))
+    
+    def assign_categories(self, tools: List[MCPTool]) -> List[str]:
+        """도구별 카테고리 이름 결정 (입력 순서와 동일한 순서)"""
+        if self.memo is None:
+            return self._assign_uncached(tools)
+        
+        # 캐시에 없는 도구만 분류
+        names: List[Optional[str]] = [self.memo.get(tool) for tool in tools]
+        missing = [i for i, name in enumerate(names) if name is None]
+        if missing:
+            computed = self._assign_uncached([tools[i] for i in missing])
+            for i, name in zip(missing, computed):
+                names[i] = name
+                self.memo.put(tools[i], name)
+        return names
+    
+    def _assign_uncached(self, tools: List[MCPTool]) -> List[str]:
+        """규칙으로 카테고리 결정 (직렬 또는 병렬) 후 기본 카테고리 도구는 유사도로 재분류"""
+        if self.workers > 1 and len(tools) >= self.parallel_threshold:
+            names = self._assign_parallel(tools)
+        else:
+            names = [self._determine_category(tool) for tool in tools]
+        
+        if self._fallback_enabled:
+            self._apply_fallback(tools, names)
+        return names
+    
+    def _apply_fallback(self, tools: List[MCPTool], names: List[str]):
+        """기본 카테고리로 분류된 도구들을 한 번에 유사도 분류 (names를 직접 수정)"""
+        unmatched = [i for i, name in enumerate(names) if name == self.default_category]
+        if not unmatched:
+            return
+        
+        if self._fallback is None:
+            if not SimilarityFallback.available():
+                print("  ⚠️ numpy가 설치되어 있지 않아 유사도 분류를 건너뜁니다 (pip install -e .[similarity])")
+                self._fallback_enabled = False
+                return
+            self._fallback = SimilarityFallback(self.patterns, self._fallback_threshold)
+        
+        similar = self._fallback.assign([tools[i] for i in unmatched])
+        for i, category_name in zip(unmatched, similar):
+            if category_name is not None:
+                names[i] = category_name
+    
+    def _assign_parallel(self, tools: List[MCPTool]) -> List[str]:
+        """
+        도구를 연속된 구간으로 나눠 프로세스 풀에서 분류
+        
+        워커에는 이름과 설명만 보내고 카테고리 이름만 돌려받습니다. 구간 순서대로
+        결과를 이어 붙이므로 직렬 분류와 순서가 같습니다.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(str(self.config_path),)
+            )
+        
+        # 워커 간 부하 편차를 줄이도록 워커 수보다 잘게 나눔
+        shard_size = -(-len(tools) // (self.workers * 4))
+        shards = [
+            [(tool.name, tool.description) for tool in tools[start:start + shard_size]]
+            for start in range(0, len(tools), shard_size)
+        ]
+        
+        names: List[str] = []
+        for shard_names in self._pool.map(_assign_shard, shards):
+            names.extend(sys.intern(name) for name in shard_names)
+        return names
+    
+    def close(self):
+        """병렬 분류용 프로세스 풀 종료 및 분류 캐시 저장"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.memo is not None:
+            self.memo.save()
+    
+    def build_categories(
+        self,
+        tools: List[MCPTool],
+        category_names: List[str]
+    ) -> Dict[str, CategoryInfo]:
+        """도구와 카테고리 이름 목록으로 CategoryInfo 구성"""
         categories: Dict[str, CategoryInfo] = {}
         
-        for tool in tools:
-            category_name = self._determine_category(tool)
-            
+        for tool, category_name in zip(tools, category_names):
             # 카테고리가 없으면 생성
             if category_name not in categories:
                 category_config = self._get_category_config(category_name)
@@ -56,10 +204,9 @@ class ToolCategorizer:
         tool_name_lower = tool.name.lower()
         
         # 1. 패턴 매칭으로 카테고리 찾기
-        for pattern_config in self.patterns:
-            pattern = pattern_config["pattern"]
-            if re.search(pattern, tool_name_lower):
-                return pattern_config["category"]
+        category = self.rules.match_name(tool_name_lower)
+        if category:
+            return category
         
         # 2. 도구 이름에서 카테고리 힌트 추출
         category_hint = tool.get_category_hint()
@@ -67,23 +214,21 @@ class ToolCategorizer:
             # 힌트를 복수형으로 변환
             if not category_hint.endswith('s'):
                 category_hint += 's'
-            return category_hint
+            return sys.intern(category_hint)
         
         # 3. 설명에서 키워드 찾기
-        description_lower = tool.description.lower()
-        for pattern_config in self.patterns:
-            for keyword in pattern_config["keywords"]:
-                if keyword in description_lower:
-                    return pattern_config["category"]
+        category = self.rules.match_description(tool.description.lower())
+        if category:
+            return category
         
         # 4. 기본 카테고리
         return self.default_category
     
     def _get_category_config(self, category_name: str) -> Dict[str, Any]:
         """카테고리 설정 가져오기"""
-        for pattern_config in self.patterns:
-            if pattern_config["category"] == category_name:
-                return pattern_config
+        category_config = self.rules.category_config(category_name)
+        if category_config is not None:
+            return category_config
         
         # 기본 설정
         return {
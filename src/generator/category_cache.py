@@ -0,0 +1,142 @@
+"""도구 분류 결과 로컬 캐시"""
+import json
+import time
+import hashlib
+from typing import Dict, List, Optional
+from pathlib import Path
+from generator.mcp_client import MCPTool
+
+
+class CategoryMemo:
+    """
+    도구 분류 결과를 디스크에 캐시
+
+    키는 (도구 이름, 설명 해시)이고, 파일 전체가 분류 규칙 파일(categories.json)과
+    bind()로 지정한 분류 설정(유사도 분류 사용 여부, 임계값 등)의 해시에 묶여 있어
+    둘 중 하나가 바뀌면 자동으로 비워집니다. 저장할 때 max_age보다 오래 사용되지 않은
+    항목을 지우고, max_entries를 넘으면 오래된 항목부터 지웁니다.
+
+    Usage:
+        memo = CategoryMemo('config/categories.json')
+        category = memo.get(tool)
+        if category is None:
+            category = ...  # 분류
+            memo.put(tool, category)
+        memo.save()
+    """
+
+    DEFAULT_MAX_AGE = 30 * 86400
+    DEFAULT_MAX_ENTRIES = 500000
+
+    def __init__(
+        self,
+        rules_path: str,
+        cache_path: str = ".cache/categories.json",
+        max_age: float = DEFAULT_MAX_AGE,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            rules_path: 분류 규칙 파일 경로 (내용 해시를 캐시 버전으로 사용)
+            cache_path: 캐시 파일 경로
+            max_age: 마지막 사용 후 항목을 유지할 시간(초)
+            max_entries: 최대 항목 수
+        """
+        self._rules = Path(rules_path).read_bytes()
+        self.rules_hash = self._hash("")
+        self.cache_path = Path(cache_path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._now = int(time.time())
+        self._dirty = False
+
+        # 처음 조회할 때 로드 (bind()로 해시가 바뀌기 전에 읽지 않도록)
+        self._loaded: Optional[Dict[str, List]] = None
+
+    def _hash(self, variant: str) -> str:
+        return hashlib.sha256(self._rules + b"\x00" + variant.encode('utf-8')).hexdigest()
+
+    def bind(self, variant: str):
+        """
+        규칙 파일 밖의 분류 설정을 캐시 해시에 포함
+
+        같은 규칙이어도 설정에 따라 분류 결과가 달라지는 경우(예: 유사도 분류를 켜거나
+        numpy를 설치한 경우) 이전 설정으로 분류한 결과를 재사용하지 않도록 합니다.
+        """
+        rules_hash = self._hash(variant)
+        if rules_hash != self.rules_hash:
+            self.rules_hash = rules_hash
+            self._loaded = None
+
+    @property
+    def _entries(self) -> Dict[str, List]:
+        if self._loaded is None:
+            self._loaded = self._load()
+        return self._loaded
+
+    def _load(self) -> Dict[str, List]:
+        """캐시 파일 로드 (규칙 해시가 다르면 빈 캐시)"""
+        if not self.cache_path.exists():
+            return {}
+
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("rules_hash") != self.rules_hash:
+            self._dirty = True
+            return {}
+        return data.get("entries", {})
+
+    @staticmethod
+    def _key(tool: MCPTool) -> str:
+        """(도구 이름, 설명 해시) 키"""
+        digest = hashlib.blake2b(tool.description.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{tool.name}\x00{digest}"
+
+    def get(self, tool: MCPTool) -> Optional[str]:
+        """캐시된 카테고리 (없으면 None)"""
+        entry = self._entries.get(self._key(tool))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if entry[1] != self._now:
+            entry[1] = self._now
+            self._dirty = True
+        return entry[0]
+
+    def put(self, tool: MCPTool, category: str):
+        """분류 결과 기록"""
+        self._entries[self._key(tool)] = [category, self._now]
+        self._dirty = True
+
+    def save(self):
+        """오래된 항목을 정리하고 캐시 파일 저장"""
+        if not self._dirty:
+            return
+
+        # 나이 기준 정리
+        cutoff = self._now - self.max_age
+        entries = {key: entry for key, entry in self._entries.items() if entry[1] >= cutoff}
+
+        # 크기 기준 정리 (최근에 사용한 항목 우선 유지)
+        if len(entries) > self.max_entries:
+            recent = sorted(entries.items(), key=lambda item: item[1][1], reverse=True)
+            entries = dict(recent[:self.max_entries])
+
+        self._loaded = entries
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_text(
+            json.dumps({"rules_hash": self.rules_hash, "entries": entries}, ensure_ascii=False),
+            encoding='utf-8'
+        )
+        tmp_path.replace(self.cache_path)
+        self._dirty = False
@@ -1,41 +1,197 @@
 """TypeScript 파일 및 디렉토리 구조 생성"""
+import os
 import json
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Set, Optional, List, Tuple, Union, Iterable
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, BytecodeCache, Template
 from generator.categorizer import CategoryInfo
 from generator.mcp_client import MCPTool
+from generator.manifest import OutputManifest
+from generator.batch_writer import BatchWriter
+from generator.publisher import GenerationStore
+from generator.archive import ServerArchiveWriter, archive_path
+from generator.snapshot import CatalogSnapshotWriter, FRAGMENT_FILENAME, encode_fragment
+from generator.catalog_db import CatalogDatabaseWriter
+from generator.catalog_binary import CatalogBinaryWriter
+
+
+# 패키지 기준 템플릿 디렉토리 (실행 위치와 무관)
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+# 컴파일된 템플릿 바이트코드 캐시 (템플릿 소스가 바뀌면 자동으로 다시 컴파일)
+TEMPLATE_CACHE_DIR = TEMPLATE_DIR.parent.parent / ".cache" / "templates"
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    """템플릿 바이트코드 캐시 (프로젝트 .cache에 쓸 수 없으면 시스템 임시 디렉토리)"""
+    try:
+        TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR))
+    except OSError:
+        return FileSystemBytecodeCache()
+
+
+# 해시 계산용 타임스탬프 자리 표시자 (파일에 쓸 때 실제 시각으로 치환)
+_TIMESTAMP_MARK = "\ue000generated_at\ue000"
+
+TOOL_TEMPLATE = 'tool_wrapper.ts.j2'
+
+
+def _python_to_ts_type(python_type: str) -> str:
+    """Python 타입을 TypeScript 타입으로 변환"""
+    type_mapping = {
+        'string': 'string',
+        'integer': 'number',
+        'number': 'number',
+        'boolean': 'boolean',
+        'array': 'any[]',
+        'object': 'Record<string, any>'
+    }
+    return type_mapping.get(python_type, 'any')
+
+
+def _create_environment(template_dir: str, bytecode_cache: Optional[BytecodeCache] = None) -> Environment:
+    """템플릿 렌더링용 Jinja2 환경 (생성기와 렌더링 워커가 같은 설정 사용)"""
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    env.filters['ts_type'] = _python_to_ts_type
+    return env
+
+
+def _example_usage(function_name: str) -> str:
+    """사용 예시 코드 생성"""
+    # 간단한 예시 생성
+    if 'create' in function_name:
+        return f"const result = await {function_name}({{ name: 'Example' }});"
+    elif 'update' in function_name:
+        return f"const result = await {function_name}({{ id: '123', data: {{...}} }});"
+    elif 'read' in function_name or 'get' in function_name:
+        return f"const result = await {function_name}({{ id: '123' }});"
+    elif 'delete' in function_name:
+        return f"await {function_name}({{ id: '123' }});"
+    else:
+        return f"const result = await {function_name}({{...}});"
+
+
+def _render_tool(template: Template, server_name: str, category_name: str, tool: MCPTool) -> str:
+    """개별 도구 TypeScript 파일 내용"""
+    simple_name = tool.get_simple_name()
+    return template.render(
+        tool=tool,
+        server_name=server_name,
+        category_name=category_name,
+        function_name=simple_name,
+        input_schema=tool.input_schema,
+        example_usage=_example_usage(simple_name)
+    )
+
+
+# 프로세스 풀 워커에서 사용하는 도구 템플릿 (워커마다 한 번 로드)
+_worker_template: Optional[Template] = None
+
+
+def _init_worker(template_dir: str):
+    """워커 프로세스 초기화 (렌더링에 필요한 템플릿만 로드)"""
+    global _worker_template
+    _worker_template = _create_environment(template_dir).get_template(TOOL_TEMPLATE)
+
+
+def _render_shard(shard: List[Tuple[str, str, MCPTool]]) -> List[str]:
+    """워커에서 (서버, 카테고리, 도구) 목록의 TypeScript 파일 내용 렌더링"""
+    return [
+        _render_tool(_worker_template, server_name, category_name, tool)
+        for server_name, category_name, tool in shard
+    ]
 
 
 class FileGenerator:
-    """파일 생성기"""
+    """
+    파일 생성기
+    
+    output_format이 "tree"면 도구마다 파일을 만드는 디렉토리 구조를 세대 단위로
+    게시하고, "archive"면 서버마다 같은 구조를 <서버>.zip 파일 하나로 게시합니다.
+    
+    서버를 게시하면 전체 카탈로그(catalog.snapshot, catalog.db, catalog.bin)도
+    갱신하며, catalog_batch() 안에서 게시한 서버들은 블록이 끝날 때 한 번에
+    반영합니다.
+    """
     
-    def __init__(self, output_dir: str = "output/servers"):
+    OUTPUT_FORMATS = ("tree", "archive")
+    
+    # 이보다 적은 도구는 프로세스 간 전송 비용이 더 커서 직렬로 렌더링
+    PARALLEL_THRESHOLD = 2000
+    
+    def __init__(
+        self,
+        output_dir: str = "output/servers",
+        deterministic: bool = False,
+        workers: int = 1,
+        parallel_threshold: Optional[int] = None,
+        keep_generations: int = 3,
+        output_format: str = "tree",
+        catalog_db: bool = False,
+        catalog_bin: bool = False
+    ):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            deterministic: True면 생성 시각을 기록하지 않음 (같은 입력이면 같은 출력)
+            workers: 도구 파일 렌더링에 사용할 프로세스 수 (0이면 CPU 코어 수, 1이면 직렬)
+            parallel_threshold: 병렬 렌더링을 시작할 최소 도구 수
+            keep_generations: 롤백용으로 남겨 둘 이전 생성 결과 수
+            output_format: 출력 형식 ("tree" 또는 "archive")
+            catalog_db: True면 카탈로그를 갱신할 때 catalog.db(SQLite)도 갱신
+            catalog_bin: True면 카탈로그를 갱신할 때 catalog.bin(mmap용 바이너리)도 갱신
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format}")
+        
         self.output_dir = Path(output_dir)
+        self.output_format = output_format
+        self.deterministic = deterministic
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold or self.PARALLEL_THRESHOLD
+        self._pool: Optional[ProcessPoolExecutor] = None
+        
+        # 파일 쓰기는 백그라운드 스레드에서 묶어서 처리
+        self._writer = BatchWriter()
+        
         # Jinja2 환경 설정
-        self.env = Environment(
-            loader=FileSystemLoader('templates'),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        self.env = _create_environment(str(TEMPLATE_DIR), _bytecode_cache())
         
-        # 커스텀 필터 추가
-        self.env.filters['ts_type'] = self._python_to_ts_type
-    
-    def _python_to_ts_type(self, python_type: str) -> str:
-        """Python 타입을 TypeScript 타입으로 변환"""
-        type_mapping = {
-            'string': 'string',
-            'integer': 'number',
-            'number': 'number',
-            'boolean': 'boolean',
-            'array': 'any[]',
-            'object': 'Record<string, any>'
-        }
-        return type_mapping.get(python_type, 'any')
+        # 템플릿은 생성기마다 한 번만 로드
+        self.tool_template = self.env.get_template(TOOL_TEMPLATE)
+        self.category_readme_template = self.env.get_template('category_readme.md.j2')
+        
+        # 스트리밍 생성 중인 서버별 카테고리 (도구 파일은 이미 기록됨)
+        self._pending: Dict[str, Dict[str, CategoryInfo]] = {}
+        
+        # 생성 중인 서버별 스테이징 디렉토리와 내용 해시 매니페스트
+        self.store = GenerationStore(self.output_dir, keep=keep_generations)
+        self._server_dirs: Dict[str, Path] = {}
+        self._manifests: Dict[str, OutputManifest] = {}
+        
+        # archive 형식에서 생성 중인 서버별 압축 파일
+        self._archives: Dict[str, ServerArchiveWriter] = {}
+        
+        # 게시 후 갱신하는 전체 카탈로그 스냅샷
+        self._snapshot = CatalogSnapshotWriter(self.output_dir)
+        self._catalog_db = CatalogDatabaseWriter(self.output_dir) if catalog_db else None
+        self._catalog_bin = CatalogBinaryWriter(self.output_dir) if catalog_bin else None
+        
+        # 열려 있는 catalog_batch() 수와 아직 카탈로그에 반영하지 않은 게시가 있는지
+        self._catalog_batches = 0
+        self._catalog_stale = False
     
     def generate_server_structure(
         self,
@@ -43,27 +199,257 @@ class FileGenerator:
         categories: Dict[str, CategoryInfo]
     ):
         """서버의 전체 디렉토리 구조 생성"""
-        server_dir = self.output_dir / server_name
-        server_dir.mkdir(parents=True, exist_ok=True)
+        self.add_tools(server_name, categories)
+        self.finish_server(server_name)
+    
+    def add_tools(
+        self,
+        server_name: str,
+        categories: Dict[str, CategoryInfo]
+    ):
+        """
+        분류된 도구 청크의 TypeScript 파일 생성
         
-        print(f"\n📁 {server_name} 디렉토리 구조 생성 중...")
+        같은 서버에 대해 여러 번 호출할 수 있으며, 카테고리 README와
+        metadata.json은 finish_server()에서 한 번에 생성합니다. 렌더링된 내용은
+        바로 쓰지만 README, metadata.json, 스냅샷 조각에 모든 도구가 들어가므로
+        도구 레코드는 finish_server()까지 보관합니다.
+        """
+        if server_name not in self._pending:
+            self._begin(server_name)
+            print(f"\n📁 {server_name} 디렉토리 구조 생성 중...")
+        pending = self._pending.setdefault(server_name, {})
+        server_dir = self._server_dirs[server_name]
         
-        # 각 카테고리별로 디렉토리 생성
+        jobs: List[Tuple[Path, str, MCPTool]] = []
         for category_name, category_info in categories.items():
+            category_dir = server_dir / category_name
+            
+            merged = pending.get(category_name)
+            if merged is None:
+                if server_name not in self._archives:
+                    category_dir.mkdir(parents=True, exist_ok=True)
+                print(f"  📂 {category_name}/")
+                merged = pending[category_name] = CategoryInfo(
+                    name=category_info.name,
+                    description=category_info.description,
+                    keywords=category_info.keywords
+                )
+            
+            jobs.extend((category_dir, category_name, tool) for tool in category_info.tools)
+            merged.tools.extend(category_info.tools)
+        
+        # 각 도구를 TypeScript 파일로 생성
+        self._generate_tool_files(server_name, jobs)
+    
+    def finish_server(self, server_name: str) -> Dict[str, CategoryInfo]:
+        """add_tools()로 모은 카테고리의 README와 metadata.json 생성 후 게시"""
+        if server_name not in self._pending:
+            self._begin(server_name)
+            print(f"\n📁 {server_name} 디렉토리 구조 생성 중...")
+        categories = self._pending.pop(server_name, {})
+        server_dir = self._server_dirs[server_name]
+        
+        for category_info in categories.values():
+            category_dir = server_dir / category_info.name
+            
+            # 카테고리 README 생성
+            self._generate_category_readme(server_name, category_dir, category_info)
+            
+            # 카테고리 metadata.json 생성
+            self._generate_category_metadata(server_name, category_dir, category_info)
+        
+        # 서버 루트 README 생성
+        self._generate_server_readme(server_dir, server_name, categories)
+        
+        # metadata.json 생성
+        self._generate_server_metadata(server_dir, server_name, categories)
+        
+        # 스냅샷 조각 생성
+        self._write(server_name, server_dir / FRAGMENT_FILENAME, encode_fragment(categories))
+        
+        # 이번에 생성되지 않은 이전 파일 삭제 후 게시
+        manifest = self._publish(server_name)
+        
+        print(f"  ✅ {server_name} 완료 ({manifest.summary()})")
+        return categories
+    
+    def discard_server(self, server_name: str):
+        """스트리밍 생성 취소 (게시된 이전 결과는 그대로 유지)"""
+        self._pending.pop(server_name, None)
+        self._manifests.pop(server_name, None)
+        
+        archive = self._archives.pop(server_name, None)
+        if archive is not None:
+            self._server_dirs.pop(server_name, None)
+            archive.discard()
+            return
+        
+        staged = self._server_dirs.pop(server_name, None)
+        if staged is not None:
+            self._writer.flush()
+            self.store.discard(staged)
+    
+    def _begin(self, server_name: str, skip: Iterable[str] = ()) -> Path:
+        """
+        현재 결과를 복사한 스테이징 디렉토리를 만들고 이전 매니페스트 로드
+        
+        skip의 최상위 항목(다시 생성할 카테고리)은 복사하지 않습니다.
+        """
+        if self.output_format == "archive":
+            # 압축 파일은 매번 새로 만들므로 이전 매니페스트는 쓰지 않음 (경로 계산용)
+            server_dir = self._server_dirs[server_name] = self.output_dir / server_name
+            self._archives[server_name] = ServerArchiveWriter(self.output_dir, server_name)
+            self._manifests[server_name] = OutputManifest(server_dir)
+            return server_dir
+        
+        server_dir = self._server_dirs[server_name] = self.store.stage(server_name, skip)
+        self._manifests[server_name] = OutputManifest.load(server_dir)
+        return server_dir
+    
+    def _publish(self, server_name: str) -> OutputManifest:
+        """남은 파일 쓰기를 마치고 이전 파일 정리, 매니페스트 저장 후 게시"""
+        archive = self._archives.pop(server_name, None)
+        if archive is not None:
+            self._server_dirs.pop(server_name)
+            archive.commit()
+            self._catalog_changed()
+            return self._manifests.pop(server_name)
+        
+        self._writer.flush()
+        manifest = self._manifests.pop(server_name)
+        manifest.prune()
+        manifest.save()
+        self.store.publish(server_name, self._server_dirs.pop(server_name))
+        
+        # 이전에 archive 형식으로 게시한 결과가 있으면 트리가 가려지지 않도록 삭제
+        archive_path(self.output_dir, server_name).unlink(missing_ok=True)
+        self._catalog_changed()
+        return manifest
+    
+    @contextmanager
+    def catalog_batch(self):
+        """
+        블록 안에서 게시한 서버들을 블록이 끝날 때 카탈로그에 한 번만 반영
+        
+        카탈로그 파일은 서버 하나만 바뀌어도 전체를 다시 쓰므로 generate 실행 전체나
+        감시 모드의 갱신 묶음을 감쌉니다. 중첩하면 가장 바깥 블록이 끝날 때 반영하고,
+        그 전에 반영하려면 flush_catalog()를 호출합니다.
+        """
+        self._catalog_batches += 1
+        try:
+            yield
+        finally:
+            self._catalog_batches -= 1
+            if not self._catalog_batches:
+                self.flush_catalog()
+    
+    def flush_catalog(self):
+        """아직 카탈로그에 반영하지 않은 게시가 있으면 카탈로그 갱신"""
+        if self._catalog_stale:
+            self._catalog_stale = False
+            self._write_catalog()
+    
+    def _catalog_changed(self):
+        """서버를 게시한 뒤 카탈로그 갱신 (catalog_batch() 안이면 블록이 끝날 때)"""
+        self._catalog_stale = True
+        if not self._catalog_batches:
+            self.flush_catalog()
+    
+    def _write_catalog(self):
+        """게시된 서버들로 catalog.snapshot (및 catalog.db, catalog.bin) 갱신"""
+        self._snapshot.write()
+        if self._catalog_db is not None:
+            self._catalog_db.write(self._snapshot.published)
+        if self._catalog_bin is not None:
+            self._catalog_bin.write(self._snapshot.published)
+    
+    def rollback(self, server_name: str, steps: int = 1) -> str:
+        """게시된 이전 생성 결과로 되돌리고 세대 번호 반환"""
+        generation = self.store.rollback(server_name, steps)
+        archive_path(self.output_dir, server_name).unlink(missing_ok=True)
+        self._catalog_changed()
+        return generation
+    
+    def _timestamp(self) -> Optional[str]:
+        """템플릿에 넣을 생성 시각 (결정적 모드면 None)"""
+        return None if self.deterministic else _TIMESTAMP_MARK
+    
+    def _write(
+        self,
+        server_name: str,
+        path: Path,
+        content: Union[str, bytes],
+        time_format: Optional[str] = None
+    ):
+        """
+        내용이 이전 생성 결과와 다를 때만 파일 쓰기
+        
+        해시는 타임스탬프 자리 표시자가 들어간 내용으로 계산하므로 생성 시각만
+        다른 파일은 다시 쓰지 않습니다. 쓸 때 자리 표시자를 현재 시각으로 바꿉니다
+        (time_format이 없으면 ISO 형식). bytes 내용은 그대로 씁니다.
+        
+        Returns:
+            파일 쓰기를 요청했으면 True (실제 쓰기는 쓰기 스레드에서 처리)
+        """
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+        if not self._manifests[server_name].record(path, data):
+            return False
+        
+        if isinstance(content, str) and _TIMESTAMP_MARK in content:
+            now = datetime.now()
+            stamp = now.strftime(time_format) if time_format else now.isoformat()
+            data = content.replace(_TIMESTAMP_MARK, stamp).encode('utf-8')
+        
+        archive = self._archives.get(server_name)
+        if archive is not None:
+            archive.write(path.relative_to(self._server_dirs[server_name]).as_posix(), data)
+        else:
+            self._writer.write(path, data)
+        return True
+    
+    def update_categories(
+        self,
+        server_name: str,
+        categories: Dict[str, CategoryInfo],
+        changed_categories: Set[str]
+    ):
+        """변경된 카테고리만 다시 생성 (나머지 카테고리의 파일은 건드리지 않음)"""
+        if self.output_format == "archive":
+            # 압축 파일은 부분 갱신할 수 없으므로 서버 전체를 다시 만듦
+            self.generate_server_structure(server_name, categories)
+            return
+        
+        # 변경된 카테고리는 스테이징에 복사하지 않고 새로 생성 (삭제되었거나 다른
+        # 카테고리로 옮겨간 도구 파일은 처음부터 없음)
+        server_dir = self._begin(server_name, skip=changed_categories)
+        
+        print(f"\n📁 {server_name} 변경된 카테고리 갱신 중...")
+        
+        for category_name in sorted(changed_categories):
+            if category_name not in categories:
+                # 도구가 모두 사라진 카테고리
+                print(f"  🗑  {category_name}/")
+                continue
+            
             self._generate_category_dir(
                 server_dir,
                 server_name,
                 category_name,
-                category_info
+                categories[category_name]
             )
         
-        # 서버 루트 README 생성
+        # 서버 README와 metadata.json은 통계가 바뀌므로 다시 생성
         self._generate_server_readme(server_dir, server_name, categories)
-        
-        # metadata.json 생성
         self._generate_server_metadata(server_dir, server_name, categories)
+        self._write(server_name, server_dir / FRAGMENT_FILENAME, encode_fragment(categories))
+        
+        # 변경되지 않은 카테고리의 파일은 매니페스트에 그대로 유지
+        manifest = self._manifests[server_name]
+        manifest.keep(lambda path: '/' in path and path.split('/', 1)[0] not in changed_categories)
+        self._publish(server_name)
         
-        print(f"  ✅ {server_name} 완료")
+        print(f"  ✅ {server_name} 갱신 완료 ({manifest.summary()})")
     
     def _generate_category_dir(
         self,
@@ -79,89 +465,94 @@ class FileGenerator:
         print(f"  📂 {category_name}/")
         
         # 각 도구를 TypeScript 파일로 생성
-        for tool in category_info.tools:
-            self._generate_tool_file(
-                category_dir,
-                server_name,
-                category_name,
-                tool
-            )
+        self._generate_tool_files(
+            server_name,
+            [(category_dir, category_name, tool) for tool in category_info.tools]
+        )
         
         # 카테고리 README 생성
         self._generate_category_readme(
+            server_name,
             category_dir,
             category_info
         )
         
         # 카테고리 metadata.json 생성
         self._generate_category_metadata(
+            server_name,
             category_dir,
             category_info
         )
     
-    def _generate_tool_file(
-        self,
-        category_dir: Path,
-        server_name: str,
-        category_name: str,
-        tool: MCPTool
-    ):
-        """개별 도구 TypeScript 파일 생성"""
-        template = self.env.get_template('tool_wrapper.ts.j2')
+    def _generate_tool_files(self, server_name: str, jobs: List[Tuple[Path, str, MCPTool]]):
+        """(카테고리 디렉토리, 카테고리 이름, 도구) 목록의 TypeScript 파일 생성"""
+        if self.workers > 1 and len(jobs) >= self.parallel_threshold:
+            contents = self._render_parallel(server_name, jobs)
+        else:
+            contents = (
+                self._render_tool_file(server_name, category_name, tool)
+                for _, category_name, tool in jobs
+            )
         
-        simple_name = tool.get_simple_name()
-        file_path = category_dir / f"{simple_name}.ts"
+        for (category_dir, _, tool), content in zip(jobs, contents):
+            self._write(server_name, category_dir / f"{tool.get_simple_name()}.ts", content)
+    
+    def _render_parallel(self, server_name: str, jobs: List[Tuple[Path, str, MCPTool]]):
+        """
+        도구를 연속된 구간으로 나눠 프로세스 풀에서 렌더링
         
-        # 예시 사용법 생성
-        example_usage = self._generate_example_usage(
-            simple_name,
-            tool
-        )
+        워커에는 도구와 카테고리 이름만 보내고 렌더링된 내용만 돌려받습니다.
+        구간 순서대로 결과를 내보내므로 직렬 렌더링과 순서가 같고, 앞 구간의
+        내용을 쓰는 동안 뒤 구간을 렌더링합니다.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(str(TEMPLATE_DIR),)
+            )
         
-        content = template.render(
-            tool=tool,
-            server_name=server_name,
-            category_name=category_name,
-            function_name=simple_name,
-            input_schema=tool.input_schema,
-            example_usage=example_usage
-        )
+        # 워커 간 부하 편차를 줄이도록 워커 수보다 잘게 나눔
+        shard_size = -(-len(jobs) // (self.workers * 4))
+        shards = [
+            [(server_name, category_name, tool) for _, category_name, tool in jobs[start:start + shard_size]]
+            for start in range(0, len(jobs), shard_size)
+        ]
         
-        file_path.write_text(content)
-        print(f"    ✓ {simple_name}.ts")
+        for shard_contents in self._pool.map(_render_shard, shards):
+            yield from shard_contents
     
-    def _generate_example_usage(self, function_name: str, tool: MCPTool) -> str:
-        """사용 예시 코드 생성"""
-        # 간단한 예시 생성
-        if 'create' in function_name:
-            return f"const result = await {function_name}({{ name: 'Example' }});"
-        elif 'update' in function_name:
-            return f"const result = await {function_name}({{ id: '123', data: {{...}} }});"
-        elif 'read' in function_name or 'get' in function_name:
-            return f"const result = await {function_name}({{ id: '123' }});"
-        elif 'delete' in function_name:
-            return f"await {function_name}({{ id: '123' }});"
-        else:
-            return f"const result = await {function_name}({{...}});"
+    def close(self):
+        """병렬 렌더링용 프로세스 풀과 쓰기 스레드 종료"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._writer.close()
+    
+    def _render_tool_file(self, server_name: str, category_name: str, tool: MCPTool) -> str:
+        """개별 도구 TypeScript 파일 내용"""
+        return _render_tool(self.tool_template, server_name, category_name, tool)
     
     def _generate_category_readme(
         self,
+        server_name: str,
         category_dir: Path,
         category_info: CategoryInfo
     ):
         """카테고리 README 생성"""
-        template = self.env.get_template('category_readme.md.j2')
+        template = self.category_readme_template
         
         content = template.render(
             category=category_info,
-            generation_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            generation_date=self._timestamp()
         )
         
         readme_path = category_dir / "README.md"
-        readme_path.write_text(content)
+        self._write(server_name, readme_path, content, '%Y-%m-%d %H:%M:%S')
     
     def _generate_category_metadata(
         self,
+        server_name: str,
         category_dir: Path,
         category_info: CategoryInfo
     ):
@@ -175,15 +566,18 @@ class FileGenerator:
                 {
                     "name": tool.get_simple_name(),
                     "full_name": tool.name,
-                    "description": tool.description
+                    "description": tool.description,
+                    "input_schema": tool.input_schema
                 }
                 for tool in category_info.tools
-            ],
-            "generated_at": datetime.now().isoformat()
+            ]
         }
+        generated_at = self._timestamp()
+        if generated_at:
+            metadata["generated_at"] = generated_at
         
         metadata_path = category_dir / "metadata.json"
-        metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
+        self._write(server_name, metadata_path, json.dumps(metadata, indent=2, ensure_ascii=False))
     
     def _generate_server_readme(
         self,
@@ -193,6 +587,7 @@ class FileGenerator:
     ):
         """서버 루트 README 생성"""
         total_tools = sum(len(cat.tools) for cat in categories.values())
+        generation_date = self._timestamp()
         
         content = f"""# {server_name}
 
@@ -202,8 +597,10 @@ MCP 서버의 도구들을 카테고리별로 구조화했습니다.
 
 - **총 카테고리**: {len(categories)}
 - **총 도구**: {total_tools}
-- **생성일**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
+"""
+        if generation_date:
+            content += f"- **생성일**: {generation_date}\n"
+        content += """
 ## 카테고리
 
 """
@@ -248,7 +645,7 @@ await update({ id: account.id, data: { status: 'active' } });
         content += "```\n"
         
         readme_path = server_dir / "README.md"
-        readme_path.write_text(content)
+        self._write(server_name, readme_path, content, '%Y-%m-%d %H:%M:%S')
     
     def _generate_server_metadata(
         self,
@@ -257,9 +654,11 @@ await update({ id: account.id, data: { status: 'active' } });
         categories: Dict[str, CategoryInfo]
     ):
         """서버 메타데이터 생성"""
-        metadata = {
-            "server_name": server_name,
-            "generated_at": datetime.now().isoformat(),
+        metadata = {"server_name": server_name}
+        generated_at = self._timestamp()
+        if generated_at:
+            metadata["generated_at"] = generated_at
+        metadata.update({
             "total_categories": len(categories),
             "total_tools": sum(len(cat.tools) for cat in categories.values()),
             "categories": {
@@ -270,10 +669,10 @@ await update({ id: account.id, data: { status: 'active' } });
                 }
                 for cat_name, cat_info in categories.items()
             }
-        }
+        })
         
         metadata_path = server_dir / "metadata.json"
-        metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
+        self._write(server_name, metadata_path, json.dumps(metadata, indent=2, ensure_ascii=False))
 
 
 def main():
@@ -291,9 +690,10 @@ def main():
         categorizer = ToolCategorizer()
         generator = FileGenerator()
         
-        for server_name, tools in all_tools.items():
-            categories = categorizer.categorize_tools(tools)
-            generator.generate_server_structure(server_name, categories)
+        with generator.catalog_batch():
+            for server_name, tools in all_tools.items():
+                categories = categorizer.categorize_tools(tools)
+                generator.generate_server_structure(server_name, categories)
         
         print("\n✅ 모든 파일 생성 완료!")
         print(f"📂 생성 위치: {generator.output_dir.absolute()}")
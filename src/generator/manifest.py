@@ -0,0 +1,110 @@
+"""생성된 파일의 내용 해시 매니페스트"""
+import json
+import hashlib
+from typing import Dict, Callable, Optional
+from pathlib import Path
+
+
+class OutputManifest:
+    """
+    서버 디렉토리에 생성한 파일들의 내용 해시 기록 (<서버>/.manifest.json)
+
+    이전 생성 결과의 해시와 비교해서 내용이 같은 파일은 다시 쓰지 않고,
+    이번 생성에서 기록되지 않은 이전 파일(삭제된 도구 등)은 prune()에서 지웁니다.
+
+    Usage:
+        manifest = OutputManifest.load(server_dir)
+        if manifest.record(path, content):
+            path.write_bytes(content)
+        manifest.prune()
+        manifest.save()
+    """
+
+    FILENAME = ".manifest.json"
+
+    def __init__(self, server_dir: Path, previous: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            server_dir: 서버 출력 디렉토리
+            previous: 이전 생성 결과 {상대 경로: 해시}
+        """
+        self.server_dir = server_dir
+        self.previous: Dict[str, str] = previous or {}
+        self.current: Dict[str, str] = {}
+
+        self.written = 0
+        self.unchanged = 0
+        self.deleted = 0
+
+    @classmethod
+    def load(cls, server_dir: Path) -> 'OutputManifest':
+        """서버 디렉토리의 매니페스트 로드 (없거나 손상되었으면 빈 매니페스트)"""
+        try:
+            data = json.loads((server_dir / cls.FILENAME).read_text(encoding='utf-8'))
+            previous = data["files"]
+        except (OSError, ValueError, KeyError):
+            previous = {}
+        return cls(server_dir, previous)
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """내용 해시"""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.server_dir).as_posix()
+
+    def record(self, path: Path, content: bytes) -> bool:
+        """
+        이번 생성 결과에 파일 기록
+
+        Args:
+            path: 파일 경로
+            content: 해시를 계산할 내용 (타임스탬프 제외)
+
+        Returns:
+            파일을 새로 써야 하면 True (이전과 내용이 같고 파일이 있으면 False)
+        """
+        relative = self._relative(path)
+        digest = self.digest(content)
+        self.current[relative] = digest
+
+        if self.previous.get(relative) == digest and path.exists():
+            self.unchanged += 1
+            return False
+
+        self.written += 1
+        return True
+
+    def keep(self, predicate: Callable[[str], bool]):
+        """다시 생성하지 않는 이전 파일 중 predicate(상대 경로)가 참인 항목 유지"""
+        for relative, digest in self.previous.items():
+            if relative not in self.current and predicate(relative):
+                self.current[relative] = digest
+
+    def prune(self):
+        """이번 생성 결과에 없는 이전 파일과 비게 된 디렉토리 삭제"""
+        for relative in self.previous.keys() - self.current.keys():
+            path = self.server_dir / relative
+            if path.exists():
+                path.unlink()
+                self.deleted += 1
+
+            # 비게 된 상위 디렉토리 정리 (서버 디렉토리는 유지)
+            parent = path.parent
+            while parent != self.server_dir and parent.exists() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+
+    def save(self):
+        """매니페스트 저장"""
+        path = self.server_dir / self.FILENAME
+        tmp_path = path.with_suffix('.tmp')
+        data = {"files": dict(sorted(self.current.items()))}
+        tmp_path.write_text(json.dumps(data, indent=0, ensure_ascii=False), encoding='utf-8')
+        tmp_path.replace(path)
+        self.previous = dict(self.current)
+
+    def summary(self) -> str:
+        """한 줄 요약"""
+        return f"기록 {self.written}개, 변경 없음 {self.unchanged}개, 삭제 {self.deleted}개"
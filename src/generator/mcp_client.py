@@ -1,105 +1,506 @@
 """MCP 서버 연결 및 도구 정보 가져오기"""
+import os
+import sys
 import json
 import asyncio
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import time
+from typing import (
+    TYPE_CHECKING, List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Union
+)
+from dataclasses import dataclass, field, FrozenInstanceError
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from generator.tool_cache import CacheWriter
+
+
+_UNPARSED = object()
+
 
-@dataclass
 class MCPTool:
-    """MCP 도구 정보"""
-    name: str
-    description: str
-    server_name: str
-    input_schema: Optional[Dict[str, Any]] = None
+    """
+    MCP 도구 정보 (불변 레코드)
+    
+    수십만 개 단위로 만들어지므로 __slots__를 사용하고, 이름은 생성 시 한 번만
+    분해해 둡니다. server_name과 카테고리 힌트는 intern하여 도구들이 같은 문자열
+    객체를 공유하며, input_schema는 JSON 바이트(schema_json)로 보관했다가 처음
+    접근할 때 파싱합니다.
+    """
+    
+    __slots__ = (
+        'name',
+        'description',
+        'server_name',
+        'simple_name',
+        'category_hint',
+        'schema_json',
+        '_schema',
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        server_name: str,
+        input_schema: Union[Dict[str, Any], bytes, str, None] = None
+    ):
+        """
+        Args:
+            name: 전체 도구 이름 (예: salesforce__account__create)
+            description: 도구 설명
+            server_name: 서버 이름
+            input_schema: 입력 스키마 (dict 또는 JSON 문자열/바이트)
+        """
+        parts = name.split('__')
+        
+        if input_schema is None:
+            schema_json = None
+        elif isinstance(input_schema, bytes):
+            schema_json = input_schema
+        elif isinstance(input_schema, str):
+            schema_json = input_schema.encode('utf-8')
+        else:
+            schema_json = json.dumps(
+                input_schema, ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8')
+        
+        init = object.__setattr__
+        init(self, 'name', name)
+        init(self, 'description', description)
+        init(self, 'server_name', sys.intern(server_name))
+        init(self, 'simple_name', parts[-1] if len(parts) > 1 else name)
+        init(self, 'category_hint', sys.intern(parts[1]) if len(parts) >= 3 else None)
+        init(self, 'schema_json', schema_json)
+        init(self, '_schema', _UNPARSED if schema_json is not None else None)
+    
+    @property
+    def input_schema(self) -> Optional[Dict[str, Any]]:
+        """입력 스키마 (처음 접근할 때 파싱)"""
+        schema = self._schema
+        if schema is _UNPARSED:
+            schema = json.loads(self.schema_json)
+            object.__setattr__(self, '_schema', schema)
+        return schema
     
     def get_simple_name(self) -> str:
         """도구 이름에서 마지막 부분 추출"""
-        parts = self.name.split('__')
-        return parts[-1] if len(parts) > 1 else self.name
+        return self.simple_name
     
     def get_category_hint(self) -> Optional[str]:
         """도구 이름에서 카테고리 힌트 추출"""
-        parts = self.name.split('__')
-        if len(parts) >= 3:
-            return parts[1]
-        return None
+        return self.category_hint
+    
+    def __setattr__(self, key, value):
+        raise FrozenInstanceError(f"cannot assign to field '{key}'")
+    
+    def __delattr__(self, key):
+        raise FrozenInstanceError(f"cannot delete field '{key}'")
+    
+    def __reduce__(self):
+        # 프로세스 간 전달 시 파싱된 스키마 대신 원본 바이트만 전송
+        return (MCPTool, (self.name, self.description, self.server_name, self.schema_json))
+    
+    def _key(self):
+        return (self.name, self.description, self.server_name, self.schema_json)
+    
+    def __eq__(self, other):
+        if other.__class__ is not MCPTool:
+            return NotImplemented
+        return self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __repr__(self):
+        return (f"MCPTool(name={self.name!r}, description={self.description!r}, "
+                f"server_name={self.server_name!r}, input_schema={self.input_schema!r})")
+
+
+@dataclass
+class ToolChunk:
+    """스트리밍 조회 단위 (서버 하나의 도구 일부)"""
+    server_name: str
+    tools: List[MCPTool] = field(default_factory=list)
+    done: bool = False      # 서버의 마지막 청크
+    failed: bool = False    # 조회 실패 (이미 받은 청크도 버려야 함)
 
 
 class MCPClient:
     """MCP 서버 연결 및 도구 조회"""
     
-    def __init__(self, config_path: str = "config/mcp_servers.json"):
+    DEFAULT_MAX_CONCURRENCY = 8
+    DEFAULT_TIMEOUT = 30.0
+    DEFAULT_CACHE_DIR = ".cache/tools"
+    DEFAULT_CACHE_TTL = 86400.0
+    
+    def __init__(
+        self,
+        config_path: str = "config/mcp_servers.json",
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        refresh: bool = False,
+        chunk_size: int = 500
+    ):
+        """
+        Args:
+            config_path: MCP 서버 설정 파일 경로
+            max_concurrency: 동시에 연결할 최대 서버 수 (기본값: 설정 파일 또는 8)
+            timeout: 서버별 도구 조회 제한 시간(초) (기본값: 설정 파일 또는 30)
+            cache_ttl: 도구 목록 캐시 유효 시간(초) (기본값: 설정 파일 또는 1일)
+            refresh: True면 캐시를 무시하고 모든 서버를 다시 조회
+            chunk_size: Mock/캐시 도구 목록을 스트리밍할 때의 청크 크기
+        """
+        from generator.tool_cache import ToolCatalogCache
+        
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        
+        discovery = self.config.get("discovery", {})
+        self.max_concurrency = max(1, int(
+            max_concurrency or discovery.get("max_concurrency", self.DEFAULT_MAX_CONCURRENCY)
+        ))
+        self.timeout = float(timeout or discovery.get("timeout", self.DEFAULT_TIMEOUT))
+        self.chunk_size = chunk_size
+        
+        # 도구 목록 캐시
+        cache_config = self.config.get("cache", {})
+        self.cache_enabled = cache_config.get("enabled", True)
+        self.refresh = refresh
+        self.cache = ToolCatalogCache(
+            cache_config.get("dir", self.DEFAULT_CACHE_DIR),
+            ttl=float(cache_ttl if cache_ttl is not None
+                      else cache_config.get("ttl", self.DEFAULT_CACHE_TTL))
+        )
     
     def _load_config(self) -> Dict[str, Any]:
         """설정 파일 로드"""
         with open(self.config_path) as f:
             return json.load(f)
     
-    async def get_all_tools(self) -> Dict[str, List[MCPTool]]:
-        """모든 MCP 서버의 도구 가져오기"""
-        all_tools = {}
+    def invalidate_cache(self, server_names: Optional[List[str]] = None) -> int:
+        """서버별 도구 목록 캐시 삭제 (None이면 전체)"""
+        return self.cache.invalidate(server_names)
+    
+    def server_configs(self, server_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """선택된 실제 서버 설정 목록 (설정 순서 유지)"""
+        servers = {server["name"]: server for server in self.config.get("servers", [])}
+        return [servers[name] for name in self._select(list(servers), server_names)]
+    
+    def _select(self, names: List[str], server_names: Optional[List[str]]) -> List[str]:
+        """조회할 서버 선택 (설정 순서 유지)"""
+        if not server_names:
+            return names
+        
+        for name in server_names:
+            if name not in names:
+                print(f"  X {name}: 설정에 없는 서버")
+        
+        wanted = set(server_names)
+        return [name for name in names if name in wanted]
+    
+    async def get_all_tools(
+        self,
+        server_names: Optional[List[str]] = None
+    ) -> Dict[str, List[MCPTool]]:
+        """
+        MCP 서버의 도구 가져오기
+        
+        stream_tools()의 결과를 서버별 목록으로 모읍니다. 실패하거나 시간 초과된
+        서버는 빠지고, 응답한 서버의 결과만 설정 순서대로 반환합니다.
+        
+        Args:
+            server_names: 조회할 서버 이름 목록 (None이면 전체)
+        """
+        collected: Dict[str, List[MCPTool]] = {}
+        finished = set()
+        
+        async for chunk in self.stream_tools(server_names):
+            if chunk.failed:
+                collected.pop(chunk.server_name, None)
+                continue
+            collected.setdefault(chunk.server_name, []).extend(chunk.tools)
+            if chunk.done:
+                finished.add(chunk.server_name)
+        
+        return {name: tools for name, tools in collected.items() if name in finished}
+    
+    async def stream_tools(
+        self,
+        server_names: Optional[List[str]] = None
+    ) -> AsyncIterator[ToolChunk]:
+        """
+        MCP 서버의 도구를 청크 단위로 스트리밍
+        
+        서버들은 max_concurrency 개까지 동시에 조회하고, 각 서버는 tools/list의
+        cursor를 따라가며 페이지마다 ToolChunk를 보냅니다. 서버마다 마지막에
+        done 또는 failed 청크가 하나씩 옵니다. 큐 크기가 제한되어 있어 소비자가
+        느리면 조회도 멈추므로 스트림이 쌓아 두는 양은 서버 전체 목록 크기와
+        무관합니다. 다만 FileGenerator는 README, metadata.json, 스냅샷을 만들기 위해
+        finish_server()까지 서버의 도구 레코드를 보관하므로, 서버 하나를 생성하는
+        동안의 메모리 사용량은 그 서버의 도구 수에 비례합니다.
+        
+        Args:
+            server_names: 조회할 서버 이름 목록 (None이면 전체)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
         
         # Mock 모드인 경우
         if self.config.get("mock_mode", False):
             print("Mock 모드로 실행 중...")
             mock_servers = self.config.get("mock_servers", {})
-
-            for server_name, server_data in mock_servers.items():
-                tools = []
-                for tool_data in server_data.get("tools", []):
-                    tools.append(MCPTool(
-                        name=tool_data["name"],
-                        description=tool_data["description"],
-                        server_name=server_name
-                    ))
-                all_tools[server_name] = tools
-                print(f"  OK {server_name}: {len(tools)}개 도구")
-
+            producers = [
+                self._produce_mock(server_name, mock_servers[server_name], queue)
+                for server_name in self._select(list(mock_servers), server_names)
+            ]
         else:
-            # 실제 MCP 서버 연결 (TODO: 실제 MCP SDK 사용)
-            print("실제 MCP 서버에 연결 중...")
-            for server in self.config.get("servers", []):
+            # 실제 MCP 서버 연결 (선택된 서버만, 동시 실행)
+            selected = self.server_configs(server_names)
+            
+            print(f"실제 MCP 서버에 연결 중... "
+                  f"({len(selected)}개, 동시 {self.max_concurrency}개, 제한 {self.timeout:g}초)")
+            
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            producers = [
+                self._produce_server(server, semaphore, queue)
+                for server in selected
+            ]
+        
+        tasks = [asyncio.create_task(producer) for producer in producers]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                chunk = await queue.get()
+                if chunk.done or chunk.failed:
+                    remaining -= 1
+                yield chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _produce_mock(self, server_name: str, server_data: Dict, queue: asyncio.Queue):
+        """Mock 서버 도구를 청크 단위로 전달"""
+        tool_data = server_data.get("tools", [])
+        
+        for start in range(0, len(tool_data), self.chunk_size):
+            await queue.put(ToolChunk(server_name, [
+                MCPTool(
+                    name=data["name"],
+                    description=data["description"],
+                    server_name=server_name
+                )
+                for data in tool_data[start:start + self.chunk_size]
+            ]))
+        
+        print(f"  OK {server_name}: {len(tool_data)}개 도구")
+        await queue.put(ToolChunk(server_name, done=True))
+    
+    async def _produce_server(
+        self,
+        server_config: Dict,
+        semaphore: asyncio.Semaphore,
+        queue: asyncio.Queue
+    ):
+        """서버 하나의 도구를 청크 단위로 전달 (실패/시간 초과 시 failed 청크)"""
+        name = server_config["name"]
+        
+        # 캐시에 있으면 서버를 시작하지 않음
+        if self.cache_enabled and not self.refresh:
+            chunks = self.cache.iter_chunks(server_config, self.chunk_size)
+            if chunks is not None:
+                count = 0
+                for tools in chunks:
+                    count += len(tools)
+                    await queue.put(ToolChunk(name, tools))
+                print(f"  OK {name}: {count}개 도구 (캐시)")
+                await queue.put(ToolChunk(name, done=True))
+                return
+        
+        async with semaphore:
+            try:
+                count = await self._stream_server(server_config, queue)
+            except asyncio.TimeoutError:
+                print(f"  X {name}: 시간 초과 ({self.timeout:g}초)")
+                await queue.put(ToolChunk(name, failed=True))
+                return
+            except Exception as e:
+                print(f"  X {name}: 연결 실패 - {e}")
+                await queue.put(ToolChunk(name, failed=True))
+                return
+        
+        print(f"  OK {name}: {count}개 도구")
+        await queue.put(ToolChunk(name, done=True))
+    
+    async def _stream_server(self, server_config: Dict, queue: asyncio.Queue) -> int:
+        """
+        서버에 연결하여 tools/list 페이지를 차례로 큐에 전달하고 도구 수 반환
+        
+        제한 시간은 서버 응답을 기다린 시간에만 적용되며, 소비자가 느려서
+        큐에서 기다린 시간은 포함하지 않습니다.
+        """
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+        
+        budget = self.timeout
+        
+        async def timed(awaitable):
+            nonlocal budget
+            if budget <= 0:
+                raise asyncio.TimeoutError()
+            started = time.monotonic()
+            try:
+                return await asyncio.wait_for(awaitable, timeout=budget)
+            finally:
+                budget -= time.monotonic() - started
+        
+        count = 0
+        async with stdio_client(self._server_params(server_config)) as (read, write):
+            async with ClientSession(read, write) as session:
+                init_result = await timed(session.initialize())
+                
+                writer = None
+                if self.cache_enabled:
+                    writer = self.cache.writer(server_config, init_result.serverInfo.version)
+                
                 try:
-                    tools = await self._connect_and_list_tools(server)
-                    all_tools[server["name"]] = tools
-                    print(f"  OK {server['name']}: {len(tools)}개 도구")
-                except Exception as e:
-                    print(f"  X {server['name']}: 연결 실패 - {e}")
-        
-        return all_tools
-    
-    async def _connect_and_list_tools(self, server_config: Dict) -> List[MCPTool]:
-        """실제 MCP 서버 연결 및 도구 목록 가져오기"""
-        # TODO: 실제 MCP SDK를 사용한 구현
-        # from mcp import ClientSession, StdioServerParameters
-        # from mcp.client.stdio import stdio_client
-        
-        # server_params = StdioServerParameters(
-        #     command=server_config["command"],
-        #     args=server_config["args"],
-        #     env=server_config.get("env")
-        # )
-        
-        # async with stdio_client(server_params) as (read, write):
-        #     async with ClientSession(read, write) as session:
-        #         await session.initialize()
-        #         tools_result = await session.list_tools()
-        #         return [
-        #             MCPTool(
-        #                 name=tool.name,
-        #                 description=tool.description,
-        #                 server_name=server_config["name"],
-        #                 input_schema=tool.inputSchema
-        #             )
-        #             for tool in tools_result.tools
-        #         ]
-        
-        # 임시로 빈 리스트 반환
-        return []
+                    async for tools in self._iter_session_tools(session, server_config, timed):
+                        if writer:
+                            writer.write(tools)
+                        count += len(tools)
+                        await queue.put(ToolChunk(server_config["name"], tools))
+                except BaseException:
+                    if writer:
+                        writer.abort()
+                    raise
+                
+                if writer:
+                    writer.commit()
+        
+        return count
+    
+    @staticmethod
+    def _resolve_env(server_config: Dict) -> Optional[Dict[str, str]]:
+        """서버 환경 변수 준비 (${VAR} 형식 치환)"""
+        if "env" not in server_config:
+            return None
+        
+        env = os.environ.copy()
+        for key, value in server_config["env"].items():
+            if value.startswith("${") and value.endswith("}"):
+                value = os.environ.get(value[2:-1], "")
+            env[key] = value
+        return env
+    
+    def _server_params(self, server_config: Dict):
+        """stdio 서버 실행 파라미터"""
+        from mcp import StdioServerParameters
+        
+        return StdioServerParameters(
+            command=server_config["command"],
+            args=server_config.get("args", []),
+            env=self._resolve_env(server_config)
+        )
+    
+    async def _iter_session_tools(
+        self,
+        session,
+        server_config: Dict,
+        timed: Optional[Callable[[Awaitable], Awaitable]] = None
+    ) -> AsyncIterator[List[MCPTool]]:
+        """초기화된 세션에서 tools/list cursor를 따라가며 페이지 단위로 도구 조회"""
+        cursor = None
+        while True:
+            request = session.list_tools(cursor=cursor)
+            tools_result = await (timed(request) if timed else request)
+            
+            yield [
+                MCPTool(
+                    name=tool.name,
+                    description=tool.description or "",
+                    server_name=server_config["name"],
+                    input_schema=tool.inputSchema
+                )
+                for tool in tools_result.tools
+            ]
+            
+            cursor = tools_result.nextCursor
+            if not cursor:
+                break
+    
+    async def _list_session_tools(
+        self,
+        session,
+        server_config: Dict,
+        writer: Optional['CacheWriter'] = None
+    ) -> List[MCPTool]:
+        """
+        초기화된 세션에서 전체 도구 목록 조회
+        
+        writer가 있으면 페이지를 받는 대로 캐시에 기록하고 끝나면 교체합니다
+        (조회가 실패하면 기존 캐시 항목 유지). 변경 감지에 전체 목록이 필요하므로
+        반환값은 서버의 도구 전체입니다.
+        """
+        tools = []
+        try:
+            async for page in self._iter_session_tools(session, server_config):
+                if writer:
+                    writer.write(page)
+                tools.extend(page)
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        
+        if writer:
+            writer.commit()
+        return tools
+    
+    async def watch_server(
+        self,
+        server_config: Dict,
+        on_tools: Callable[[List[MCPTool]], Awaitable[None]]
+    ):
+        """
+        서버 연결을 유지하면서 도구 목록 변경 감시
+        
+        연결 직후 한 번, 이후 notifications/tools/list_changed 알림을 받을 때마다
+        도구 목록을 다시 조회하여 on_tools 콜백에 전달합니다. 연결이 끊기면 예외가
+        전파됩니다.
+        """
+        from mcp import ClientSession, types
+        from mcp.client.stdio import stdio_client
+        
+        name = server_config["name"]
+        changed = asyncio.Event()
+        
+        async def handle_message(message):
+            # 수신 루프에서 호출되므로 여기서는 신호만 보냄
+            if (isinstance(message, types.ServerNotification) and
+                    isinstance(message.root, types.ToolListChangedNotification)):
+                changed.set()
+        
+        async with stdio_client(self._server_params(server_config)) as (read, write):
+            async with ClientSession(read, write, message_handler=handle_message) as session:
+                init_result = await session.initialize()
+                server_version = init_result.serverInfo.version
+                
+                tools_capability = init_result.capabilities.tools
+                if not (tools_capability and tools_capability.listChanged):
+                    print(f"  ! {name}: tools/list_changed 알림을 지원하지 않는 서버")
+                
+                while True:
+                    # 조회 중 들어온 알림도 놓치지 않도록 조회 전에 초기화
+                    changed.clear()
+                    tools = await self._list_session_tools(
+                        session,
+                        server_config,
+                        self.cache.writer(server_config, server_version)
+                        if self.cache_enabled else None
+                    )
+                    
+                    await on_tools(tools)
+                    await changed.wait()
 
 
 async def main():
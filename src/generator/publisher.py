@@ -0,0 +1,216 @@
+"""생성된 서버 디렉토리의 세대 관리 및 원자적 게시"""
+import os
+import shutil
+from typing import List, Optional, Set, Iterable
+from pathlib import Path
+
+
+def _link_or_copy(src: str, dst: str):
+    """하드 링크로 복사 (지원하지 않는 파일 시스템이면 일반 복사)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class GenerationStore:
+    """
+    서버별 생성 결과를 세대(generation) 디렉토리로 만들고 원자적으로 교체
+
+    새 세대는 현재 세대를 하드 링크로 복사한 스테이징 디렉토리에서 만들고,
+    완성되면 서버 경로의 심볼릭 링크를 새 세대로 바꿔 게시합니다(rename이므로
+    원자적). 읽는 쪽은 항상 완성된 세대 하나만 보게 되고, 이전 세대는 keep개까지
+    남겨 두어 rollback()으로 즉시 되돌릴 수 있습니다. 일부만 다시 생성할 때는
+    다시 만들 하위 디렉토리를 복사하지 않고, 중단된 생성이 남긴 스테이징
+    디렉토리는 다음 stage()에서 지웁니다 (서버마다 생성하는 프로세스는 하나).
+
+    심볼릭 링크를 만들 수 없는 환경(권한 없는 Windows 등)에서는 디렉토리 이름을
+    바꿔 교체하며, 이 경우 교체하는 짧은 순간에는 서버 경로가 없을 수 있습니다.
+
+    구조:
+        output/servers/
+        ├── .generations/<서버>/<세대 번호>/
+        └── <서버> -> .generations/<서버>/<세대 번호>
+
+    Usage:
+        store = GenerationStore(Path('output/servers'), keep=3)
+        staged = store.stage('github')
+        ...  # staged 디렉토리에 생성
+        store.publish('github', staged)
+    """
+
+    GENERATIONS_DIR = ".generations"
+    STAGING_SUFFIX = ".staging"
+
+    # 이름 변경 방식으로 게시한 디렉토리의 세대 번호 기록 파일
+    MARKER = ".generation"
+
+    def __init__(self, output_dir: Path, keep: int = 3):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            keep: 현재 세대 외에 남겨 둘 이전 세대 수
+        """
+        self.output_dir = output_dir
+        self.keep = keep
+
+        # 이 저장소가 만들고 아직 게시/삭제하지 않은 스테이징 디렉토리
+        self._staging: Set[Path] = set()
+
+    def _root(self, server_name: str) -> Path:
+        """서버의 세대 디렉토리"""
+        return self.output_dir / self.GENERATIONS_DIR / server_name
+
+    def current_name(self, server_name: str) -> Optional[str]:
+        """현재 게시된 세대 번호 (세대로 관리되지 않는 디렉토리면 None)"""
+        path = self.output_dir / server_name
+        if path.is_symlink():
+            return Path(os.readlink(path)).name
+        try:
+            return (path / self.MARKER).read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+
+    def generations(self, server_name: str) -> List[str]:
+        """게시된 적 있는 세대 번호 목록 (오래된 순)"""
+        names = set()
+        root = self._root(server_name)
+        if root.exists():
+            names.update(
+                path.name for path in root.iterdir()
+                if path.is_dir() and path.name.isdigit()
+            )
+
+        current = self.current_name(server_name)
+        if current is not None:
+            names.add(current)
+        return sorted(names, key=int)
+
+    def _next_number(self, server_name: str) -> int:
+        """다음 세대 번호"""
+        numbers = [int(name) for name in self.generations(server_name)]
+        root = self._root(server_name)
+        if root.exists():
+            numbers.extend(
+                int(path.name[:-len(self.STAGING_SUFFIX)])
+                for path in root.glob(f"*{self.STAGING_SUFFIX}")
+            )
+        return max(numbers, default=0) + 1
+
+    def stage(self, server_name: str, skip: Iterable[str] = ()) -> Path:
+        """
+        현재 세대를 하드 링크로 복사한 스테이징 디렉토리 생성
+
+        Args:
+            server_name: 서버 이름
+            skip: 복사하지 않을 최상위 항목 이름 (호출한 쪽이 다시 생성하는 카테고리)
+        """
+        root = self._root(server_name)
+        root.mkdir(parents=True, exist_ok=True)
+        self._remove_stale(server_name)
+
+        current = self.output_dir / server_name
+        if current.exists() and not current.is_symlink() and self.current_name(server_name) is None:
+            self._adopt(server_name)
+
+        staged = root / f"{self._next_number(server_name):06d}{self.STAGING_SUFFIX}"
+        if current.exists():
+            skip = set(skip)
+            shutil.copytree(
+                current, staged, symlinks=True, copy_function=_link_or_copy,
+                ignore=lambda directory, names: (
+                    skip.intersection(names) if Path(directory) == current else ()
+                )
+            )
+        else:
+            staged.mkdir()
+        self._staging.add(staged)
+        return staged
+
+    def _remove_stale(self, server_name: str):
+        """중단된 생성이 남긴 스테이징 디렉토리 삭제 (이 저장소가 사용 중인 것은 제외)"""
+        for path in self._root(server_name).glob(f"*{self.STAGING_SUFFIX}"):
+            if path not in self._staging:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _adopt(self, server_name: str):
+        """세대 관리 이전에 생성된 서버 디렉토리를 첫 세대로 등록"""
+        current = self.output_dir / server_name
+        generation = self._root(server_name) / f"{self._next_number(server_name):06d}"
+        current.rename(generation)
+        self._activate(server_name, generation)
+
+    def publish(self, server_name: str, staged: Path) -> str:
+        """스테이징 디렉토리를 새 세대로 게시하고 세대 번호 반환"""
+        generation = staged.with_name(staged.name[:-len(self.STAGING_SUFFIX)])
+        staged.rename(generation)
+        self._staging.discard(staged)
+        self._activate(server_name, generation)
+        self._prune(server_name)
+        return generation.name
+
+    def discard(self, staged: Path):
+        """게시하지 않을 스테이징 디렉토리 삭제"""
+        self._staging.discard(staged)
+        shutil.rmtree(staged, ignore_errors=True)
+
+    def rollback(self, server_name: str, steps: int = 1) -> str:
+        """현재 세대보다 steps만큼 이전 세대로 되돌리고 세대 번호 반환"""
+        names = self.generations(server_name)
+        current = self.current_name(server_name)
+        if current not in names:
+            raise ValueError(f"세대로 관리되는 서버가 아닙니다: {server_name}")
+
+        index = names.index(current) - steps
+        if index < 0:
+            raise ValueError(f"되돌릴 이전 세대가 없습니다: {server_name} (현재 {current})")
+
+        self._activate(server_name, self._root(server_name) / names[index])
+        return names[index]
+
+    def _activate(self, server_name: str, generation: Path):
+        """서버 경로가 generation을 가리키도록 교체"""
+        path = self.output_dir / server_name
+        tmp_link = self.output_dir / f".{server_name}.swap"
+
+        try:
+            if tmp_link.is_symlink():
+                tmp_link.unlink()
+            os.symlink(
+                generation.relative_to(self.output_dir),
+                tmp_link,
+                target_is_directory=True
+            )
+        except OSError:
+            self._activate_by_rename(server_name, generation)
+            return
+
+        if path.exists() and not path.is_symlink():
+            # 이름 변경 방식으로 게시된 디렉토리는 세대 디렉토리로 되돌려 놓음
+            self._store_current(server_name)
+        os.replace(tmp_link, path)
+
+    def _store_current(self, server_name: str):
+        """서버 경로의 실제 디렉토리를 세대 디렉토리로 이동"""
+        path = self.output_dir / server_name
+        name = self.current_name(server_name) or f"{self._next_number(server_name):06d}"
+        (path / self.MARKER).unlink(missing_ok=True)
+        path.rename(self._root(server_name) / name)
+
+    def _activate_by_rename(self, server_name: str, generation: Path):
+        """심볼릭 링크 없이 디렉토리 이름 변경으로 교체"""
+        path = self.output_dir / server_name
+        name = generation.name
+
+        if path.exists():
+            self._store_current(server_name)
+        generation.rename(path)
+        (path / self.MARKER).write_text(name, encoding='utf-8')
+
+    def _prune(self, server_name: str):
+        """현재 세대와 최근 keep개 세대를 제외한 세대 삭제"""
+        current = self.current_name(server_name)
+        previous = [name for name in self.generations(server_name) if name != current]
+
+        for name in previous[:max(len(previous) - self.keep, 0)]:
+            shutil.rmtree(self._root(server_name) / name, ignore_errors=True)
@@ -0,0 +1,270 @@
+"""카테고리 규칙 컴파일 및 단일 패스 매칭"""
+import re
+import warnings
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick 다중 키워드 매칭 오토마톤
+
+    각 키워드에 우선순위(규칙 인덱스, 작을수록 우선)를 붙여 두고, 텍스트를 한 번
+    훑으면서 등장한 키워드들 중 가장 우선순위가 높은 값을 찾습니다. 키워드 수와
+    무관하게 텍스트 길이에 비례하는 시간이 걸립니다.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        """
+        Args:
+            keywords: (키워드, 우선순위) 목록
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[int]] = [None]
+
+        # 빈 키워드는 모든 텍스트에 포함됨
+        self._always: Optional[int] = None
+
+        for keyword, priority in keywords:
+            if not keyword:
+                self._always = self._min(self._always, priority)
+                continue
+            self._insert(keyword, priority)
+
+        self._build_failure_links()
+
+    @staticmethod
+    def _min(a: Optional[int], b: Optional[int]) -> Optional[int]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return min(a, b)
+
+    def _insert(self, keyword: str, priority: int):
+        """트라이에 키워드 추가"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            state = next_state
+        self._best[state] = self._min(self._best[state], priority)
+
+    def _build_failure_links(self):
+        """
+        BFS로 실패 링크를 만들고 결정적 전이표로 펼침
+
+        각 상태의 전이표에 실패 링크를 따라가서 얻는 전이를 미리 합쳐 두어, 매칭할 때
+        문자당 사전 조회 한 번으로 다음 상태가 정해지게 합니다. 실패 링크로 도달하는
+        키워드의 우선순위도 상태마다 합쳐 둡니다.
+        """
+        goto = self._goto
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+
+                # 부모의 실패 상태는 이미 전이표가 완성되어 있음 (BFS 순서)
+                fail_state = delta[self._fail[state]].get(char, 0) if state else 0
+                self._fail[next_state] = fail_state
+                self._best[next_state] = self._min(
+                    self._best[next_state],
+                    self._best[fail_state]
+                )
+
+            transitions = dict(delta[self._fail[state]]) if state else {}
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self._delta = delta
+
+    def best_match(self, text: str) -> Optional[int]:
+        """텍스트에 포함된 키워드 중 가장 높은 우선순위(가장 작은 값) 반환"""
+        best = self._always
+        if best == 0:
+            return best
+
+        delta, best_at = self._delta, self._best
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+
+            found = best_at[state]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best == 0:
+                    break
+
+        return best
+
+
+def _without_captures(pattern: str) -> str:
+    """
+    정규식의 캡처 그룹 '(...)'을 비캡처 그룹 '(?:...)'으로 변환
+
+    그룹이 많은 정규식은 매칭 시도마다 그룹 위치를 초기화하느라 느려지고, 이름 있는
+    그룹은 규칙끼리 이름이 겹칠 수 있으므로 규칙을 합치기 전에 캡처 그룹을 없앱니다.
+    역참조를 쓰는 패턴은 합치지 않으므로 여기로 오지 않습니다.
+    """
+    out = []
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # '[]...]', '[^]...]'의 첫 ']'는 문자 그대로
+            prefix = '[^]' if pattern.startswith('[^]', i) else '[]' if pattern.startswith('[]', i) else None
+            if prefix:
+                out.append(prefix)
+                i += len(prefix)
+                continue
+        elif char == '(' and pattern.startswith('?P<', i + 1):
+            # 이름 있는 그룹은 규칙을 합치면 이름이 겹칠 수 있음
+            out.append('(?:')
+            i = pattern.index('>', i) + 1
+            continue
+        elif char == '(' and not pattern.startswith('?', i + 1):
+            out.append('(?:')
+            i += 1
+            continue
+
+        out.append(char)
+        i += 1
+
+    return ''.join(out)
+
+
+# 합친 정규식 안에 넣으면 의미가 바뀌는 구문: 역참조, 조건 그룹 (그룹 번호가 밀림),
+# 범위 없는 인라인 플래그 '(?i)' (패턴 중간에서는 오류이거나 다른 규칙까지 적용됨)
+_STANDALONE_SYNTAX = re.compile(r'\\\d|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)')
+
+
+def _combinable(pattern: str) -> bool:
+    """다른 규칙과 하나의 정규식으로 합쳐도 같은 의미로 매칭되는 패턴인지"""
+    if _STANDALONE_SYNTAX.search(pattern):
+        return False
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            re.compile(f"(?:{pattern})|(?:)")
+    except (re.error, DeprecationWarning, FutureWarning):
+        return False
+    return True
+
+
+class CompiledRules:
+    """
+    categories.json 규칙을 한 번 컴파일한 매처
+
+    도구 이름 패턴은 캡처 그룹 없이 하나의 정규식으로 합쳐 한 번의 검색으로
+    매칭 여부를 판단하고, 매칭되면 규칙 범위를 반씩 나눈 합성 정규식들을 따라
+    내려가며 가장 앞선 규칙을 찾습니다 (규칙 수 R에 대해 O(log R)번 검색).
+    설명 키워드는 KeywordAutomaton으로 합칩니다. 여러 규칙이 매칭되면 기존처럼
+    설정 파일에서 먼저 나온 규칙이 우선합니다.
+
+    인라인 플래그나 역참조처럼 합치면 의미가 바뀌는 패턴은 규칙마다 따로 컴파일해
+    두고, 합친 정규식으로 찾은 규칙보다 앞선 것만 따로 검사합니다.
+    """
+
+    def __init__(self, patterns: List[Dict[str, Any]]):
+        """
+        Args:
+            patterns: category_rules.patterns 설정
+        """
+        self.patterns = patterns
+
+        # 합칠 수 있는 규칙의 인덱스와 패턴, 따로 매칭할 (인덱스, 정규식)
+        self._combined: List[int] = []
+        sources: List[str] = []
+        self._standalone: List[Tuple[int, re.Pattern]] = []
+        for i, rule in enumerate(patterns):
+            pattern = rule["pattern"]
+            if _combinable(pattern):
+                self._combined.append(i)
+                sources.append(_without_captures(pattern))
+            else:
+                self._standalone.append((i, re.compile(pattern)))
+
+        self._name_tree = self._build_tree(sources, 0, len(sources)) if sources else None
+
+        self._keywords = KeywordAutomaton(
+            (keyword, i)
+            for i, rule in enumerate(patterns)
+            for keyword in rule["keywords"]
+        )
+
+        # 카테고리 이름 → 설정 (같은 카테고리가 여러 번 나오면 첫 번째)
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        for rule in patterns:
+            self._configs.setdefault(rule["category"], rule)
+
+    def _build_tree(self, sources: List[str], lo: int, hi: int) -> Tuple:
+        """규칙 [lo, hi) 범위를 합친 정규식 노드 (범위, 정규식, 왼쪽, 오른쪽)"""
+        matcher = re.compile("|".join(f"(?:{source})" for source in sources[lo:hi]))
+        if hi - lo == 1:
+            return (lo, matcher, None, None)
+
+        mid = (lo + hi) // 2
+        return (
+            lo,
+            matcher,
+            self._build_tree(sources, lo, mid),
+            self._build_tree(sources, mid, hi)
+        )
+
+    def _first_rule(self, node: Tuple, text: str) -> Optional[int]:
+        """노드 범위에서 text에 매칭되는 가장 앞선 규칙의 합친 정규식 내 위치"""
+        lo, matcher, left, right = node
+        if matcher.search(text) is None:
+            return None
+        if left is None:
+            return lo
+
+        found = self._first_rule(left, text)
+        return found if found is not None else self._first_rule(right, text)
+
+    def match_name(self, name_lower: str) -> Optional[str]:
+        """도구 이름(소문자)에 매칭되는 첫 번째 규칙의 카테고리"""
+        index = None
+        if self._name_tree is not None:
+            found = self._first_rule(self._name_tree, name_lower)
+            if found is not None:
+                index = self._combined[found]
+
+        # 따로 컴파일한 규칙은 합친 정규식으로 찾은 규칙보다 앞선 것만 검사
+        for i, matcher in self._standalone:
+            if index is not None and i > index:
+                break
+            if matcher.search(name_lower):
+                index = i
+                break
+
+        return self.patterns[index]["category"] if index is not None else None
+
+    def match_description(self, description_lower: str) -> Optional[str]:
+        """설명(소문자)에 키워드가 포함된 첫 번째 규칙의 카테고리"""
+        best = self._keywords.best_match(description_lower)
+        return self.patterns[best]["category"] if best is not None else None
+
+    def category_config(self, category_name: str) -> Optional[Dict[str, Any]]:
+        """카테고리 설정 (규칙에 없으면 None)"""
+        return self._configs.get(category_name)
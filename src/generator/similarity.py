@@ -0,0 +1,136 @@
+"""규칙에 매칭되지 않은 도구의 TF-IDF 유사도 기반 분류"""
+import re
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성 (pip install -e .[similarity])
+    np = None
+
+from generator.mcp_client import MCPTool
+
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 (영문 복수형 's'는 제거)"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class SimilarityFallback:
+    """
+    기본 카테고리로 떨어진 도구를 설명 유사도로 다시 분류
+
+    각 카테고리 규칙의 이름, 설명, 키워드로 TF-IDF 벡터를 만들고, 도구 설명과
+    도구 이름 단어로 만든 벡터와의 코사인 유사도를 한 번의 행렬 곱으로 계산합니다.
+    가장 유사한 카테고리의 점수가 threshold 이상이면 그 카테고리로, 아니면 기본
+    카테고리에 그대로 둡니다. 점수가 같으면 설정 파일에서 먼저 나온 카테고리가
+    우선합니다.
+
+    Usage:
+        fallback = SimilarityFallback(patterns, threshold=0.15)
+        names = fallback.assign(tools)  # 카테고리 이름 또는 None
+    """
+
+    DEFAULT_THRESHOLD = 0.15
+
+    # 점수 계산 방식이 바뀌면 올림 (분류 캐시 무효화)
+    VERSION = 1
+
+    @staticmethod
+    def available() -> bool:
+        """numpy 설치 여부"""
+        return np is not None
+
+    def __init__(self, patterns: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            patterns: category_rules.patterns 설정
+            threshold: 카테고리로 옮길 최소 코사인 유사도
+        """
+        if np is None:
+            raise RuntimeError("유사도 분류에는 numpy가 필요합니다: pip install -e .[similarity]")
+
+        self.threshold = threshold
+
+        # 카테고리별 문서 (같은 카테고리가 여러 번 나오면 합침)
+        documents: Dict[str, List[str]] = {}
+        for rule in patterns:
+            tokens = documents.setdefault(rule["category"], [])
+            tokens.extend(_tokenize(rule["category"]))
+            tokens.extend(_tokenize(rule.get("description", "")))
+            for keyword in rule["keywords"]:
+                tokens.extend(_tokenize(keyword))
+
+        self.categories = list(documents)
+        self._vocab: Dict[str, int] = {}
+        for tokens in documents.values():
+            for token in tokens:
+                self._vocab.setdefault(token, len(self._vocab))
+
+        # 카테고리 문서 기준 IDF (smooth), 어휘에 없는 단어는 가장 드문 단어로 취급
+        count = len(self.categories)
+        document_freq = Counter(token for tokens in documents.values() for token in set(tokens))
+        self._idf = np.empty(len(self._vocab))
+        for token, index in self._vocab.items():
+            self._idf[index] = math.log((1 + count) / (1 + document_freq[token])) + 1
+        self._unknown_idf = math.log(1 + count) + 1
+
+        # 카테고리 행렬 (K x V, 행 단위 L2 정규화)
+        matrix = np.zeros((count, len(self._vocab)))
+        for row, tokens in enumerate(documents.values()):
+            for token, tf in Counter(tokens).items():
+                matrix[row, self._vocab[token]] = tf
+        matrix *= self._idf
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._category_matrix = matrix
+
+    def _tool_matrix(self, tools: List[MCPTool]) -> 'np.ndarray':
+        """도구 행렬 (N x V, 어휘에 없는 단어까지 포함한 L2 정규화)"""
+        vocab = self._vocab
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        unknown = np.zeros(len(tools))
+
+        for row, tool in enumerate(tools):
+            tokens = _tokenize(tool.description)
+            tokens.extend(_tokenize(tool.get_simple_name()))
+            for token, tf in Counter(tokens).items():
+                index = vocab.get(token)
+                if index is None:
+                    unknown[row] += tf * tf
+                else:
+                    rows.append(row)
+                    cols.append(index)
+                    values.append(tf)
+
+        matrix = np.zeros((len(tools), len(vocab)))
+        matrix[rows, cols] = values
+        matrix *= self._idf
+
+        norms = np.sqrt((matrix * matrix).sum(axis=1) + unknown * self._unknown_idf ** 2)
+        norms[norms == 0] = 1
+        return matrix / norms[:, None]
+
+    def assign(self, tools: List[MCPTool]) -> List[Optional[str]]:
+        """도구별 가장 유사한 카테고리 (threshold 미만이면 None)"""
+        if not tools or not self.categories:
+            return [None] * len(tools)
+
+        scores = self._tool_matrix(tools) @ self._category_matrix.T
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(tools)), best]
+
+        return [
+            self.categories[index] if score >= self.threshold else None
+            for index, score in zip(best.tolist(), best_scores.tolist())
+        ]
@@ -0,0 +1,183 @@
+"""출력 디렉토리 전체 카탈로그 스냅샷"""
+import os
+import sys
+import json
+import marshal
+import zipfile
+from typing import Dict, Any, Tuple, Optional, Callable
+from pathlib import Path
+from generator.categorizer import CategoryInfo
+from generator.archive import ARCHIVE_SUFFIX
+
+
+# 출력 디렉토리의 전체 카탈로그 스냅샷 (MCPAgent가 한 번에 읽음)
+SNAPSHOT_FILENAME = "catalog.snapshot"
+SNAPSHOT_MAGIC = b"CXCAT\x02"
+
+# 서버 디렉토리별 스냅샷 조각 (세대와 함께 게시/롤백됨)
+FRAGMENT_FILENAME = ".snapshot"
+FRAGMENT_MAGIC = b"CXFRG\x01"
+
+# marshal 형식은 Python 버전마다 달라질 수 있어 기록한 인터프리터 버전을 머리말에 넣음
+# (버전이 다르면 스냅샷/조각을 읽지 않고 metadata.json에서 다시 만듦)
+PYTHON_TAG = f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}".encode('ascii')
+
+# 참조(FLAG_REF)를 쓰지 않는 버전이라 같은 내용이면 항상 같은 바이트가 나옴
+_MARSHAL_VERSION = 2
+
+
+def marshal_header(magic: bytes) -> bytes:
+    """magic + 인터프리터 버전 태그 길이(1바이트) + 태그"""
+    return magic + bytes([len(PYTHON_TAG)]) + PYTHON_TAG
+
+
+def load_marshaled(data: bytes, magic: bytes) -> Any:
+    """marshal_header(magic)로 시작하는 데이터 읽기 (머리말이 다르면 ValueError)"""
+    header = marshal_header(magic)
+    if not data.startswith(header):
+        raise ValueError("snapshot header mismatch")
+    return marshal.loads(data[len(header):])
+
+
+def _fragment_from_metadata(read: Callable[[str], bytes], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """카테고리 metadata.json들로 스냅샷 조각 다시 만들기 (다른 Python 버전이 쓴 조각 대신)"""
+    fragment = {}
+    for category_name, category_info in metadata['categories'].items():
+        category_metadata = json.loads(read(f"{category_name}/metadata.json"))
+        fragment[category_name] = {
+            "description": category_info['description'],
+            "keywords": list(category_info['keywords']),
+            "tools": [
+                (
+                    tool['name'],
+                    tool['full_name'],
+                    tool['description'],
+                    json.dumps(tool['input_schema'], ensure_ascii=False) if tool.get('input_schema') else None
+                )
+                for tool in category_metadata['tools']
+            ]
+        }
+    return fragment
+
+
+def encode_fragment(categories: Dict[str, CategoryInfo]) -> bytes:
+    """
+    서버 한 개의 카테고리/도구 목록을 스냅샷 조각으로 직렬화
+
+    구조: {카테고리: {"description", "keywords", "tools": [(이름, 전체 이름, 설명, 스키마 JSON)]}}
+    """
+    payload = {
+        category_name: {
+            "description": category_info.description,
+            "keywords": list(category_info.keywords),
+            "tools": [
+                (
+                    tool.get_simple_name(),
+                    tool.name,
+                    tool.description,
+                    tool.schema_json.decode('utf-8') if tool.schema_json else None
+                )
+                for tool in category_info.tools
+            ]
+        }
+        for category_name, category_info in categories.items()
+    }
+    return marshal_header(FRAGMENT_MAGIC) + marshal.dumps(payload, _MARSHAL_VERSION)
+
+
+class CatalogSnapshotWriter:
+    """
+    게시된 서버들의 스냅샷 조각을 모아 출력 디렉토리의 catalog.snapshot 생성
+
+    스냅샷 구조:
+        marshal_header(SNAPSHOT_MAGIC) + marshal({"servers": {서버: {"metadata": 서버 metadata.json,
+                                                                    "categories": 조각}}})
+
+    서버 디렉토리는 세대 단위로 교체되므로 조각과 metadata.json은 항상 같은 세대의
+    것이고, 스냅샷은 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 완성된 파일만 봅니다.
+    바뀌지 않은 서버의 조각은 메모리에 둔 것을 재사용합니다. archive 형식으로
+    게시된 서버(<서버>.zip)는 압축 파일 안의 조각과 metadata.json을 읽으며,
+    같은 이름의 디렉토리보다 우선합니다.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+
+        # 서버별 (조각 파일 식별자, 스냅샷 항목)
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+        # 마지막 write()에 포함된 서버별 (조각 파일 식별자, 스냅샷 항목)
+        self.published: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _read_entry(read: Callable[[str], bytes]) -> Dict[str, Any]:
+        """read(상대 경로)로 읽은 metadata.json과 조각 → 스냅샷 항목"""
+        metadata = json.loads(read("metadata.json"))
+        try:
+            categories = load_marshaled(read(FRAGMENT_FILENAME), FRAGMENT_MAGIC)
+        except (ValueError, EOFError, TypeError):
+            categories = _fragment_from_metadata(read, metadata)
+        return {"metadata": metadata, "categories": categories}
+
+    def _load_entry(self, server_dir: Path) -> Optional[Dict[str, Any]]:
+        """서버 디렉토리의 스냅샷 항목 (조각이 없으면 None)"""
+        fragment_path = server_dir / FRAGMENT_FILENAME
+        try:
+            stat = os.stat(fragment_path)
+        except OSError:
+            return None
+
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._entries.get(server_dir.name)
+        if cached is not None and cached[0] == file_id:
+            return cached[1]
+
+        try:
+            entry = self._read_entry(lambda name: (server_dir / name).read_bytes())
+        except (OSError, KeyError, ValueError, TypeError):
+            return None
+
+        self._entries[server_dir.name] = (file_id, entry)
+        return entry
+
+    def _load_archive_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        """서버 압축 파일의 스냅샷 항목 (읽을 수 없으면 None)"""
+        server_name = path.name[:-len(ARCHIVE_SUFFIX)]
+        stat = os.stat(path)
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._entries.get(server_name)
+        if cached is not None and cached[0] == file_id:
+            return cached[1]
+
+        try:
+            with zipfile.ZipFile(path) as archive:
+                entry = self._read_entry(archive.read)
+        except (OSError, KeyError, ValueError, TypeError, zipfile.BadZipFile):
+            return None
+
+        self._entries[server_name] = (file_id, entry)
+        return entry
+
+    def write(self) -> Path:
+        """현재 게시된 서버들로 스냅샷 다시 생성"""
+        servers = {}
+        for item in sorted(self.output_dir.iterdir()):
+            if item.name.startswith('.'):
+                continue
+            # 정렬 순서상 <서버>.zip이 <서버> 디렉토리 뒤에 오므로 압축 파일이 우선
+            if item.is_dir():
+                entry = self._load_entry(item)
+                if entry is not None:
+                    servers[item.name] = entry
+            elif item.name.endswith(ARCHIVE_SUFFIX):
+                entry = self._load_archive_entry(item)
+                if entry is not None:
+                    servers[item.name[:-len(ARCHIVE_SUFFIX)]] = entry
+
+        self.published = {name: self._entries[name] for name in servers}
+
+        path = self.output_dir / SNAPSHOT_FILENAME
+        tmp_path = path.with_name(f".{SNAPSHOT_FILENAME}.tmp")
+        tmp_path.write_bytes(marshal_header(SNAPSHOT_MAGIC) + marshal.dumps({"servers": servers}))
+        os.replace(tmp_path, path)
+        return path
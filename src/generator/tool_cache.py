@@ -0,0 +1,209 @@
+"""MCP 서버 도구 목록 로컬 캐시"""
+import re
+import json
+import time
+import hashlib
+from typing import List, Dict, Any, Optional, Iterator
+from pathlib import Path
+from generator.mcp_client import MCPTool
+
+
+class ToolCatalogCache:
+    """
+    서버별 도구 목록(tools/list 결과)을 디스크에 캐시
+
+    항목 헤더에는 서버 설정 지문(command, args, 환경 변수 이름)과 initialize
+    핸드셰이크의 서버 버전으로 만든 키를 기록하고, 읽을 때 현재 설정과 기록된
+    서버 버전으로 키를 다시 계산해 비교합니다. 설정이 바뀌거나 TTL이 지나면
+    항목은 무효가 됩니다. 파일 이름은 서버 이름의 해시를 붙여 만들므로 특수 문자만
+    다른 서버 이름("a/b", "a:b")끼리도 항목이 겹치지 않습니다.
+
+    Usage:
+        cache = ToolCatalogCache('.cache/tools', ttl=86400)
+        tools = cache.load(server_config)
+        if tools is None:
+            tools, version = ...  # 서버 조회
+            cache.save(server_config, version, tools)
+    """
+
+    def __init__(self, cache_dir: str = ".cache/tools", ttl: float = 86400):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            ttl: 캐시 유효 시간(초)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    @staticmethod
+    def config_fingerprint(server_config: Dict[str, Any]) -> str:
+        """서버 설정 지문 (환경 변수는 값이 아닌 이름만 사용)"""
+        payload = {
+            "command": server_config.get("command"),
+            "args": server_config.get("args", []),
+            "env": sorted(server_config.get("env", {}))
+        }
+        data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def cache_key(cls, server_config: Dict[str, Any], server_version: Optional[str]) -> str:
+        """설정 지문 + 서버 버전으로 만든 캐시 키"""
+        data = f"{cls.config_fingerprint(server_config)}:{server_version or ''}"
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, server_name: str) -> Path:
+        """서버별 캐시 파일 경로 (읽기 쉬운 이름 + 서버 이름 해시)"""
+        safe_name = re.sub(r'[^\w.-]', '_', server_name)
+        digest = hashlib.sha256(server_name.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{safe_name}-{digest}.jsonl"
+
+    def _read_header(self, path: Path) -> Optional[Dict[str, Any]]:
+        """캐시 파일 첫 줄(헤더) 읽기"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def iter_chunks(
+        self,
+        server_config: Dict[str, Any],
+        chunk_size: int = 500,
+        check_ttl: bool = True
+    ) -> Optional[Iterator[List[MCPTool]]]:
+        """
+        유효한 캐시 항목이 있으면 도구 목록을 chunk_size 단위로 읽는 이터레이터 반환
+
+        캐시 파일은 헤더 한 줄 + 도구당 한 줄(JSON Lines)이라 전체를 메모리에 올리지 않습니다.
+        항목이 없거나 무효하면 None을 반환합니다.
+        """
+        server_name = server_config["name"]
+        path = self._entry_path(server_name)
+        if not path.exists():
+            return None
+
+        header = self._read_header(path)
+        if header is None or header.get("server_name") != server_name:
+            return None
+        # 설정이 바뀌었거나 헤더가 손상되었으면 다시 계산한 키가 다름
+        if header.get("key") != self.cache_key(server_config, header.get("server_version")):
+            return None
+        if check_ttl and time.time() - header.get("cached_at", 0) > self.ttl:
+            return None
+
+        return self._read_chunks(path, server_name, chunk_size)
+
+    @staticmethod
+    def _read_chunks(path: Path, server_name: str, chunk_size: int) -> Iterator[List[MCPTool]]:
+        """헤더 다음 줄부터 도구를 chunk_size 단위로 읽기"""
+        with open(path, encoding='utf-8') as f:
+            f.readline()
+
+            chunk = []
+            for line in f:
+                tool = json.loads(line)
+                chunk.append(MCPTool(
+                    name=tool["name"],
+                    description=tool["description"],
+                    server_name=server_name,
+                    input_schema=tool.get("schema")
+                ))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+
+    def load(
+        self,
+        server_config: Dict[str, Any],
+        check_ttl: bool = True
+    ) -> Optional[List[MCPTool]]:
+        """유효한 캐시 항목이 있으면 도구 목록 반환, 없으면 None"""
+        chunks = self.iter_chunks(server_config, check_ttl=check_ttl)
+        if chunks is None:
+            return None
+        return [tool for chunk in chunks for tool in chunk]
+
+    def writer(
+        self,
+        server_config: Dict[str, Any],
+        server_version: Optional[str]
+    ) -> 'CacheWriter':
+        """도구를 나눠서 기록하는 캐시 writer 생성"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        header = {
+            "server_name": server_config["name"],
+            "config_fingerprint": self.config_fingerprint(server_config),
+            "server_version": server_version,
+            "key": self.cache_key(server_config, server_version),
+            "cached_at": time.time()
+        }
+        return CacheWriter(self._entry_path(server_config["name"]), header)
+
+    def save(
+        self,
+        server_config: Dict[str, Any],
+        server_version: Optional[str],
+        tools: List[MCPTool]
+    ):
+        """도구 목록 저장"""
+        writer = self.writer(server_config, server_version)
+        writer.write(tools)
+        writer.commit()
+
+    def invalidate(self, server_names: Optional[List[str]] = None) -> int:
+        """캐시 항목 삭제 (None이면 전체), 삭제된 항목 수 반환"""
+        if not self.cache_dir.exists():
+            return 0
+
+        if server_names is None:
+            paths = list(self.cache_dir.glob('*.jsonl'))
+        else:
+            paths = [self._entry_path(name) for name in server_names]
+
+        removed = 0
+        for path in paths:
+            if path.exists():
+                path.unlink()
+                removed += 1
+        return removed
+
+
+class CacheWriter:
+    """
+    캐시 항목 writer
+
+    임시 파일에 기록하다가 commit() 시점에 교체하므로, 조회 도중 실패하면
+    abort()로 기존 캐시 항목을 그대로 유지할 수 있습니다.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, Any]):
+        self.path = path
+        self.tmp_path = path.with_suffix('.tmp')
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._file.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+    def write(self, tools: List[MCPTool]):
+        """도구 추가 기록"""
+        for tool in tools:
+            # 스키마는 파싱하지 않고 JSON 텍스트 그대로 저장
+            record = {
+                "name": tool.name,
+                "description": tool.description,
+                "schema": tool.schema_json.decode('utf-8') if tool.schema_json else None
+            }
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def commit(self):
+        """기록 완료 후 캐시 항목 교체"""
+        self._file.close()
+        self.tmp_path.replace(self.path)
+
+    def abort(self):
+        """기록 취소 (기존 캐시 항목 유지)"""
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
@@ -1,4 +1,5 @@
 """전체 워크플로우 통합"""
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, Optional
 from rich.console import Console
@@ -112,6 +113,45 @@ class CodeExecutionWorkflow:
 
         return result
 
+    async def arun(self, user_query: str, execute: bool = True) -> Dict[str, Any]:
+        """
+        전체 워크플로우 실행 (코루틴, 출력 없음)
+
+        코드 생성(Claude API 호출)은 이벤트 루프를 막지 않도록 스레드에서 실행하고,
+        생성된 코드는 현재 이벤트 루프에서 실행하므로 코드 안의 await agent.aexecute()
+        호출들이 같은 루프에서 겹쳐서 진행됩니다.
+
+        Returns:
+            run()과 같은 구조의 결과 딕셔너리
+        """
+        result = {
+            "query": user_query,
+            "generated_code": None,
+            "execution_result": None,
+            "success": False
+        }
+
+        try:
+            generated = await asyncio.to_thread(self.code_generator.generate_code, user_query)
+            result["generated_code"] = {
+                "code": generated.code,
+                "description": generated.description,
+                "explanation": generated.explanation,
+                "required_tools": generated.required_tools
+            }
+
+            if execute:
+                exec_result = await self.code_executor.aexecute(generated.code)
+                result["execution_result"] = exec_result
+                result["success"] = exec_result["success"]
+            else:
+                result["success"] = True
+
+        except Exception as e:
+            result["error"] = str(e)
+
+        return result
+
     def interactive_mode(self):
         """대화형 모드"""
         console.print(Panel.fit(
@@ -175,16 +215,18 @@ class CodeExecutionWorkflow:
             console.print(f"\n[bold]Available Servers:[/bold] {', '.join(servers)}")
 
         elif cmd == 'search' and len(parts) > 1:
-            keyword = parts[1]
-            tools = self.mcp_agent.search_tools(keyword)
+            keyword = ' '.join(parts[1:])
+            tools = self.mcp_agent.iter_search(keyword, limit=10)
             console.print(f"\n[bold]Search results for '{keyword}':[/bold]")
-            for tool in tools[:10]:
+            for tool in tools:
                 console.print(f"  • {tool.server}/{tool.category}/{tool.name}")
                 console.print(f"    {tool.description}")
 
         elif cmd == 'tree':
             server = parts[1] if len(parts) > 1 else None
-            console.print("\n" + self.mcp_agent.get_tree(server))
+            console.print()
+            for line in self.mcp_agent.iter_tree(server):
+                console.print(line)
 
         else:
             console.print(f"[red]Unknown command: {cmd}[/red]")
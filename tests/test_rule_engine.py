@@ -0,0 +1,78 @@
+"""CompiledRules가 규칙을 하나씩 re.search 하던 방식과 같은 결과를 내는지 검사"""
+import re
+
+import pytest
+
+from generator.rule_engine import CompiledRules
+
+
+def _rule(category, pattern, keywords=()):
+    return {"category": category, "pattern": pattern, "keywords": list(keywords)}
+
+
+def _first_match(patterns, name):
+    """기준 동작: 설정 순서대로 규칙을 하나씩 검색"""
+    for rule in patterns:
+        if re.search(rule["pattern"], name):
+            return rule["category"]
+    return None
+
+
+PATTERNS = [
+    _rule("accounts", r"^(account|acct)_"),
+    # 중간에 넣으면 Python 3.11부터 오류, 3.10에서는 다른 규칙까지 대소문자 무시
+    _rule("contacts", r"(?i)^CONTACT_"),
+    # 역참조 (합치면 그룹 번호가 밀림)
+    _rule("doubled", r"^(\w+)_\1$"),
+    _rule("named", r"^(?P<verb>get|list)_(?P=verb)s?$"),
+    _rule("leads", r"(?P<kind>lead)s?_"),
+    _rule("fallback", r"_"),
+]
+
+
+@pytest.mark.parametrize("name", [
+    "account_create",
+    "acct_delete",
+    "contact_update",
+    "Contact_update",
+    "ACCOUNT_CREATE",
+    "sync_sync",
+    "get_gets",
+    "list_list",
+    "leads_import",
+    "other_thing",
+    "nothing",
+])
+def test_match_name_same_as_sequential_search(name):
+    rules = CompiledRules(PATTERNS)
+    assert rules.match_name(name) == _first_match(PATTERNS, name)
+
+
+@pytest.mark.filterwarnings("error")
+def test_inline_flags_do_not_leak_to_other_rules():
+    rules = CompiledRules([_rule("upper", r"^ABC"), _rule("flagged", r"(?i)^xyz")])
+    assert rules.match_name("abc") is None
+    assert rules.match_name("XYZ") == "flagged"
+
+
+def test_backreference_after_other_groups():
+    # 합치면 두 번째 규칙의 '\1'이 앞 규칙의 그룹을 가리켜 매칭되지 않음
+    rules = CompiledRules([_rule("repeated", r"^(x)\1y"), _rule("doubled", r"^(\w+)_\1$")])
+    assert rules.match_name("sync_sync") == "doubled"
+    assert rules.match_name("xxy") == "repeated"
+
+
+def test_earlier_standalone_rule_wins():
+    rules = CompiledRules([_rule("doubled", r"^(\w+)_\1$"), _rule("any", r"_")])
+    assert rules.match_name("a_a") == "doubled"
+    assert rules.match_name("a_b") == "any"
+
+
+def test_match_description_uses_first_rule():
+    rules = CompiledRules([
+        _rule("accounts", "x", ["company", "account"]),
+        _rule("contacts", "y", ["contact", "account"]),
+    ])
+    assert rules.match_description("update an account contact") == "accounts"
+    assert rules.match_description("a contact") == "contacts"
+    assert rules.match_description("nothing") is None
@@ -0,0 +1,100 @@
+"""메모리, sqlite(catalog.db), mmap(catalog.bin) 백엔드의 검색 순위가 같은지 검사"""
+from pathlib import Path
+
+import pytest
+
+from agent import MCPAgent
+from generator.categorizer import ToolCategorizer
+from generator.file_generator import FileGenerator
+from generator.mcp_client import MCPTool
+
+
+CATEGORIES = Path(__file__).resolve().parents[1] / "config" / "categories.json"
+
+TOOLS = {
+    "salesforce": [
+        ("salesforce__account__create", "Create a new account record"),
+        ("salesforce__account__delete", "Delete an account"),
+        ("salesforce__account__update", "Update account fields"),
+        ("salesforce__contact__create", "Create a contact for an account"),
+        ("salesforce__contact__list", "List contacts"),
+        ("salesforce__opportunity__create", "Create an opportunity"),
+        ("salesforce__lead__convert", "Convert a lead into an account and contact"),
+    ],
+    "google": [
+        ("google__spreadsheet__read", "Read cell values from a spreadsheet"),
+        ("google__sheet__append", "Append rows to a sheet"),
+        ("google__document__create", "Create a document"),
+        ("google__calendar__createEvent", "일정을 만듭니다"),
+        ("google__drive__listFiles", "List files in a folder"),
+    ],
+    "github": [
+        ("github__issue__create", "Create an issue"),
+        ("github__issue__list", "List issues in a repository"),
+        ("github__issue__close", "Close an issue"),
+        ("github__repo__create", "Create a repository"),
+        ("github__pullRequest__create", "Create a pull request"),
+        ("github__user__getProfile", "계정 프로필을 조회합니다"),
+    ],
+}
+
+QUERIES = [
+    "create",
+    "account",
+    "create account",
+    "list issues",
+    "isue",
+    "acount",
+    "spredsheet",
+    "sheet",
+    "계정을",
+    "일정",
+    "the",
+]
+
+BACKENDS = ("memory", "sqlite", "mmap")
+
+
+def _generate(output_dir: Path, servers):
+    categorizer = ToolCategorizer(str(CATEGORIES))
+    generator = FileGenerator(str(output_dir), deterministic=True, catalog_db=True, catalog_bin=True)
+    try:
+        for server in servers:
+            tools = [MCPTool(name, description, server, {"type": "object"})
+                     for name, description in TOOLS[server]]
+            generator.generate_server_structure(server, categorizer.categorize_tools(tools))
+    finally:
+        generator.close()
+
+
+@pytest.fixture(scope="module")
+def agents(tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp("catalog") / "servers"
+    # 서버 이름 역순으로 게시하므로 catalog.db의 행 번호 순서는 카탈로그 순서와 반대
+    _generate(output_dir, TOOLS)
+
+    agents = {backend: MCPAgent(str(output_dir), backend=backend) for backend in BACKENDS}
+    yield agents
+    for agent in agents.values():
+        agent.close()
+
+
+def _ranked(agent, query, **kwargs):
+    return [f"{tool.server}/{tool.category}/{tool.name}"
+            for tool in agent.iter_search(query, **kwargs)]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_backends_rank_alike(agents, query):
+    expected = _ranked(agents["memory"], query)
+    for backend in BACKENDS[1:]:
+        assert _ranked(agents[backend], query) == expected, backend
+
+
+@pytest.mark.parametrize("query", ["create", "account"])
+def test_backends_page_alike(agents, query):
+    for offset, limit in [(0, 6), (2, 3), (5, 10)]:
+        expected = _ranked(agents["memory"], query, offset=offset, limit=limit)
+        assert len(expected) == min(limit, max(len(_ranked(agents["memory"], query)) - offset, 0))
+        for backend in BACKENDS[1:]:
+            assert _ranked(agents[backend], query, offset=offset, limit=limit) == expected, backend
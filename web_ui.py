@@ -16,11 +16,12 @@ if sys.platform == 'win32':
 # 프로젝트 루트 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Iterator
+from itertools import islice
 import uvicorn
 from dotenv import load_dotenv
 
@@ -68,11 +69,20 @@ async def startup_event():
     else:
         try:
             workflow = CodeExecutionWorkflow('output/servers')
+            # 다시 생성된 구조를 재시작 없이 반영
+            workflow.mcp_agent.watch()
             print("✅ CodeEx Agent 워크플로우가 준비되었습니다")
         except Exception as e:
             print(f"❌ 워크플로우 초기화 실패: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 MCP 서버 프로세스와 카탈로그 감시 정리"""
+    if workflow:
+        await workflow.mcp_agent.aclose()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """메인 페이지"""
@@ -516,12 +526,8 @@ async def process_query(request: QueryRequest):
         )
 
     try:
-        # 워크플로우 실행
-        result = workflow.run(
-            request.query,
-            execute=request.execute,
-            verbose=False  # 웹 UI에서는 verbose 끔
-        )
+        # 워크플로우 실행 (생성된 코드의 도구 호출은 서버 이벤트 루프에서 겹쳐서 진행)
+        result = await workflow.arun(request.query, execute=request.execute)
 
         return QueryResponse(
             success=result.get("success", False),
@@ -539,6 +545,64 @@ async def process_query(request: QueryRequest):
         )
 
 
+def _require_workflow():
+    """워크플로우가 준비되지 않았으면 503"""
+    if not workflow:
+        raise HTTPException(
+            status_code=503,
+            detail="워크플로우가 초기화되지 않았습니다. MCP 구조를 먼저 생성하세요."
+        )
+
+
+def _tool_page(tools: Iterator, offset: int, limit: int) -> dict:
+    """
+    도구 한 페이지 (limit + 1개까지만 읽어 다음 페이지가 있는지 판단)
+
+    다음 페이지는 next_offset을 offset으로 넘겨 요청합니다(없으면 null).
+    """
+    page = list(islice(tools, limit + 1))
+    return {
+        "items": [
+            {
+                "server": tool.server,
+                "category": tool.category,
+                "name": tool.name,
+                "description": tool.description
+            }
+            for tool in page[:limit]
+        ],
+        "offset": offset,
+        "next_offset": offset + limit if len(page) > limit else None
+    }
+
+
+@app.get("/api/tools/search")
+async def search_tools(
+    q: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """도구 검색 (점수 순 페이지)"""
+    _require_workflow()
+    return _tool_page(workflow.mcp_agent.iter_search(q, offset, limit + 1), offset, limit)
+
+
+@app.get("/api/servers/{server}/tools")
+async def list_tools(
+    server: str,
+    category: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """서버(또는 카테고리)의 도구 목록 페이지"""
+    _require_workflow()
+    try:
+        tools = workflow.mcp_agent.iter_tools(server, category, offset, limit + 1)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _tool_page(tools, offset, limit)
+
+
 @app.get("/api/health")
 async def health_check():
     """헬스 체크"""
@@ -546,7 +610,8 @@ async def health_check():
         "status": "ok",
         "workflow_ready": workflow is not None,
         "api_key_set": bool(os.getenv('ANTHROPIC_API_KEY')),
-        "mcp_structure": Path("output/servers").exists()
+        "mcp_structure": Path("output/servers").exists(),
+        "catalog_version": workflow.mcp_agent.catalog_version if workflow else None
     }
 
 
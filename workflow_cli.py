@@ -115,19 +115,19 @@ def search(keyword, output):
         sys.exit(1)
 
     agent = MCPAgent(output)
-    tools = agent.search_tools(keyword)
 
     console.print(f"\n[bold cyan]Search results for '{keyword}':[/bold cyan]")
-    if not tools:
-        console.print("[yellow]No tools found[/yellow]")
-        return
-
-    for tool in tools[:20]:
+    found = False
+    for tool in agent.iter_search(keyword, limit=20):
+        found = True
         console.print(f"\n[bold]{tool.server}/{tool.category}/{tool.name}[/bold]")
         console.print(f"  {tool.description}")
         if tool.keywords:
             console.print(f"  [dim]Keywords: {', '.join(tool.keywords)}[/dim]")
 
+    if not found:
+        console.print("[yellow]No tools found[/yellow]")
+
 
 @cli.command()
 @click.option('--output', default='output/servers', help='MCP 구조 디렉토리')
@@ -141,7 +141,9 @@ def tree(output, server):
         sys.exit(1)
 
     agent = MCPAgent(output)
-    console.print(f"\n{agent.get_tree(server)}")
+    console.print()
+    for line in agent.iter_tree(server):
+        console.print(line)
 
 
 if __name__ == "__main__":